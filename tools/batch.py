@@ -0,0 +1,449 @@
+"""
+Batch Portfolio Generation
+==========================
+
+Runs generate_portfolio_with_tasks() for a whole cohort of resumes. The PRD is
+loaded once and handed to every worker through the pool initializer (which also
+parses it into the cached PRD section index), resumes are
+fanned out in chunks over a process (or thread) pool, and results stream back
+either in input order or as soon as they complete.
+
+Usage:
+    python tools/batch.py resumes/ --prd tools/PRODUCT_REQUIREMENTS_DOCUMENT.md
+    python tools/batch.py cohort.jsonl --workers 8 --unordered --output results.jsonl
+    cat cohort.jsonl | python tools/batch.py - --executor thread
+
+Input formats:
+- Directory: every *.txt / *.md / *.pdf / *.json file is one resume, keyed by file name
+- JSONL: one object per line with "resume" (required), "id" and "user_name"
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from instrumentation import flush_events
+from prd_index import index_for_content
+from result_cache import ResultCache
+from system_prompt import SYSTEM_PROMPT, generate_portfolio_with_tasks
+
+RESUME_SUFFIXES = (".txt", ".md", ".pdf", ".json")
+DEFAULT_PRD_PATH = Path(__file__).with_name("PRODUCT_REQUIREMENTS_DOCUMENT.md")
+START_POLL_SEC = 0.05  # with a timeout, how often queued chunks are checked for having started
+
+
+class BatchItem(NamedTuple):
+    """One resume queued for generation; resume_path is ingested by the worker instead"""
+    key: str
+    resume_content: Optional[str]
+    user_name: Optional[str] = None
+    resume_path: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one item; exactly one of result / error is set"""
+    index: int
+    key: str
+    result: Optional[dict]
+    error: Optional[str]
+    elapsed_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchStats:
+    """Running totals for a batch, updated as results are yielded"""
+
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, result: BatchResult):
+        self.total += 1
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def resumes_per_sec(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_sec": round(self.elapsed, 4),
+            "resumes_per_sec": round(self.resumes_per_sec, 2),
+        }
+
+
+# Per-worker state, populated once by the pool initializer so the PRD is not
+# pickled along with every chunk of resumes.
+_worker_prd = None
+_worker_cache = None
+
+
+def _init_worker(prd_content: str, cache_dir: Optional[str] = None):
+    global _worker_prd, _worker_cache
+    _worker_prd = prd_content
+    index_for_content(prd_content)  # parse once per worker, every item then hits the cache
+    if cache_dir is not None:
+        # Memory tier is per worker; the disk tier is shared by the whole pool
+        _worker_cache = ResultCache(cache_dir=cache_dir)
+
+
+def _run_chunk(chunk: List[tuple]) -> List[tuple]:
+    """Generate every (index, item) pair in a chunk, isolating failures per item"""
+    results = []
+    for index, item in chunk:
+        start = time.perf_counter()
+        try:
+            resume_content = item.resume_content
+            if item.resume_path is not None:
+                from resume_ingest import read_resume
+
+                resume_content = read_resume(item.resume_path)
+            if not isinstance(resume_content, str):
+                raise ValueError("resume content is missing or not text")
+            result = generate_portfolio_with_tasks(
+                resume_content, _worker_prd, item.user_name, cache=_worker_cache
+            )
+            # The system prompt is identical for every item; don't ship 20 KB
+            # back over the pipe per resume, the parent re-attaches it.
+            if result.get("implementation_plan") == SYSTEM_PROMPT:
+                result["implementation_plan"] = None
+            error = None
+        except Exception as exc:  # one bad resume must not sink the chunk
+            result, error = None, f"{type(exc).__name__}: {exc}"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results.append((index, item.key, result, error, elapsed_ms))
+    flush_events()  # process workers never run atexit; a no-op while instrumentation is off
+    return results
+
+
+def _restore(raw: tuple) -> BatchResult:
+    index, key, result, error, elapsed_ms = raw
+    if result is not None and result.get("implementation_plan") is None:
+        result["implementation_plan"] = SYSTEM_PROMPT
+    return BatchResult(index, key, result, error, elapsed_ms)
+
+
+def _chunked(items: Iterable[BatchItem], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for index, item in enumerate(items):
+        chunk.append((index, item))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _InFlight:
+    """A submitted chunk; started is when it was first seen running (None: still queued)"""
+    __slots__ = ("future", "chunk", "started")
+
+    def __init__(self, future, chunk: List[tuple]):
+        self.future = future
+        self.chunk = chunk
+        self.started = None
+
+
+class BatchGenerator:
+    """
+    Reusable pool for generating many portfolios against one PRD
+
+    Args:
+        prd_content: Content of PRODUCT_REQUIREMENTS_DOCUMENT.md, shared by all workers
+        workers: Pool size (defaults to os.cpu_count())
+        executor: "process" for CPU-bound scaling, "thread" for low-overhead runs
+        chunksize: Resumes sent to a worker per task; larger chunks amortize IPC
+        timeout: Optional per-chunk timeout in seconds, counted from when the chunk starts
+            running; timed out items are reported as failures and the pool is recycled
+        cache_dir: Optional on-disk result cache shared by all workers
+    """
+
+    def __init__(self, prd_content: str, workers: int = None, executor: str = "process",
+                 chunksize: int = 16, timeout: float = None, cache_dir=None):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"executor must be 'process' or 'thread', got {executor!r}")
+        self.prd_content = prd_content
+        self.workers = workers or os.cpu_count() or 1
+        self.executor_kind = executor
+        self.chunksize = max(1, chunksize)
+        self.timeout = timeout
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self.stats = BatchStats()
+        self._pool = None
+
+    def __enter__(self):
+        self._ensure_pool()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            pool_cls = ProcessPoolExecutor if self.executor_kind == "process" else ThreadPoolExecutor
+            self._pool = pool_cls(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.prd_content, self.cache_dir),
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _recycle_pool(self, in_flight: Iterable[_InFlight]):
+        """
+        Replace a pool that holds a hung chunk
+
+        Worker processes are terminated rather than joined; threads cannot be
+        killed, so a thread pool is abandoned (its stuck thread still delays
+        interpreter exit). Chunks that had not finished are resubmitted to the
+        fresh pool.
+        """
+        pool, self._pool = self._pool, None
+        unfinished = [entry for entry in in_flight if not entry.future.done()]
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        for entry in unfinished:
+            entry.future = self._ensure_pool().submit(_run_chunk, entry.chunk)
+            entry.started = None
+
+    def _wait_timeout(self, in_flight, candidates) -> float:
+        """Seconds until the first candidate's deadline; short while a chunk's start is unseen"""
+        now = time.perf_counter()
+        remaining = [entry.started + self.timeout - now for entry in candidates
+                     if entry.started is not None]
+        timeout = min(remaining) if remaining else self.timeout
+        if any(entry.started is None for entry in in_flight):
+            timeout = min(timeout, START_POLL_SEC)
+        return max(0.0, timeout)
+
+    def run(self, items: Iterable[BatchItem], ordered: bool = True) -> Iterator[BatchResult]:
+        """
+        Generate portfolios for every item, yielding results as they become available
+
+        Only a bounded window of chunks is in flight at once, so arbitrarily long
+        input streams are consumed lazily.
+
+        Args:
+            items: Resumes to process
+            ordered: Yield in input order (True) or in completion order (False)
+
+        Returns:
+            Iterator of BatchResult; self.stats is updated as results are yielded
+        """
+        self._ensure_pool()
+        self.stats = BatchStats()
+        window = self.workers * 2
+        chunks = _chunked(items, self.chunksize)
+        in_flight = deque()
+
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            in_flight.append(_InFlight(self._ensure_pool().submit(_run_chunk, chunk), chunk))
+            return True
+
+        def mark_started():
+            now = time.perf_counter()
+            for entry in in_flight:
+                if entry.started is None and (entry.future.running() or entry.future.done()):
+                    entry.started = now
+
+        while len(in_flight) < window and submit_next():
+            pass
+
+        try:
+            while in_flight:
+                candidates = [in_flight[0]] if ordered else list(in_flight)
+                futures = [entry.future for entry in candidates]
+                if self.timeout is None:
+                    wait(futures, return_when=FIRST_COMPLETED)
+                    expired = []
+                else:
+                    mark_started()
+                    wait(futures, timeout=self._wait_timeout(in_flight, candidates),
+                         return_when=FIRST_COMPLETED)
+                    mark_started()
+                    now = time.perf_counter()
+                    expired = [entry for entry in candidates if not entry.future.done()
+                               and entry.started is not None and now - entry.started >= self.timeout]
+                done = [entry for entry in candidates if entry.future.done() or entry in expired]
+                if expired:
+                    self._recycle_pool(entry for entry in in_flight if entry not in expired)
+
+                for entry in done:
+                    in_flight.remove(entry)
+                    for result in self._collect(entry, timed_out=entry in expired):
+                        self.stats.record(result)
+                        yield result
+                    submit_next()
+        finally:
+            for entry in in_flight:
+                entry.future.cancel()
+            self.stats.finished = time.perf_counter()
+
+    def _collect(self, entry: _InFlight, timed_out: bool = False) -> Iterator[BatchResult]:
+        if timed_out:
+            raw_results = [(i, item.key, None, f"TimeoutError: exceeded {self.timeout}s", 0.0)
+                           for i, item in entry.chunk]
+        else:
+            try:
+                raw_results = entry.future.result()
+            except Exception as exc:  # e.g. a crashed worker process
+                raw_results = [(i, item.key, None, f"{type(exc).__name__}: {exc}", 0.0)
+                               for i, item in entry.chunk]
+        for raw in raw_results:
+            yield _restore(raw)
+
+
+def generate_batch(items: Iterable[BatchItem], prd_content: str, ordered: bool = True,
+                   **options) -> Iterator[BatchResult]:
+    """
+    Convenience wrapper: run one batch on a fresh pool and shut it down afterwards
+
+    Args:
+        items: Resumes to process
+        prd_content: Content of PRODUCT_REQUIREMENTS_DOCUMENT.md
+        ordered: Yield in input order (True) or in completion order (False)
+        **options: Passed through to BatchGenerator (workers, executor, chunksize, timeout, cache_dir)
+    """
+    with BatchGenerator(prd_content, **options) as generator:
+        yield from generator.run(items, ordered=ordered)
+
+
+def iter_resume_directory(directory: Path) -> Iterator[BatchItem]:
+    """
+    Yield one BatchItem per resume file in a directory, sorted by name
+
+    PDF and JSON resumes are ingested by the worker, so extraction runs in
+    parallel and a malformed file fails only its own item.
+    """
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file() or path.suffix.lower() not in RESUME_SUFFIXES:
+            continue
+        if path.suffix.lower() in (".pdf", ".json"):
+            yield BatchItem(path.stem, None, resume_path=str(path))
+        else:
+            yield BatchItem(path.stem, path.read_text(encoding="utf-8", errors="replace"))
+
+
+def iter_resume_jsonl(stream) -> Iterator[BatchItem]:
+    """Yield BatchItems from a JSONL stream; malformed lines become failing items"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            yield BatchItem(
+                str(record.get("id", line_no)),
+                record["resume"],
+                record.get("user_name"),
+            )
+        except (ValueError, KeyError, AttributeError):
+            # Let the worker report this line as failed instead of aborting the batch
+            yield BatchItem(f"line-{line_no}", None)
+
+
+def _task_dir_name(result: BatchResult) -> str:
+    """Single path component for a result's id, which comes straight from the input ("../x" -> "x")"""
+    return re.sub(r"[^\w.-]+", "-", result.key).strip(".-") or f"item-{result.index}"
+
+
+def _write_result(out, result: BatchResult, tasks_dir: Optional[Path]):
+    record = {
+        "index": result.index,
+        "id": result.key,
+        "ok": result.ok,
+        "elapsed_ms": round(result.elapsed_ms, 3),
+    }
+    if result.ok:
+        record["progress_tracker"] = result.result["progress_tracker"]
+        if tasks_dir is not None:
+            task_path = tasks_dir / _task_dir_name(result) / "task.md"
+            task_path.parent.mkdir(parents=True, exist_ok=True)
+            task_path.write_text(result.result["task_file_content"], encoding="utf-8")
+            record["task_file"] = str(task_path)
+    else:
+        record["error"] = result.error
+    out.write(json.dumps(record) + "\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate portfolio plans for many resumes")
+    parser.add_argument("source", help="Directory of resumes, JSONL file, or '-' for JSONL on stdin")
+    parser.add_argument("--prd", type=Path, default=DEFAULT_PRD_PATH, help="Path to the PRD markdown")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count)")
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--chunksize", type=int, default=16, help="Resumes per worker task")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-chunk timeout in seconds")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Persistent result cache directory")
+    parser.add_argument("--unordered", action="store_true", help="Emit results as they complete")
+    parser.add_argument("--output", type=Path, default=None, help="JSONL results file (default: stdout)")
+    parser.add_argument("--tasks-dir", type=Path, default=None, help="Write <id>/task.md files here (id reduced to one safe path component)")
+    args = parser.parse_args(argv)
+
+    prd_content = args.prd.read_text(encoding="utf-8")
+
+    if args.source == "-":
+        source_stream, items = None, iter_resume_jsonl(sys.stdin)
+    elif Path(args.source).is_dir():
+        source_stream, items = None, iter_resume_directory(Path(args.source))
+    else:
+        source_stream = open(args.source, encoding="utf-8")
+        items = iter_resume_jsonl(source_stream)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        with BatchGenerator(prd_content, workers=args.workers, executor=args.executor,
+                            chunksize=args.chunksize, timeout=args.timeout,
+                            cache_dir=args.cache_dir) as generator:
+            for result in generator.run(items, ordered=not args.unordered):
+                _write_result(out, result, args.tasks_dir)
+            stats = generator.stats
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if source_stream is not None:
+            source_stream.close()
+
+    print(json.dumps(stats.as_dict()), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
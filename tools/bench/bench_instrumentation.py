@@ -0,0 +1,177 @@
+"""
+Instrumentation Overhead Benchmark
+==================================
+
+Shows what the pipeline hooks in instrumentation.py cost:
+
+- ns per span() enter/exit and per count(), net of an empty loop: disabled,
+  enabled (registry only) and enabled with a JSONL sink
+- hooks fired by one generate_portfolio_with_tasks() call
+- estimated overhead of each mode as a share of a warm generate call
+- measured generate latency in each mode, run in rotating rounds
+
+Whole-call latency differences of a few percent drown in timer and scheduler
+noise, so every overhead is derived from the per-hook cost times the hook
+count; the measured latencies are there as a sanity check. Exits non-zero if
+the disabled overhead exceeds --disabled-budget-pct.
+
+Usage:
+    python tools/bench/bench_instrumentation.py
+    python tools/bench/bench_instrumentation.py --loops 2000000 --disabled-budget-pct 0.5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import instrumentation  # noqa: E402
+from system_prompt import generate_portfolio_with_tasks  # noqa: E402
+
+PRD_PATH = Path(__file__).resolve().parent.parent / "PRODUCT_REQUIREMENTS_DOCUMENT.md"
+RESUME = "Jordan Example\nSenior Python & AI Engineer\njordan@example.com\n\nSKILLS\nPython, React, AWS\n"
+
+
+class _CountingSink:
+    def __init__(self):
+        self.records = 0
+
+    def emit(self, record: dict):
+        self.records += 1
+
+    def flush(self, registry=None):
+        pass
+
+    def close(self):
+        pass
+
+
+def _loop_ns(body, loops: int) -> float:
+    start = time.perf_counter_ns()
+    body(loops)
+    return (time.perf_counter_ns() - start) / loops
+
+
+def _empty(loops):
+    for _ in range(loops):
+        pass
+
+
+def _spans(loops):
+    span = instrumentation.span
+    for _ in range(loops):
+        with span("bench"):
+            pass
+
+
+def _counts(loops):
+    count = instrumentation.count
+    for _ in range(loops):
+        count("bench", 1)
+
+
+def _hook_ns(loops: int, empty: float, sinks=None) -> tuple:
+    """ns per span() enter/exit and per count(), net of an empty loop; enabled if sinks is given"""
+    if sinks is not None:
+        instrumentation.enable(*sinks)
+    try:
+        span_ns = max(0.0, min(_loop_ns(_spans, loops) for _ in range(3)) - empty)
+        count_ns = max(0.0, min(_loop_ns(_counts, loops) for _ in range(3)) - empty)
+    finally:
+        if sinks is not None:
+            instrumentation.disable()
+            instrumentation.reset()
+    return span_ns, count_ns
+
+
+def _generate_us(prd: str, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        generate_portfolio_with_tasks(RESUME, prd)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def _latency_us(prd: str, iterations: int, rounds: int, metrics_path: Path) -> dict:
+    """Median generate latency per configuration, run in rotating rounds so drift is shared"""
+    configurations = {
+        "disabled": None,
+        "enabled": lambda: (),
+        "jsonl": lambda: (instrumentation.JSONLinesSink(metrics_path),),
+    }
+    names = list(configurations)
+    samples = {name: [] for name in names}
+    for number in range(rounds):
+        for name in names[number % len(names):] + names[:number % len(names)]:
+            if configurations[name] is not None:
+                instrumentation.enable(*configurations[name]())
+            samples[name].extend(_generate_us(prd, max(1, iterations // rounds)))
+            instrumentation.disable()
+    instrumentation.reset()
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def bench_overhead(loops: int = 1_000_000, iterations: int = 300, rounds: int = 10) -> dict:
+    if instrumentation.enabled():
+        raise RuntimeError("disable instrumentation (unset PORTFOLIO_METRICS) before benchmarking")
+    prd = PRD_PATH.read_text(encoding="utf-8")
+    _generate_us(prd, 20)  # warm imports, the PRD index and the allocator
+
+    empty = min(_loop_ns(_empty, loops) for _ in range(3))
+    span_ns, count_ns = _hook_ns(loops, empty)
+    enabled_loops = max(1, loops // 10)  # enabled hooks are ~10x dearer
+    enabled_ns = _hook_ns(enabled_loops, empty, ())
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_ns = _hook_ns(enabled_loops, empty, (instrumentation.JSONLinesSink(Path(tmp) / "bench.jsonl"),))
+        latency = _latency_us(prd, iterations, rounds, Path(tmp) / "metrics.jsonl")
+
+    sink = _CountingSink()
+    instrumentation.enable(sink)
+    generate_portfolio_with_tasks(RESUME, prd)
+    instrumentation.disable()
+    hooks = sink.records
+
+    def share(hook_ns):
+        return round(hooks * max(hook_ns) / (latency["disabled"] * 1000) * 100, 4)
+
+    return {
+        "disabled_span_ns": round(span_ns, 1),
+        "disabled_count_ns": round(count_ns, 1),
+        "enabled_span_ns": round(enabled_ns[0], 1),
+        "jsonl_span_ns": round(jsonl_ns[0], 1),
+        "hooks_per_generate": hooks,
+        "generate_disabled_us": round(latency["disabled"], 2),
+        "generate_enabled_us": round(latency["enabled"], 2),
+        "generate_jsonl_us": round(latency["jsonl"], 2),
+        "disabled_overhead_pct": share((span_ns, count_ns)),
+        "enabled_overhead_pct": share(enabled_ns),
+        "jsonl_overhead_pct": share(jsonl_ns),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cost of the instrumentation hooks")
+    parser.add_argument("--loops", type=int, default=1_000_000, help="Calls per micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=300, help="generate calls per configuration")
+    parser.add_argument("--rounds", type=int, default=10, help="Interleaved rounds the iterations are split into")
+    parser.add_argument("--disabled-budget-pct", type=float, default=1.0,
+                        help="Max estimated disabled overhead as a share of a generate call")
+    args = parser.parse_args(argv)
+
+    result = bench_overhead(args.loops, args.iterations, args.rounds)
+    print(json.dumps(result))
+    if result["disabled_overhead_pct"] > args.disabled_budget_pct:
+        print(f"BUDGET EXCEEDED: disabled overhead {result['disabled_overhead_pct']}% "
+              f"> {args.disabled_budget_pct}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
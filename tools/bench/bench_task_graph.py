@@ -0,0 +1,97 @@
+"""
+Task Graph Benchmark
+====================
+
+Builds synthetic layered plans (default 10k and 50k tasks) and times the
+operations the tracker relies on: building + topological ordering, a full
+critical-path schedule, and completing every task one by one through the
+incremental ready set. Exits non-zero if a budget is exceeded.
+
+Usage:
+    python tools/bench/bench_task_graph.py
+    python tools/bench/bench_task_graph.py --sizes 10000 100000 --complete-budget-us 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from task_graph import TaskGraph  # noqa: E402
+
+
+def build_layered_graph(size: int, width: int = 50, max_deps: int = 3, seed: int = 7) -> TaskGraph:
+    """Tasks arranged in layers of `width`, each depending on up to max_deps tasks of the previous layer"""
+    rng = random.Random(seed)
+    graph = TaskGraph()
+    for node in range(size):
+        layer = node // width
+        deps = ()
+        if layer:
+            previous = range((layer - 1) * width, min(layer * width, size))
+            deps = [f"t{dep}" for dep in rng.sample(previous, k=min(max_deps, len(previous)))]
+        graph.add_task(f"t{node}", rng.choice((0.25, 0.5, 1.0, 2.0)), deps)
+    return graph
+
+
+def bench_size(size: int) -> dict:
+    start = time.perf_counter()
+    graph = build_layered_graph(size)
+    order = graph.topological_order()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    schedule = graph.schedule()
+    schedule_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    completed = 0
+    ready = graph.ready_tasks()
+    while ready:
+        next_ready = []
+        for task_id in ready:
+            next_ready.extend(graph.complete(task_id))
+            completed += 1
+        ready = next_ready
+    complete_s = time.perf_counter() - start
+
+    assert completed == size == len(order), "every task should become ready exactly once"
+    return {
+        "tasks": size,
+        "build_and_order_ms": round(build_ms, 2),
+        "schedule_ms": round(schedule_ms, 2),
+        "critical_path_length": len(schedule.critical_path),
+        "complete_per_task_us": round(complete_s / size * 1e6, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the task dependency graph")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--schedule-budget-ms", type=float, default=250.0,
+                        help="Max schedule() time for a 10k-task plan (scaled linearly by size)")
+    parser.add_argument("--complete-budget-us", type=float, default=25.0,
+                        help="Max average complete() cost per task")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for size in args.sizes:
+        result = bench_size(size)
+        print(json.dumps(result))
+        schedule_budget = args.schedule_budget_ms * size / 10_000
+        if result["schedule_ms"] > schedule_budget:
+            failures.append(f"{size} tasks: schedule {result['schedule_ms']}ms > {schedule_budget:.0f}ms")
+        if result["complete_per_task_us"] > args.complete_budget_us:
+            failures.append(f"{size} tasks: complete {result['complete_per_task_us']}us "
+                            f"> {args.complete_budget_us}us")
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
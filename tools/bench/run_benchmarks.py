@@ -0,0 +1,379 @@
+"""
+Generation Pipeline Benchmarks
+==============================
+
+Measures the Python generation pipeline on synthetic fixtures and compares
+the results with a stored baseline:
+
+- generate_portfolio_with_tasks latency percentiles (p50/p95/p99)
+- peak traced memory per call for 1-page up to very large resumes
+- batch throughput (resumes/sec) across resume sizes
+- PRD size scaling (cold parse + selection, warm call)
+- task graph scheduling at 10k tasks
+- CLI startup: wall-clock time of `system_prompt.py status` vs. a bare interpreter
+- skill scoring per resume against a 5k-skill catalog (skipped without numpy)
+- instrumentation: disabled hook cost and its share of a generate call
+- placeholder substitution throughput over a 16x PRD
+
+Results are written as JSON. Each suite runs several rounds and reports the
+median of each metric, so one noisy round moves nothing. Each tracked metric
+records whether lower or higher is better; the run fails when any metric
+regresses past the threshold, the same for every metric.
+
+The gate only compares like with like: it needs at least MIN_GATE_REPEAT
+rounds, and the baseline must have been recorded with the same quick/workers/
+CPU configuration. Otherwise the results are printed but not gated.
+
+Usage:
+    python tools/bench/run_benchmarks.py                      # compare with baseline.json
+    python tools/bench/run_benchmarks.py --output results.json --threshold 0.3
+    python tools/bench/run_benchmarks.py --update-baseline    # accept current numbers
+    python tools/bench/run_benchmarks.py --quick --repeat 1   # smoke run, not gated
+
+Independently of the baseline, the run fails when `status` takes more than
+--status-budget-ms (default 50) on top of interpreter startup.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOLS_DIR))
+
+import prd_index  # noqa: E402
+from batch import BatchGenerator, BatchItem  # noqa: E402
+from bench_instrumentation import bench_overhead  # noqa: E402
+from bench_task_graph import bench_size  # noqa: E402
+from system_prompt import generate_portfolio_with_tasks  # noqa: E402
+from task_model import default_plan, render_task_file  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+PRD_PATH = TOOLS_DIR / "PRODUCT_REQUIREMENTS_DOCUMENT.md"
+CLI_PATH = TOOLS_DIR / "system_prompt.py"
+
+RESUME_SIZES = {"1-page": 1, "5-page": 5, "50-page": 50, "500-page": 500}
+PRD_SCALES = (1, 4, 16)
+GRAPH_RUNS = 5
+MIN_GATE_REPEAT = 3
+GATE_CONFIG = ("quick", "workers", "cpus")  # meta fields a baseline must share with the run
+
+SKILLS = ("Python", "React", "TypeScript", "AWS", "SQL", "Pandas", "Docker", "Kubernetes",
+          "Machine Learning", "Prompt Engineering", "Spark", "Tableau", "Terraform", "Go")
+COMPANIES = ("Verizon", "ADP", "Citi", "Accenture", "Acme Corp", "Globex", "Initech", "Umbrella")
+
+
+# -- fixtures ---------------------------------------------------------------
+
+def synthetic_resume(pages: int, seed: int = 1) -> str:
+    """Plain-text resume of roughly `pages` pages (~3 KB per page)"""
+    rng = random.Random(seed)
+    lines = ["Jordan Example", "Senior Python & AI Engineer", "jordan@example.com | New York, NY", ""]
+    lines += ["SUMMARY", "Engineer building data platforms and LLM tooling. " * 4, ""]
+    lines += ["SKILLS", ", ".join(rng.sample(SKILLS, 8)), "", "EXPERIENCE"]
+    target = pages * 3000
+    year = 2024
+    while sum(len(line) + 1 for line in lines) < target:
+        company = rng.choice(COMPANIES)
+        lines.append(f"{company} - {rng.choice(('Engineer', 'Data Engineer', 'ML Engineer'))}"
+                     f" ({year - 2} - {year})")
+        for _ in range(4):
+            lines.append(f"- Built {rng.choice(SKILLS)} pipelines with {rng.choice(SKILLS)}, "
+                         f"cutting processing time by {rng.randint(10, 90)}%")
+        lines.append("")
+        year -= 1
+    return "\n".join(lines)
+
+
+def synthetic_prd(scale: int) -> str:
+    """The real PRD with its top-level sections repeated `scale` times under distinct headings"""
+    base = PRD_PATH.read_text(encoding="utf-8")
+    if scale <= 1:
+        return base
+    index = prd_index.PRDIndex(base)
+    parts = [index.preamble]
+    for copy in range(scale):
+        for section in index.sections:
+            parts.append(section.text.replace(section.raw_title, f"{section.raw_title} ({copy + 1})", 1))
+    return "".join(parts)
+
+
+# -- measurements -----------------------------------------------------------
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+def time_calls(func, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_latency(prd: str, iterations: int) -> dict:
+    resume = synthetic_resume(1)
+    generate_portfolio_with_tasks(resume, prd, "Jordan Example")  # warm the PRD index
+    samples = time_calls(lambda: generate_portfolio_with_tasks(resume, prd, "Jordan Example"), iterations)
+    return {
+        "generate.p50_ms": (round(percentile(samples, 50), 4), "ms", "lower"),
+        "generate.p95_ms": (round(percentile(samples, 95), 4), "ms", "lower"),
+        "generate.p99_ms": (round(percentile(samples, 99), 4), "ms", "lower"),
+    }
+
+
+def bench_memory(prd: str) -> dict:
+    metrics = {}
+    for label, pages in RESUME_SIZES.items():
+        resume = synthetic_resume(pages)
+        generate_portfolio_with_tasks(resume, prd, None)
+        tracemalloc.start()
+        generate_portfolio_with_tasks(resume, prd, None)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics[f"memory.{label}.peak_kb"] = (round(peak / 1024, 1), "KiB", "lower")
+    return metrics
+
+
+def bench_batch(prd: str, items_per_size: int, workers: int) -> dict:
+    metrics = {}
+    with BatchGenerator(prd, workers=workers, executor="process", chunksize=16) as generator:
+        list(generator.run(BatchItem(str(i), "warmup") for i in range(workers * 4)))
+        for label, pages in RESUME_SIZES.items():
+            resume = synthetic_resume(pages)
+            count = max(workers, items_per_size // max(1, pages // 5))
+            items = [BatchItem(f"{label}-{i}", resume) for i in range(count)]
+            results = list(generator.run(items, ordered=False))
+            failed = sum(1 for result in results if not result.ok)
+            if failed:
+                raise RuntimeError(f"{failed} batch items failed for {label}")
+            metrics[f"batch.{label}.resumes_per_sec"] = (
+                round(generator.stats.resumes_per_sec, 1), "resumes/s", "higher")
+    return metrics
+
+
+def bench_prd_scaling(iterations: int) -> dict:
+    metrics = {}
+    resume = synthetic_resume(1)
+    for scale in PRD_SCALES:
+        prd = synthetic_prd(scale)
+        cold = time_calls(lambda: prd_index.PRDIndex(prd).select("ai-ml", 4000), max(3, iterations // 20))
+        generate_portfolio_with_tasks(resume, prd, "Jordan Example")
+        warm = time_calls(lambda: generate_portfolio_with_tasks(resume, prd, "Jordan Example"),
+                          max(10, iterations // 4))
+        metrics[f"prd.x{scale}.cold_parse_ms"] = (round(statistics.median(cold), 3), "ms", "lower")
+        metrics[f"prd.x{scale}.warm_generate_ms"] = (round(statistics.median(warm), 4), "ms", "lower")
+    return metrics
+
+
+def bench_graph() -> dict:
+    runs = [bench_size(10_000) for _ in range(GRAPH_RUNS)]
+    return {
+        "graph.10k.schedule_ms": (statistics.median(run["schedule_ms"] for run in runs), "ms", "lower"),
+        "graph.10k.complete_per_task_us": (
+            statistics.median(run["complete_per_task_us"] for run in runs), "us", "lower"),
+    }
+
+
+def bench_skills(resumes: int) -> dict:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return {}
+    from skill_scoring import CATEGORIES, SkillIndex, score_many
+
+    catalog = [(cid, title, icon, description, dict(skills)) for cid, title, icon, description, skills in CATEGORIES]
+    for number in range(5000):
+        catalog[number % len(catalog)][4][f"Skill{number} Framework"] = ()
+    index = SkillIndex(catalog)
+    metrics = {}
+    for label, pages in (("1-page", 1), ("5-page", 5)):
+        texts = [synthetic_resume(pages, seed) for seed in range(resumes)]
+        start = time.perf_counter()
+        for _ in score_many(texts, index=index, now=2025.0):
+            pass
+        elapsed = (time.perf_counter() - start) * 1000
+        metrics[f"skills.5k.{label}.ms_per_resume"] = (round(elapsed / resumes, 3), "ms", "lower")
+    return metrics
+
+
+def bench_instrumentation(iterations: int) -> dict:
+    result = bench_overhead(loops=200_000, iterations=iterations)
+    return {
+        "instrumentation.disabled_span_ns": (result["disabled_span_ns"], "ns", "lower"),
+        "instrumentation.disabled_overhead_pct": (result["disabled_overhead_pct"], "%", "lower"),
+    }
+
+
+def bench_placeholders(iterations: int) -> dict:
+    from placeholders import personal_values, substitute
+
+    document = synthetic_prd(16)
+    values = personal_values(None, synthetic_resume(1), "2025-08-28", "2025-09-04")
+    samples = time_calls(lambda: substitute(document, values), iterations)
+    seconds = statistics.median(samples) / 1000
+    return {"placeholders.x16.mb_per_sec": (round(len(document) / seconds / 1e6, 2), "MB/s", "higher")}
+
+
+def time_process(command, runs: int) -> float:
+    """Median wall-clock milliseconds to run a command to completion"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_startup(runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        task_file = Path(tmp) / "task.md"
+        task_file.write_text(render_task_file(default_plan("Jordan Example", "2025-08-28", "2025-09-04")),
+                             encoding="utf-8")
+        interpreter = time_process([sys.executable, "-c", "pass"], runs)
+        status = time_process([sys.executable, str(CLI_PATH), "status", str(task_file)], runs)
+    return {
+        "cli.interpreter_ms": (round(interpreter, 2), "ms", "lower"),
+        "cli.status_ms": (round(status, 2), "ms", "lower"),
+        "cli.status_overhead_ms": (round(max(0.0, status - interpreter), 2), "ms", "lower"),
+    }
+
+
+def run_once(prd: str, iterations: int, batch_items: int, workers: int) -> dict:
+    metrics = {}
+    metrics.update(bench_latency(prd, iterations))
+    metrics.update(bench_memory(prd))
+    metrics.update(bench_batch(prd, batch_items, workers))
+    metrics.update(bench_prd_scaling(iterations))
+    metrics.update(bench_graph())
+    metrics.update(bench_startup(max(5, iterations // 30)))
+    metrics.update(bench_skills(max(20, iterations // 3)))
+    metrics.update(bench_instrumentation(max(20, iterations // 3)))
+    metrics.update(bench_placeholders(max(10, iterations // 10)))
+    return metrics
+
+
+def run_all(quick: bool = False, workers: int = None, repeat: int = 5) -> dict:
+    """Run every benchmark `repeat` times and keep the median of each metric"""
+    iterations = 50 if quick else 300
+    workers = workers or os.cpu_count() or 1
+    prd = PRD_PATH.read_text(encoding="utf-8")
+    samples = {}
+    for _ in range(max(1, repeat)):
+        for name, (value, unit, better) in run_once(prd, iterations, 64 if quick else 512, workers).items():
+            samples.setdefault(name, ([], unit, better))[0].append(value)
+    metrics = {name: (round(statistics.median(values), 4), unit, better)
+               for name, (values, unit, better) in samples.items()}
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "workers": workers,
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "metrics": {name: {"value": value, "unit": unit, "better": better}
+                    for name, (value, unit, better) in metrics.items()},
+    }
+
+
+# -- baseline comparison ----------------------------------------------------
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results with a baseline
+
+    Args:
+        results: Output of run_all()
+        baseline: Previously stored results
+        threshold: Allowed relative regression (0.2 = 20% worse)
+
+    Returns:
+        List of (metric, baseline value, current value, change) for regressions
+    """
+    regressions = []
+    for name, current in results["metrics"].items():
+        reference = baseline.get("metrics", {}).get(name)
+        if reference is None or not reference["value"]:
+            continue
+        change = (current["value"] - reference["value"]) / reference["value"]
+        worse = change if current["better"] == "lower" else -change
+        if worse > threshold:
+            regressions.append((name, reference["value"], current["value"], change))
+    return regressions
+
+
+def gate_mismatch(results: dict, baseline: dict) -> list:
+    """Reasons the results cannot be gated against this baseline (empty: comparable)"""
+    run, recorded = results["meta"], baseline.get("meta", {})
+    reasons = [f"{field}={run.get(field)} but the baseline has {field}={recorded.get(field)}"
+               for field in GATE_CONFIG if run.get(field) != recorded.get(field)]
+    if run.get("repeat", 1) < MIN_GATE_REPEAT:
+        reasons.append(f"repeat={run.get('repeat')} is below {MIN_GATE_REPEAT}")
+    return reasons
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio generation pipeline")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON here")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed relative regression per metric (default 0.5 = 50%% worse)")
+    parser.add_argument("--workers", type=int, default=None, help="Batch pool size")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per metric; the median counts")
+    parser.add_argument("--status-budget-ms", type=float, default=50.0,
+                        help="Max `status` time on top of interpreter startup")
+    parser.add_argument("--update-baseline", action="store_true", help="Store results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_all(quick=args.quick, workers=args.workers, repeat=args.repeat)
+    serialized = json.dumps(results, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(serialized, encoding="utf-8")
+    else:
+        print(serialized, end="")
+
+    overhead = results["metrics"]["cli.status_overhead_ms"]["value"]
+    over_budget = overhead > args.status_budget_ms
+    if over_budget:
+        print(f"OVER BUDGET cli.status_overhead_ms: {overhead} > {args.status_budget_ms}", file=sys.stderr)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline updated: {args.baseline}", file=sys.stderr)
+        return 1 if over_budget else 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+        return 1 if over_budget else 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    mismatch = gate_mismatch(results, baseline)
+    if mismatch:
+        print("not gating: " + "; ".join(mismatch), file=sys.stderr)
+        return 1 if over_budget else 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before} -> {after} ({change:+.1%})", file=sys.stderr)
+    if not regressions:
+        print("no regressions against baseline", file=sys.stderr)
+    return 1 if regressions or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Resume Data Layer Emitter
+=========================
+
+Turns extracted resume data into the TypeScript data modules STEP 7 of the
+system prompt asks for (src/data/personal.ts, experience.ts, projects.ts),
+typed against the interfaces in src/types/index.ts.
+
+Each module is rendered in memory and compared with the file on disk; only
+modules whose content actually changed are written, so regenerating for a user
+whose resume did not change leaves the tree (and Vite's HMR / the Pages deploy)
+untouched.
+
+Input (JSON) shape:
+    {
+      "personal":    {"name", "title", "bio", "tagline", "location", "email", "image"},
+      "socialLinks": [{"platform", "url", "icon", "label"}],
+      "contact":     {"email", "phone"?, "location", "calendlyUrl"?, "resumeUrl"},
+      "experiences": [{"id"?, "company", "role", "period", "location", "description": [],
+                       "technologies": [], "image", "achievements"?: []}],
+      "projects":    [{"id"?, "title", "description", "longDescription"?, "technologies": [],
+                       "githubUrl", "liveUrl"?, "image"?, "featured", "category"}]
+    }
+
+Usage:
+    python tools/data_emitter.py resume.json
+    python tools/data_emitter.py resume.json --check   # exit 1 if any module would change
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "src" / "data"
+
+PROJECT_CATEGORIES = ("data-science", "automation", "web", "ai", "cryptography", "other")
+
+# Field order follows the interfaces in src/types/index.ts; "?" marks optional fields
+PERSONAL_FIELDS = ("name", "title", "bio", "tagline", "location", "email", "image")
+SOCIAL_FIELDS = ("platform", "url", "icon", "label")
+CONTACT_FIELDS = ("email", "phone?", "location", "socialLinks", "calendlyUrl?", "resumeUrl")
+EXPERIENCE_FIELDS = ("id", "company", "role", "period", "location", "description",
+                     "technologies", "image", "achievements?")
+PROJECT_FIELDS = ("id", "title", "description", "longDescription?", "technologies",
+                  "githubUrl", "liveUrl?", "image?", "featured", "category")
+
+
+class EmitError(ValueError):
+    """Resume data does not satisfy the TypeScript interfaces"""
+
+
+class _Ref:
+    """Reference to another exported constant, emitted as a shorthand property"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def ts_string(value: str) -> str:
+    """Double-quoted literal for single-line text, template literal for multi-line text"""
+    if "\n" in value:
+        escaped = value.replace("\\", "\\\\").replace("`", "\\`").replace("${", "\\${")
+        return f"`{escaped}`"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def ts_value(value, indent: str, asset: bool = False) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    if isinstance(value, str):
+        if asset and not re.match(r"^(/|https?:|data:)", value):
+            return f"getAssetPath({ts_string(value)})"
+        return ts_string(value)
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return "[]"
+        if all(isinstance(item, str) for item in value) and sum(len(item) for item in value) < 80:
+            return "[" + ", ".join(ts_string(item) for item in value) + "]"
+        inner = indent + "  "
+        return "[\n" + ",\n".join(inner + ts_value(item, inner) for item in value) + f"\n{indent}]"
+    raise EmitError(f"unsupported value {value!r}")
+
+
+def ts_object(record: dict, fields, indent: str, where: str, asset_fields=()) -> str:
+    inner = indent + "  "
+    lines = []
+    for field in fields:
+        optional = field.endswith("?")
+        name = field.rstrip("?")
+        value = record.get(name)
+        if isinstance(value, _Ref):
+            lines.append(f"{inner}{value.name}")
+            continue
+        if value is None or (optional and value in ("", [])):
+            if optional:
+                continue
+            raise EmitError(f"{where}: missing required field {name!r}")
+        lines.append(f"{inner}{name}: {ts_value(value, inner, asset=name in asset_fields)}")
+    unknown = set(record) - {field.rstrip("?") for field in fields}
+    if unknown:
+        raise EmitError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    return "{\n" + ",\n".join(lines) + f"\n{indent}}}"
+
+
+def _with_ids(records: List[dict], key_field: str) -> List[dict]:
+    """Fill in missing ids from a slug of key_field, keeping them unique"""
+    seen = set()
+    result = []
+    for record in records:
+        record = dict(record)
+        base = record.get("id") or slugify(record.get(key_field, "")) or "item"
+        candidate, suffix = base, 2
+        while candidate in seen:
+            candidate, suffix = f"{base}-{suffix}", suffix + 1
+        record["id"] = candidate
+        seen.add(candidate)
+        result.append(record)
+    return result
+
+
+def render_personal(data: dict) -> str:
+    social = data.get("socialLinks", [])
+    contact = dict(data.get("contact") or {})
+    contact["socialLinks"] = _Ref("socialLinks")  # shared by reference, as in the hand-written module
+    personal = ts_object(data.get("personal") or {}, PERSONAL_FIELDS, "", "personal")
+    links = ",\n".join("  " + ts_object(link, SOCIAL_FIELDS, "  ", f"socialLinks[{i}]")
+                       for i, link in enumerate(social))
+    contact_body = ts_object(contact, CONTACT_FIELDS, "", "contact")
+    return (
+        "import type { PersonalInfo, ContactInfo, SocialLink } from '@/types'\n\n"
+        f"export const personalInfo: PersonalInfo = {personal}\n\n"
+        f"export const socialLinks: SocialLink[] = [\n{links}\n]\n\n"
+        f"export const contactInfo: ContactInfo = {contact_body}"
+    )
+
+
+def render_experience(data: dict) -> str:
+    experiences = _with_ids(data.get("experiences", []), "company")
+    body = ",\n".join("  " + ts_object(exp, EXPERIENCE_FIELDS, "  ", f"experiences[{i}]",
+                                       asset_fields=("image",))
+                      for i, exp in enumerate(experiences))
+    # tsconfig has noUnusedLocals, so the helper is only imported when a logo uses it
+    uses_asset_path = "getAssetPath(" in body
+    return (
+        "import type { Experience } from '@/types'\n"
+        + ("import { getAssetPath } from '@/lib/paths'\n" if uses_asset_path else "")
+        + (f"\nexport const experiences: Experience[] = [\n{body}\n]" if body
+           else "\nexport const experiences: Experience[] = []")
+    )
+
+
+def render_projects(data: dict) -> str:
+    projects = _with_ids(data.get("projects", []), "title")
+    for i, project in enumerate(projects):
+        project.setdefault("featured", False)
+        project.setdefault("category", "other")
+        if project["category"] not in PROJECT_CATEGORIES:
+            raise EmitError(f"projects[{i}]: category must be one of {', '.join(PROJECT_CATEGORIES)}")
+    body = ",\n".join("  " + ts_object(project, PROJECT_FIELDS, "  ", f"projects[{i}]")
+                      for i, project in enumerate(projects))
+    return (
+        "import type { Project } from '@/types'\n\n"
+        f"export const projects: Project[] = [\n{body}\n]\n\n"
+        "export const featuredProjects = projects.filter(project => project.featured)\n"
+        "export const projectsByCategory = (category: Project['category']) => \n"
+        "  projects.filter(project => project.category === category)"
+    )
+
+
+RENDERERS = {
+    "personal.ts": render_personal,
+    "experience.ts": render_experience,
+    "projects.ts": render_projects,
+}
+
+
+def render_modules(data: dict) -> Dict[str, str]:
+    """Render every data module; only sections present in data are rendered"""
+    present = {
+        "personal.ts": "personal" in data,
+        "experience.ts": "experiences" in data,
+        "projects.ts": "projects" in data,
+    }
+    return {name: render(data) for name, render in RENDERERS.items() if present[name]}
+
+
+def _atomic_write(path: Path, content: str):
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(content)
+        os.chmod(tmp_path, mode)  # mkstemp creates 0600; the modules are checked-in sources
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def emit_data_modules(data: dict, data_dir: Path = DEFAULT_DATA_DIR, check: bool = False) -> Dict[str, str]:
+    """
+    Write the src/data modules whose content changed
+
+    Args:
+        data: Extracted resume structure (see module docstring)
+        data_dir: Directory holding the TypeScript data modules
+        check: Only report what would change, write nothing
+
+    Returns:
+        Mapping of file name -> "unchanged", "updated" or "created"
+    """
+    data_dir = Path(data_dir)
+    report = {}
+    for name, content in render_modules(data).items():
+        path = data_dir / name
+        try:
+            existing = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            existing = None
+        if existing == content:
+            report[name] = "unchanged"
+            continue
+        report[name] = "created" if existing is None else "updated"
+        if not check:
+            data_dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, content)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Emit src/data/*.ts from extracted resume JSON")
+    parser.add_argument("resume_json", type=Path, help="Extracted resume structure")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any module would change")
+    args = parser.parse_args(argv)
+
+    data = json.loads(args.resume_json.read_text(encoding="utf-8"))
+    try:
+        report = emit_data_modules(data, args.data_dir, check=args.check)
+    except EmitError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    for name, state in report.items():
+        print(f"{state:>9}  {args.data_dir / name}")
+    changed = any(state != "unchanged" for state in report.values())
+    return 1 if args.check and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
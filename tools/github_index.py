@@ -0,0 +1,819 @@
+"""
+GitHub Project Metadata Index
+=============================
+
+Builds the project data STEP 7 / STEP 13 of the system prompt curate by hand
+(src/data/projects.ts) from local sources instead of live API calls:
+
+- Cloned repositories: HEAD, last commit time and origin URL are read straight
+  from .git (git is only used as a fallback for packed objects); languages are
+  totalled by bytes from the working tree; description, keywords and homepage
+  come from package.json / pyproject.toml, plus a README summary.
+- JSON dumps: a file of repository objects as returned by the GitHub API
+  (`gh api users/<owner>/repos --paginate > repos.json`), or a directory
+  mirroring API paths, which stands in for the API:
+      <dir>/users/<owner>/repos.json
+      <dir>/repos/<owner>/<name>/languages.json
+      <dir>/repos/<owner>/<name>/readme.json     ({"content": base64} or {"text": ...})
+
+The index is a compact JSON file keyed by owner/name (clones without a GitHub
+origin by their resolved path), holding one entry per source (clone, api). Updates are incremental: a clone is rescanned only when
+its HEAD commit changed, a dump entry only when its pushed_at changed, and
+changed repositories are scanned on a process pool.
+
+Ranking for "featured" combines recency, popularity, code size, documentation
+and (with a resume) overlap with the user's skills, then keeps at most two
+picks per category so the showcase stays varied.
+
+Usage:
+    python tools/github_index.py scan ~/code --dump repos.json --dump api-mirror/
+    python tools/github_index.py rank --resume resume.pdf
+    python tools/github_index.py projects --featured 6 --output projects.json
+    python tools/github_index.py projects --emit          # rewrite src/data/projects.ts
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX = TOOLS_DIR / ".cache" / "github-index.json"
+INDEX_VERSION = 2  # 2: origin-less clones keyed by path
+
+LANGUAGES = {
+    ".py": "Python", ".ipynb": "Jupyter Notebook", ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".html": "HTML", ".htm": "HTML", ".css": "CSS", ".scss": "SCSS", ".sass": "SCSS", ".less": "Less",
+    ".vue": "Vue", ".svelte": "Svelte", ".java": "Java", ".kt": "Kotlin", ".scala": "Scala",
+    ".cs": "C#", ".vb": "Visual Basic .NET", ".fs": "F#", ".c": "C", ".h": "C", ".cpp": "C++",
+    ".cc": "C++", ".cxx": "C++", ".hpp": "C++", ".go": "Go", ".rs": "Rust", ".rb": "Ruby",
+    ".php": "PHP", ".swift": "Swift", ".m": "Objective-C", ".dart": "Dart", ".r": "R",
+    ".jl": "Julia", ".lua": "Lua", ".pl": "Perl", ".sql": "SQL", ".sh": "Shell", ".bash": "Shell",
+    ".zsh": "Shell", ".ps1": "PowerShell", ".psm1": "PowerShell", ".bat": "Batchfile",
+    ".tf": "HCL", ".sol": "Solidity", ".ex": "Elixir", ".exs": "Elixir", ".hs": "Haskell",
+}
+FILENAME_LANGUAGES = {"Dockerfile": "Dockerfile", "Makefile": "Makefile"}
+SKIP_DIRS = frozenset((".git", "node_modules", "vendor", "dist", "build", "out", "target", "__pycache__",
+                       ".venv", "venv", "env", ".tox", ".nox", ".next", ".cache", "bower_components",
+                       "site-packages", ".ipynb_checkpoints", "coverage"))
+MAX_FILES = 50_000
+README_NAMES = ("readme.md", "readme.rst", "readme.txt", "readme")
+SUMMARY_CHARS = 240
+
+CATEGORY_KEYWORDS = {
+    "ai": {"ai", "llm", "llms", "gpt", "openai", "claude", "anthropic", "langchain", "rag", "chatbot",
+           "agent", "agents", "assistant", "nlp", "speech", "speech-recognition", "deep-learning",
+           "pytorch", "tensorflow", "transformers", "prompt", "prompts", "red-teaming"},
+    "data-science": {"data", "data-science", "data-analysis", "dataset", "pandas", "numpy", "jupyter",
+                     "visualization", "analytics", "statistics", "kaggle", "machine-learning", "ml",
+                     "etl", "spark"},
+    "automation": {"automation", "script", "scripts", "devops", "ci", "cli", "bot", "setup",
+                   "ansible", "terraform", "toolkit", "workflow", "powershell", "bash"},
+    "web": {"web", "website", "react", "frontend", "portfolio", "nextjs", "vue", "svelte", "django",
+            "flask", "fastapi", "api", "tailwind", "vite"},
+    "cryptography": {"cryptography", "crypto", "encryption", "steganography", "security", "cipher",
+                     "hashing", "pentest"},
+}
+LANGUAGE_CATEGORIES = {
+    "Jupyter Notebook": "data-science", "R": "data-science", "Julia": "data-science",
+    "PowerShell": "automation", "Shell": "automation", "Batchfile": "automation", "HCL": "automation",
+    "TypeScript": "web", "JavaScript": "web", "HTML": "web", "CSS": "web", "SCSS": "web", "Vue": "web",
+    "Svelte": "web",
+}
+ACRONYMS = {"ai", "ml", "llm", "api", "aws", "gcp", "cli", "ui", "ux", "nlp", "rag", "sql", "css",
+            "html", "gpt", "ci", "cd", "etl", "iot", "gui"}
+
+# Ranking weights: recency, popularity, code size, documentation, resume relevance
+WEIGHTS = {"recency": 0.30, "popularity": 0.25, "substance": 0.20, "docs": 0.15, "relevance": 0.10}
+RECENCY_HALF_LIFE_DAYS = 365
+POPULARITY_SCALE = 100        # stars (+ half the forks) that count as fully popular
+SUBSTANCE_SCALE = 1_000_000   # language bytes that count as a substantial codebase
+FORK_FACTOR = 0.6
+ARCHIVED_FACTOR = 0.8
+PER_CATEGORY = 2
+
+
+# -- git --------------------------------------------------------------------
+
+def git_dir(repo: Path) -> Optional[Path]:
+    """The repository's git directory, following `gitdir:` files (worktrees, submodules)"""
+    dot_git = repo / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        text = dot_git.read_text(encoding="utf-8", errors="replace").strip()
+        if text.startswith("gitdir:"):
+            target = Path(text[7:].strip())
+            return target if target.is_absolute() else (repo / target).resolve()
+    return None
+
+
+def _common_dir(gitdir: Path) -> Path:
+    common = gitdir / "commondir"
+    if common.exists():
+        return (gitdir / common.read_text(encoding="utf-8").strip()).resolve()
+    return gitdir
+
+
+def head_commit(gitdir: Path) -> Optional[str]:
+    """Commit hash HEAD points at, from loose or packed refs"""
+    try:
+        head = (gitdir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: "):
+        return head or None
+    ref = head[5:].strip()
+    common = _common_dir(gitdir)
+    for base in (gitdir, common):
+        try:
+            return (base / ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+    try:
+        with open(common / "packed-refs", encoding="utf-8") as handle:
+            for line in handle:
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None  # unborn branch
+
+
+def commit_time(gitdir: Path, sha: str) -> Optional[int]:
+    """Committer timestamp of a commit: loose object if present, else `git log`"""
+    loose = _common_dir(gitdir) / "objects" / sha[:2] / sha[2:]
+    try:
+        data = zlib.decompress(loose.read_bytes())
+    except (OSError, zlib.error):
+        data = None
+    if data is not None:
+        for line in data.split(b"\n"):
+            if line.startswith(b"committer "):
+                try:
+                    return int(line.rsplit(b" ", 2)[1])
+                except (IndexError, ValueError):
+                    return None
+            if not line:
+                break
+        return None
+    if shutil.which("git") is None:
+        return None
+    try:
+        out = subprocess.run(["git", "--git-dir", str(gitdir), "log", "-1", "--format=%ct", sha],
+                             capture_output=True, text=True, timeout=30, check=True).stdout.strip()
+        return int(out) if out else None
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+_REMOTE_RE = re.compile(r'^\[remote "origin"\]\s*$(.*?)(?=^\[|\Z)', re.MULTILINE | re.DOTALL)
+_URL_RE = re.compile(r"^\s*url\s*=\s*(\S+)", re.MULTILINE)
+_GITHUB_RE = re.compile(r"github\.com[:/]+([\w.-]+)/([\w.-]+?)(?:\.git)?/?$")
+
+
+def origin_url(gitdir: Path) -> Optional[str]:
+    try:
+        config = (_common_dir(gitdir) / "config").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    section = _REMOTE_RE.search(config)
+    url = _URL_RE.search(section.group(1)) if section else None
+    return url.group(1) if url else None
+
+
+def github_name(url: Optional[str]) -> Optional[str]:
+    """git@github.com:owner/repo.git, https://github.com/owner/repo -> owner/repo"""
+    match = _GITHUB_RE.search(url or "")
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+
+# -- working tree -----------------------------------------------------------
+
+def language_bytes(repo: Path, max_files: int = MAX_FILES) -> Dict[str, int]:
+    """Bytes per language in the working tree, skipping dependency and build directories"""
+    totals: Dict[str, int] = {}
+    stack, seen = [str(repo)], 0
+    while stack and seen < max_files:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    seen += 1
+                    name = entry.name
+                    language = FILENAME_LANGUAGES.get(name)
+                    if language is None:
+                        if name.endswith((".min.js", ".min.css")):
+                            continue
+                        language = LANGUAGES.get(os.path.splitext(name)[1].lower())
+                    if language is not None:
+                        totals[language] = totals.get(language, 0) + entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return totals
+
+
+_BADGE_RE = re.compile(r"^\s*(?:\[!\[|!\[|<img|<a\s|<p\s|<div|<br|<h\d|</)", re.IGNORECASE)
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_TAG_RE = re.compile(r"<[^>]+>")
+_EMPHASIS_RE = re.compile(r"(\*\*|__|`|\*)")
+
+
+def readme_summary(text: str, limit: int = SUMMARY_CHARS) -> Optional[str]:
+    """First prose paragraph of a README, without badges, markup and headings"""
+    paragraph: List[str] = []
+    fenced = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            fenced = not fenced
+            continue
+        if fenced:
+            continue
+        prose = (stripped and not stripped.startswith(("#", "=", "-" * 3, "|", ">", "..", ":"))
+                 and not _BADGE_RE.match(stripped))
+        if prose:
+            paragraph.append(stripped)
+            continue
+        if paragraph:
+            candidate = _clean(" ".join(paragraph))
+            if len(candidate) >= 30:
+                return _truncate(candidate, limit)
+            paragraph = []
+    if paragraph:
+        candidate = _clean(" ".join(paragraph))
+        if candidate:
+            return _truncate(candidate, limit)
+    return None
+
+
+def _clean(text: str) -> str:
+    text = _LINK_RE.sub(r"\1", text)
+    text = _TAG_RE.sub("", text)
+    text = _EMPHASIS_RE.sub("", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if sentence >= limit // 2:
+        return cut[:sentence + 1]
+    return cut.rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+
+def _read_readme(repo: Path) -> Optional[str]:
+    try:
+        names = {entry.name.lower(): entry.name for entry in os.scandir(repo) if entry.is_file()}
+    except OSError:
+        return None
+    for candidate in README_NAMES:
+        if candidate in names:
+            try:
+                return (repo / names[candidate]).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                return None
+    return None
+
+
+def _manifest_metadata(repo: Path) -> dict:
+    """description / keywords / homepage from package.json or pyproject.toml"""
+    meta = {}
+    package = repo / "package.json"
+    if package.exists():
+        try:
+            data = json.loads(package.read_text(encoding="utf-8"))
+            meta = {"description": data.get("description"), "topics": data.get("keywords") or [],
+                    "homepage": data.get("homepage")}
+        except (OSError, ValueError):
+            pass
+    pyproject = repo / "pyproject.toml"
+    if pyproject.exists() and not meta.get("description"):
+        try:
+            import tomllib
+        except ImportError:
+            tomllib = None
+        if tomllib is not None:
+            try:
+                project = tomllib.loads(pyproject.read_text(encoding="utf-8")).get("project", {})
+                urls = project.get("urls") or {}
+                meta = {"description": project.get("description"), "topics": project.get("keywords") or [],
+                        "homepage": urls.get("Homepage") or urls.get("homepage")}
+            except (OSError, ValueError):
+                pass
+    return {key: value for key, value in meta.items() if value}
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def scan_clone(path: str, head: Optional[str]) -> dict:
+    """Index entry for one cloned repository"""
+    repo = Path(path)
+    gitdir = git_dir(repo)
+    url = origin_url(gitdir) if gitdir else None
+    full_name = github_name(url)
+    pushed = commit_time(gitdir, head) if gitdir and head else None
+    readme = _read_readme(repo)
+    entry = {
+        "name": full_name.split("/", 1)[1] if full_name else repo.name,
+        "url": f"https://github.com/{full_name}" if full_name else None,
+        "path": str(repo),
+        "head": head,
+        "pushed_at": _iso(pushed),
+        "languages": language_bytes(repo),
+        "summary": readme_summary(readme) if readme else None,
+    }
+    entry.update(_manifest_metadata(repo))
+    return entry
+
+
+def find_clones(roots: Iterable, depth: int = 2) -> Iterator[Path]:
+    """Git working trees at or below each root (not descending into a found repo)"""
+    for root in roots:
+        root = Path(root).expanduser()
+        level = [root]
+        for _ in range(depth + 1):
+            next_level = []
+            for directory in level:
+                if (directory / ".git").exists():
+                    yield directory
+                    continue
+                try:
+                    next_level.extend(Path(entry.path) for entry in os.scandir(directory)
+                                      if entry.is_dir(follow_symlinks=False)
+                                      and entry.name not in SKIP_DIRS and not entry.name.startswith("."))
+                except OSError:
+                    continue
+            level = next_level
+
+
+# -- API dumps --------------------------------------------------------------
+
+class LocalAPI:
+    """
+    Directory of saved GitHub API responses, addressed by API path
+
+    get("repos/octo/hello/languages") reads <root>/repos/octo/hello/languages.json.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def get(self, path: str):
+        file = self.root / (path.strip("/") + ".json")
+        try:
+            return json.loads(file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def repositories(self) -> Iterator[dict]:
+        for kind in ("users", "orgs"):
+            for listing in sorted((self.root / kind).glob("*/repos*.json")):
+                data = json.loads(listing.read_text(encoding="utf-8"))
+                yield from (data if isinstance(data, list) else data.get("items", []))
+
+    def languages(self, full_name: str) -> Optional[dict]:
+        return self.get(f"repos/{full_name}/languages")
+
+    def readme(self, full_name: str) -> Optional[str]:
+        data = self.get(f"repos/{full_name}/readme")
+        if not data:
+            return None
+        if "text" in data:
+            return data["text"]
+        if data.get("encoding") == "base64" and data.get("content"):
+            return base64.b64decode(data["content"]).decode("utf-8", errors="replace")
+        return None
+
+
+def load_dump(path) -> Tuple[List[dict], Optional[str]]:
+    """Repository objects from a JSON/JSONL dump or an API mirror directory, plus the mirror root"""
+    path = Path(path)
+    if path.is_dir():
+        return list(LocalAPI(path).repositories()), str(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()], None
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("repos") or data.get("items") or list(data.values())
+    return list(data), None
+
+
+def _dump_stamp(repo: dict) -> str:
+    return repo.get("head_sha") or f"pushed:{repo.get('pushed_at') or repo.get('updated_at')}"
+
+
+def scan_api(repo: dict, mirror: Optional[str]) -> dict:
+    """Index entry for one API repository object (languages/README from the object or the mirror)"""
+    full_name = repo.get("full_name") or repo.get("name")
+    api = LocalAPI(mirror) if mirror else None
+    languages = repo.get("languages")
+    if languages is None and api is not None:
+        languages = api.languages(full_name)
+    if languages is None and repo.get("language"):
+        languages = {repo["language"]: repo.get("size", 0) * 1024 or 1}  # size is in KB
+    readme = repo.get("readme")
+    if readme is None and api is not None:
+        readme = api.readme(full_name)
+    entry = {
+        "name": repo.get("name") or full_name.split("/")[-1],
+        "url": repo.get("html_url") or f"https://github.com/{full_name}",
+        "head": _dump_stamp(repo),
+        "pushed_at": repo.get("pushed_at") or repo.get("updated_at"),
+        "languages": languages or {},
+        "summary": readme_summary(readme) if readme else None,
+        "description": repo.get("description"),
+        "topics": repo.get("topics") or [],
+        "homepage": repo.get("homepage"),
+        "stars": repo.get("stargazers_count", 0),
+        "forks": repo.get("forks_count", 0),
+        "fork": bool(repo.get("fork")),
+        "archived": bool(repo.get("archived")),
+    }
+    return {key: value for key, value in entry.items() if value not in (None, "", [], {})}
+
+
+def _scan(job: tuple) -> Tuple[str, str, dict]:
+    kind, key, payload = job
+    if kind == "clone":
+        return kind, key, scan_clone(*payload)
+    return kind, key, scan_api(*payload)
+
+
+def _scan_chunk(jobs: List[tuple]) -> List[Tuple[str, str, dict]]:
+    return [_scan(job) for job in jobs]
+
+
+# -- index ------------------------------------------------------------------
+
+class Ranked(NamedTuple):
+    key: str
+    score: float
+    category: str
+    parts: Dict[str, float]
+
+
+class ProjectIndex:
+    """
+    Per-repository metadata keyed by owner/name, one entry per source
+
+    Args:
+        path: Index JSON file; loaded if it exists, written by save()
+    """
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = Path(path)
+        self.repos: Dict[str, Dict[str, dict]] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                self.repos = data.get("repos", {})
+
+    def update(self, clones: Iterable = (), dumps: Iterable = (), jobs: int = None,
+               prune: bool = False) -> dict:
+        """
+        Rescan sources whose HEAD (or pushed_at) changed since the last update
+
+        Returns:
+            {"scanned": n, "unchanged": n, "removed": n}
+        """
+        pending, seen, unchanged = [], set(), 0
+        for repo in clones:
+            repo = Path(repo).resolve()
+            gitdir = git_dir(repo)
+            head = head_commit(gitdir) if gitdir else None
+            # Without a GitHub origin the directory name isn't unique (a/utils, b/utils); the path is
+            key = (github_name(origin_url(gitdir)) if gitdir else None) or str(repo)
+            seen.add((key, "clone"))
+            known = self.repos.get(key, {}).get("clone")
+            if known and head and known.get("head") == head and known.get("path") == str(repo):
+                unchanged += 1
+                continue
+            pending.append(("clone", key, (str(repo), head)))
+        for dump in dumps:
+            repositories, mirror = load_dump(dump)
+            for repo in repositories:
+                key = repo.get("full_name") or repo.get("name")
+                if not key:
+                    continue
+                seen.add((key, "api"))
+                known = self.repos.get(key, {}).get("api")
+                if known and known.get("head") == _dump_stamp(repo):
+                    unchanged += 1
+                    continue
+                pending.append(("api", key, (repo, mirror)))
+
+        for kind, key, entry in self._run(pending, jobs):
+            self.repos.setdefault(key, {})[kind] = entry
+
+        removed = 0
+        if prune:
+            for key in list(self.repos):
+                for kind in list(self.repos[key]):
+                    if (key, kind) not in seen:
+                        del self.repos[key][kind]
+                        removed += 1
+                if not self.repos[key]:
+                    del self.repos[key]
+        return {"scanned": len(pending), "unchanged": unchanged, "removed": removed}
+
+    @staticmethod
+    def _run(pending: List[tuple], jobs: int = None) -> Iterator[Tuple[str, str, dict]]:
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1 or len(pending) < 8:
+            yield from map(_scan, pending)
+            return
+        size = max(1, min(32, len(pending) // (jobs * 4)))
+        chunks = [pending[start:start + size] for start in range(0, len(pending), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for results in pool.map(_scan_chunk, chunks):
+                yield from results
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"version": INDEX_VERSION, "repos": self.repos}, sort_keys=True,
+                             ensure_ascii=False, separators=(",", ":"))
+        try:
+            mode = self.path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".github-index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def merged(self, key: str) -> dict:
+        """One view of a repository: API fields, with the clone's languages and README when present"""
+        sources = self.repos[key]
+        entry = dict(sources.get("api", {}))
+        for field, value in sources.get("clone", {}).items():
+            if value and (field in ("languages", "summary", "path") or not entry.get(field)):
+                entry[field] = value
+        entry["key"] = key
+        return entry
+
+    def entries(self) -> List[dict]:
+        return [self.merged(key) for key in sorted(self.repos)]
+
+    def rank(self, skills: Iterable[str] = (), now: float = None) -> List[Ranked]:
+        """Every repository scored for featuring, best first"""
+        now = time.time() if now is None else now
+        wanted = {skill.lower() for skill in skills}
+        ranked = [Ranked(entry["key"], *_score(entry, wanted, now)) for entry in self.entries()]
+        return sorted(ranked, key=lambda item: (-item.score, item.key))
+
+    def projects(self, featured: int = 6, limit: int = None, skills: Iterable[str] = (),
+                 include_forks: bool = True, now: float = None) -> List[dict]:
+        """data_emitter-style project dicts, best first, with the top picks marked featured"""
+        ranked = [item for item in self.rank(skills, now)
+                  if include_forks or not self.merged(item.key).get("fork")]
+        ranked = ranked[:limit] if limit else ranked
+        chosen = select_featured(ranked, featured)
+        projects = []
+        for item in ranked:
+            projects.append(to_project(self.merged(item.key), item.category, item.key in chosen))
+        return projects
+
+
+# -- ranking ----------------------------------------------------------------
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9+#.]+(?:-[a-z0-9]+)*", (text or "").lower())
+
+
+def categorize(entry: dict) -> str:
+    """Project category from topics, name, description and language mix"""
+    scores = dict.fromkeys(CATEGORY_KEYWORDS, 0.0)
+    topics = [topic.lower() for topic in entry.get("topics", [])]
+    name_words = _words(entry.get("name", "").replace("_", "-")) + _words(entry.get("name", "").replace("-", " "))
+    text_words = _words(entry.get("description")) + _words(entry.get("summary"))
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        scores[category] += 2 * sum(topic in keywords for topic in topics)
+        scores[category] += 1.5 * sum(word in keywords for word in set(name_words))
+        scores[category] += 0.5 * sum(word in keywords for word in set(text_words))
+    languages = entry.get("languages", {})
+    total = sum(languages.values()) or 1
+    for language, size in languages.items():
+        category = LANGUAGE_CATEGORIES.get(language)
+        if category is not None:
+            scores[category] += 2 * size / total
+    best = max(scores, key=lambda category: (scores[category], category == "ai"))
+    return best if scores[best] > 0 else "other"
+
+
+def _days_since(stamp: Optional[str], now: float) -> Optional[float]:
+    if not stamp:
+        return None
+    try:
+        moment = datetime.strptime(stamp[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return max(0.0, (now - moment.timestamp()) / 86400)
+
+
+def _score(entry: dict, skills: set, now: float) -> Tuple[float, str, Dict[str, float]]:
+    days = _days_since(entry.get("pushed_at"), now)
+    size = sum(entry.get("languages", {}).values())
+    terms = {language.lower() for language in entry.get("languages", {})}
+    terms.update(topic.lower().replace("-", " ") for topic in entry.get("topics", []))
+    parts = {
+        "recency": 0.5 ** (days / RECENCY_HALF_LIFE_DAYS) if days is not None else 0.0,
+        "popularity": min(1.0, math.log1p(entry.get("stars", 0) + 0.5 * entry.get("forks", 0))
+                          / math.log1p(POPULARITY_SCALE)),
+        "substance": min(1.0, math.log1p(size) / math.log1p(SUBSTANCE_SCALE)),
+        "docs": (0.5 if entry.get("summary") else 0.0) + (0.3 if entry.get("description") else 0.0)
+        + (0.2 if entry.get("topics") else 0.0),
+        "relevance": min(1.0, len(terms & skills) / min(len(terms), 5)) if terms and skills else 0.0,
+    }
+    score = sum(WEIGHTS[name] * value for name, value in parts.items())
+    if entry.get("homepage"):
+        score += 0.05
+    if entry.get("fork"):
+        score *= FORK_FACTOR
+    if entry.get("archived"):
+        score *= ARCHIVED_FACTOR
+    return round(score, 4), categorize(entry), {name: round(value, 3) for name, value in parts.items()}
+
+
+def select_featured(ranked: List[Ranked], count: int, per_category: int = PER_CATEGORY) -> set:
+    """Top `count` keys with at most per_category from one category, topped up by score if short"""
+    chosen, per = [], {}
+    for item in ranked:
+        if len(chosen) == count:
+            break
+        if per.get(item.category, 0) < per_category:
+            chosen.append(item.key)
+            per[item.category] = per.get(item.category, 0) + 1
+    for item in ranked:
+        if len(chosen) >= count:
+            break
+        if item.key not in chosen:
+            chosen.append(item.key)
+    return set(chosen)
+
+
+# -- projects.ts ------------------------------------------------------------
+
+def display_title(name: str) -> str:
+    """"windows11-fresh-install-toolkit" -> "Windows11 Fresh Install Toolkit\""""
+    words = [word for word in re.split(r"[-_\s]+", name) if word]
+    return " ".join(word.upper() if word.lower() in ACRONYMS
+                    else word if any(char.isupper() for char in word) else word.capitalize()
+                    for word in words)
+
+
+def display_topic(topic: str) -> str:
+    return " ".join(word.upper() if word in ACRONYMS else word.capitalize() for word in topic.split("-"))
+
+
+def to_project(entry: dict, category: str, featured: bool) -> dict:
+    """Project dict matching the Project interface in src/types/index.ts"""
+    languages = entry.get("languages", {})
+    total = sum(languages.values()) or 1
+    technologies = [language for language, size in sorted(languages.items(), key=lambda item: -item[1])
+                    if size / total >= 0.05][:3]
+    for topic in entry.get("topics", []):
+        label = display_topic(topic)
+        if len(technologies) >= 5:
+            break
+        if label.lower() not in {tech.lower() for tech in technologies}:
+            technologies.append(label)
+    description = entry.get("description") or entry.get("summary") or display_title(entry["name"])
+    project = {
+        "id": re.sub(r"[^a-z0-9]+", "-", entry["name"].lower()).strip("-"),
+        "title": display_title(entry["name"]),
+        "description": description,
+        "technologies": technologies,
+        "githubUrl": entry.get("url") or "",
+        "featured": featured,
+        "category": category,
+    }
+    if entry.get("summary") and entry["summary"] != description:
+        project["longDescription"] = entry["summary"]
+    if entry.get("homepage"):
+        project["liveUrl"] = entry["homepage"]
+    return project
+
+
+# -- CLI --------------------------------------------------------------------
+
+def _resume_skills(path: Optional[str]) -> List[str]:
+    if not path:
+        return []
+    from resume_ingest import collect_fields, iter_fields
+
+    return collect_fields(iter_fields(path))["skills"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Index GitHub project metadata from clones and JSON dumps")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX), help="Index file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    scan = commands.add_parser("scan", help="Update the index from cloned repos and API dumps")
+    scan.add_argument("roots", nargs="*", help="Directories holding cloned repositories")
+    scan.add_argument("--dump", action="append", default=[],
+                      help="API JSON/JSONL dump or API mirror directory (repeatable)")
+    scan.add_argument("--depth", type=int, default=2, help="Directory levels searched for clones")
+    scan.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    scan.add_argument("--prune", action="store_true", help="Drop entries no longer present in the sources")
+
+    for name, help_text in (("rank", "Score repositories for featuring"),
+                            ("projects", "Emit data_emitter-style projects, best first")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--resume", default=None, help="Boost repos matching this resume's skills")
+        command.add_argument("--featured", type=int, default=6, help="Projects marked featured")
+        command.add_argument("--limit", type=int, default=None, help="Keep only the top N")
+        command.add_argument("--no-forks", action="store_true", help="Leave forks out")
+        command.add_argument("--json", action="store_true", help="Print JSON")
+    projects = commands.choices["projects"]
+    projects.add_argument("--output", default=None, help="Write {\"projects\": [...]} here")
+    projects.add_argument("--emit", action="store_true", help="Rewrite projects.ts via data_emitter")
+    projects.add_argument("--data-dir", default=None, help="Data module directory for --emit (default: src/data)")
+    args = parser.parse_args(argv)
+
+    try:
+        index = ProjectIndex(args.index)
+        if args.command == "scan":
+            started = time.perf_counter()
+            stats = index.update(find_clones(args.roots, args.depth), args.dump, args.jobs, args.prune)
+            index.save()
+            print(f"{stats['scanned']} scanned, {stats['unchanged']} unchanged, {stats['removed']} removed "
+                  f"({len(index.repos)} repos) in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+            return 0
+
+        skills = _resume_skills(args.resume)
+        if args.command == "rank":
+            ranked = [item for item in index.rank(skills)
+                      if not (args.no_forks and index.merged(item.key).get("fork"))]
+            ranked = ranked[:args.limit] if args.limit else ranked
+            chosen = select_featured(ranked, args.featured)
+            if args.json:
+                print(json.dumps([dict(item._asdict(), featured=item.key in chosen) for item in ranked], indent=2))
+                return 0
+            for item in ranked:
+                marker = "*" if item.key in chosen else " "
+                print(f"{marker} {item.score:.3f}  {item.category:<13} {item.key}")
+            return 0
+
+        result = index.projects(args.featured, args.limit, skills, include_forks=not args.no_forks)
+        if args.emit:
+            from data_emitter import DEFAULT_DATA_DIR, EmitError, emit_data_modules
+
+            try:
+                report = emit_data_modules({"projects": result}, args.data_dir or DEFAULT_DATA_DIR)
+            except EmitError as exc:
+                print(f"error: {exc}", file=sys.stderr)
+                return 1
+            print(f"projects.ts {report['projects.ts']}", file=sys.stderr)
+        if args.output:
+            Path(args.output).write_text(json.dumps({"projects": result}, indent=2, ensure_ascii=False) + "\n",
+                                         encoding="utf-8")
+        elif not args.emit or args.json:
+            print(json.dumps({"projects": result}, indent=2, ensure_ascii=False))
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,595 @@
+"""
+LLM Execution Layer
+===================
+
+Sends the generated prompt (SYSTEM_PROMPT + resume + relevant PRD sections +
+initial task.md) to a Messages-style LLM endpoint and streams the generated
+plan back, so callers no longer need their own serial client.
+
+Everything is asyncio and standard library:
+
+- HTTPPool: keep-alive HTTP/1.1 connections per endpoint (TLS for https)
+- LLMExecutor: bounded concurrency, retries with exponential backoff and jitter
+  (connection errors, 429/5xx, overloaded stream errors before the first token),
+  server-sent-event streaming to an on_token callback
+- LLMResult: text plus time-to-first-token and total latency per request
+
+Offline testing against the bundled mock server:
+    python tools/mock_llm_server.py --port 8765 --latency 0.2 &
+    python tools/llm_executor.py resume.txt --base-url http://127.0.0.1:8765
+
+Usage:
+    python tools/llm_executor.py resume.txt                         # stream one plan to stdout
+    python tools/llm_executor.py resumes/*.txt --concurrency 8 --output plans.jsonl
+
+Set ANTHROPIC_API_KEY (and optionally LLM_BASE_URL / LLM_MODEL) for a real endpoint.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+from urllib.parse import urlsplit
+
+from instrumentation import count, observe, span
+
+DEFAULT_BASE_URL = os.environ.get("LLM_BASE_URL", "https://api.anthropic.com")
+DEFAULT_MODEL = os.environ.get("LLM_MODEL", "claude-sonnet-4-20250514")
+API_VERSION = "2023-06-01"
+MESSAGES_PATH = "/v1/messages"
+
+RETRY_STATUSES = frozenset((408, 409, 429, 500, 502, 503, 504, 529))
+RETRY_STREAM_ERRORS = frozenset(("overloaded_error", "api_error", "rate_limit_error"))
+
+
+class LLMError(RuntimeError):
+    """Failed request; retryable errors may be attempted again"""
+
+    def __init__(self, message: str, status: int = None, retryable: bool = False,
+                 retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class LLMRequest(NamedTuple):
+    """One generation request; system/user are plain text or lists of content blocks"""
+    key: str
+    system: Union[str, List[dict]]
+    user: Union[str, List[dict]]
+    max_tokens: int = 8192
+    accounting: Optional[dict] = None   # prompt_assembler token accounting, if assembled
+
+
+class LLMResult(NamedTuple):
+    """Outcome of one request; error is None on success"""
+    key: str
+    text: str
+    error: Optional[str]
+    status: Optional[int]
+    attempts: int
+    ttft_ms: Optional[float]
+    total_ms: float
+    usage: Dict[str, int]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def build_request(key: str, resume_content: str, result: dict, max_tokens: int = 8192,
+                  assembler=None) -> LLMRequest:
+    """
+    Turn a generate_portfolio_with_tasks() result into a request
+
+    The prompt is laid out by prompt_assembler so the static prefix can be served
+    from the provider's prompt cache; pass one PromptAssembler for a whole batch
+    to get expected cache hits in the accounting.
+    """
+    from prompt_assembler import PromptAssembler
+
+    if assembler is None:
+        assembler = PromptAssembler(result.get("implementation_plan"))
+    prompt = assembler.assemble(resume_content, result)
+    return LLMRequest(key, prompt.system_blocks(), prompt.user_content(), max_tokens, prompt.accounting())
+
+
+# -- HTTP -------------------------------------------------------------------
+
+class _Connection:
+    __slots__ = ("reader", "writer", "reused")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    @property
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+class HTTPResponse:
+    """Status and headers of a response whose body is read incrementally"""
+
+    def __init__(self, pool: "HTTPPool", conn: _Connection, status: int, headers: Dict[str, str]):
+        self._pool = pool
+        self._conn = conn
+        self._complete = False
+        self.status = status
+        self.headers = headers
+
+    async def iter_body(self):
+        """Yield body bytes as they arrive (chunked, Content-Length or read-to-close)"""
+        reader = self._conn.reader
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                data = await reader.readexactly(size)
+                await reader.readexactly(2)
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining:
+                data = await reader.read(min(remaining, 1 << 16))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                yield data
+        else:
+            self.headers["connection"] = "close"
+            while True:
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                yield data
+        self._complete = True
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_body()])
+
+    def release(self):
+        """Return the connection to the pool (or drop it if the body was not fully read)"""
+        if self._conn is None:
+            return
+        keep = self._complete and self.headers.get("connection", "").lower() != "close"
+        self._pool._release(self._conn, keep)
+        self._conn = None
+
+
+class HTTPPool:
+    """
+    Keep-alive HTTP/1.1 connections to a single origin
+
+    At most max_connections requests are in flight; idle connections are reused
+    most-recently-used first so cold ones can time out on the server side.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 8, connect_timeout: float = 10.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme in {base_url!r}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self._host_header = parts.netloc
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self._connect_timeout = connect_timeout
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: deque = deque()
+        self.connections_opened = 0
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl), self._connect_timeout)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> HTTPResponse:
+        """Send a request and return once the status line and headers are in"""
+        await self._slots.acquire()
+        try:
+            while True:
+                conn = None
+                while self._idle:
+                    candidate = self._idle.pop()
+                    if candidate.usable:
+                        conn = candidate
+                        break
+                    candidate.close()
+                if conn is None:
+                    conn = await self._connect()
+                try:
+                    return await self._exchange(conn, method, path, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn.close()
+                    if not conn.reused:
+                        raise
+                    # The server closed an idle keep-alive connection; retry on a fresh one
+                except BaseException:
+                    conn.close()
+                    raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _exchange(self, conn: _Connection, method: str, path: str,
+                        headers: Dict[str, str], body: bytes) -> HTTPResponse:
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self._host_header}",
+                 f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await conn.writer.drain()
+
+        head = await conn.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+        return HTTPResponse(self, conn, status, response_headers)
+
+    def _release(self, conn: _Connection, keep: bool):
+        if keep and conn.usable:
+            conn.reused = True
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def close(self):
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class SSEParser:
+    """Incremental server-sent-events parser: feed bytes, get (event, data) pairs"""
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[tuple]:
+        buffer = (self._buffer + data).replace(b"\r\n", b"\n")
+        events = []
+        while True:
+            end = buffer.find(b"\n\n")
+            if end < 0:
+                break
+            block, buffer = buffer[:end], buffer[end + 2:]
+            event, data_lines = "message", []
+            for line in block.decode("utf-8").split("\n"):
+                if not line or line.startswith(":"):
+                    continue
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data_lines.append(value)
+            if data_lines:
+                events.append((event, "\n".join(data_lines)))
+        self._buffer = buffer
+        return events
+
+
+# -- executor ---------------------------------------------------------------
+
+def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _error_message(payload: bytes) -> str:
+    try:
+        error = json.loads(payload)["error"]
+        return f"{error.get('type')}: {error.get('message')}"
+    except (ValueError, KeyError, TypeError):
+        return payload[:200].decode("utf-8", "replace")
+
+
+class LLMExecutor:
+    """
+    Concurrent streaming client for a Messages-style endpoint
+
+    Usage:
+        async with LLMExecutor(base_url="http://127.0.0.1:8765", concurrency=4) as llm:
+            result = await llm.run(request, on_token=lambda text: print(text, end=""))
+            async for result in llm.run_many(requests):
+                ...
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, api_key: str = None, model: str = DEFAULT_MODEL,
+                 concurrency: int = 8, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 20.0, timeout: float = 300.0):
+        self.model = model
+        self.api_key = api_key if api_key is not None else os.environ.get("ANTHROPIC_API_KEY")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.pool = HTTPPool(base_url, max_connections=concurrency)
+        self._limit = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.pool.close()
+
+    def _delay(self, attempt: int, retry_after: float = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Full jitter keeps a burst of failed requests from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    async def run(self, request: LLMRequest, on_token: Callable[[str], None] = None) -> LLMResult:
+        """
+        Execute one request, streaming text deltas to on_token as they arrive
+
+        Retries only happen before the first token has been delivered, so the
+        caller never sees duplicated output.
+        """
+        async with self._limit:
+            with span("llm.request") as timing:
+                started = time.perf_counter()
+                pieces: List[str] = []
+                first_token = None
+
+                def emit(text: str):
+                    nonlocal first_token
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    pieces.append(text)
+                    if on_token is not None:
+                        on_token(text)
+
+                attempts = 0
+                while True:
+                    attempts += 1
+                    error = None
+                    try:
+                        usage = await asyncio.wait_for(self._attempt(request, emit), self.timeout)
+                    except LLMError as exc:
+                        error = exc
+                    except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+                        error = LLMError(f"{type(exc).__name__}: {exc}", retryable=True)
+                    except asyncio.TimeoutError:
+                        error = LLMError(f"timed out after {self.timeout}s", retryable=True)
+                    ttft = None if first_token is None else _ms(started, first_token)
+                    if error is None:
+                        timing.set(status=200)
+                        return _recorded(LLMResult(request.key, "".join(pieces), None, 200, attempts,
+                                                   ttft, _ms(started), usage))
+                    if not error.retryable or pieces or attempts > self.max_retries:
+                        timing.set(status=error.status)
+                        return _recorded(LLMResult(request.key, "".join(pieces), str(error), error.status,
+                                                   attempts, ttft, _ms(started), {}))
+                    await asyncio.sleep(self._delay(attempts, error.retry_after))
+
+    async def _attempt(self, request: LLMRequest, emit: Callable[[str], None]) -> Dict[str, int]:
+        body = json.dumps({
+            "model": self.model,
+            "max_tokens": request.max_tokens,
+            "system": request.system,
+            "messages": [{"role": "user", "content": request.user}],
+            "stream": True,
+        }).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "anthropic-version": API_VERSION,
+        }
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+
+        response = await self.pool.request("POST", MESSAGES_PATH, headers, body)
+        try:
+            if response.status != 200:
+                raise LLMError(f"HTTP {response.status}: {_error_message(await response.read())}",
+                               status=response.status, retryable=response.status in RETRY_STATUSES,
+                               retry_after=_retry_after(response.headers))
+            parser = SSEParser()
+            usage: Dict[str, int] = {}
+            finished = False
+            async for chunk in response.iter_body():
+                for event, data in parser.feed(chunk):
+                    if event == "content_block_delta":
+                        delta = json.loads(data).get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            emit(delta["text"])
+                    elif event == "message_start":
+                        usage.update(json.loads(data).get("message", {}).get("usage", {}))
+                    elif event == "message_delta":
+                        usage.update(json.loads(data).get("usage", {}))
+                    elif event == "message_stop":
+                        finished = True
+                    elif event == "error":
+                        error = json.loads(data).get("error", {})
+                        raise LLMError(f"{error.get('type')}: {error.get('message')}",
+                                       retryable=error.get("type") in RETRY_STREAM_ERRORS)
+            if not finished:
+                raise LLMError("stream ended before message_stop", retryable=True)
+            return usage
+        finally:
+            response.release()
+
+    async def run_many(self, requests: Iterable[LLMRequest],
+                       on_token: Callable[[str, str], None] = None):
+        """
+        Execute requests concurrently, yielding LLMResults as they complete
+
+        on_token(key, text) receives streamed deltas for every request. At most
+        2 x concurrency requests are materialized at a time, so long input
+        iterators are consumed lazily.
+        """
+        requests = iter(requests)
+        pending = set()
+
+        def submit() -> bool:
+            request = next(requests, None)
+            if request is None:
+                return False
+            callback = None
+            if on_token is not None:
+                callback = lambda text, key=request.key: on_token(key, text)  # noqa: E731
+            pending.add(asyncio.ensure_future(self.run(request, callback)))
+            return True
+
+        while len(pending) < self.concurrency * 2 and submit():
+            pass
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            while len(pending) < self.concurrency * 2 and submit():
+                pass
+
+
+def _ms(started: float, until: float = None) -> float:
+    end = time.perf_counter() if until is None else until
+    return round((end - started) * 1000, 2)
+
+
+def _recorded(result: LLMResult) -> LLMResult:
+    """Feed one finished request into the pipeline metrics"""
+    if result.ttft_ms is not None:
+        observe("llm_ttft_seconds", result.ttft_ms / 1000)
+    if result.attempts > 1:
+        count("llm_retries", result.attempts - 1)
+    if result.error is not None:
+        count("llm_errors", status=result.status)
+    for kind in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+        if result.usage.get(kind):
+            count("llm_tokens", result.usage[kind], kind=kind)
+    return result
+
+
+def execute(requests: Iterable[LLMRequest], **options) -> List[LLMResult]:
+    """Blocking helper: run requests and return results in input order"""
+    requests = list(requests)
+    order = {request.key: index for index, request in enumerate(requests)}
+
+    async def _main():
+        async with LLMExecutor(**options) as llm:
+            return [result async for result in llm.run_many(requests)]
+
+    return sorted(asyncio.run(_main()), key=lambda result: order[result.key])
+
+
+def latency_summary(results: List[LLMResult]) -> dict:
+    ttfts = sorted(r.ttft_ms for r in results if r.ttft_ms is not None)
+    totals = sorted(r.total_ms for r in results)
+    cache_read = sum(r.usage.get("cache_read_input_tokens", 0) for r in results)
+    prompt_tokens = cache_read + sum(r.usage.get("input_tokens", 0)
+                                     + r.usage.get("cache_creation_input_tokens", 0) for r in results)
+
+    def pct(values, fraction):
+        return values[min(len(values) - 1, int(fraction * len(values)))] if values else None
+
+    return {
+        "requests": len(results),
+        "failed": sum(1 for r in results if not r.ok),
+        "retries": sum(r.attempts - 1 for r in results),
+        "ttft_p50_ms": pct(ttfts, 0.5),
+        "ttft_p95_ms": pct(ttfts, 0.95),
+        "total_p50_ms": pct(totals, 0.5),
+        "total_p95_ms": pct(totals, 0.95),
+        "cache_read_ratio": round(cache_read / prompt_tokens, 4) if prompt_tokens else None,
+    }
+
+
+async def _run_cli(args) -> int:
+    from prompt_assembler import PromptAssembler
+    from resume_ingest import read_resume
+    from system_prompt import generate_portfolio_with_tasks
+
+    try:
+        prd = ""
+        if args.prd:
+            with open(args.prd, encoding="utf-8") as handle:
+                prd = handle.read()
+        resumes = [(path, read_resume(path)) for path in args.resumes]
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    assembler = PromptAssembler()
+    requests = []
+    for path, resume in resumes:
+        result = generate_portfolio_with_tasks(resume, prd, args.name)
+        requests.append(build_request(path, resume, result, args.max_tokens, assembler))
+    accounting = {request.key: request.accounting for request in requests}
+
+    stream = len(requests) == 1 and not args.output
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    results = []
+    try:
+        async with LLMExecutor(args.base_url, model=args.model, concurrency=args.concurrency,
+                               max_retries=args.retries, timeout=args.timeout) as llm:
+            on_token = (lambda key, text: (sys.stdout.write(text), sys.stdout.flush())) if stream else None
+            async for result in llm.run_many(requests, on_token):
+                results.append(result)
+                if stream:
+                    sys.stdout.write("\n")
+                else:
+                    output.write(json.dumps(result._asdict(), ensure_ascii=False) + "\n")
+                tokens = accounting[result.key]
+                print(f"{result.key}: ttft={result.ttft_ms}ms total={result.total_ms}ms "
+                      f"attempts={result.attempts} static={tokens['static_tokens']} "
+                      f"dynamic={tokens['dynamic_tokens']} "
+                      f"expected_cache_hit={tokens['expected_cache_hit_ratio']:.0%}"
+                      + (f" error={result.error}" if result.error else ""), file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(json.dumps(latency_summary(results)), file=sys.stderr)
+    print(json.dumps(assembler.cache_stats()), file=sys.stderr)
+    return 1 if any(not result.ok for result in results) else 0
+
+
+def main(argv=None) -> int:
+    from system_prompt import DEFAULT_PRD
+
+    parser = argparse.ArgumentParser(description="Send generated portfolio prompts to an LLM endpoint")
+    parser.add_argument("resumes", nargs="+", help="Resume files (PDF, text/markdown or JSON)")
+    parser.add_argument("--prd", default=DEFAULT_PRD, help="PRD markdown (default: %(default)s)")
+    parser.add_argument("--name", default=None, help="User name for the task file")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Endpoint (default: %(default)s)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per request before giving up")
+    parser.add_argument("--max-tokens", type=int, default=8192)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds per attempt")
+    parser.add_argument("--output", default=None, help="Write JSONL results here instead of streaming")
+    args = parser.parse_args(argv)
+    return asyncio.run(_run_cli(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Mock LLM Server
+===============
+
+Local stand-in for a streaming Messages-style endpoint so llm_executor.py can be
+exercised offline. Serves POST /v1/messages over keep-alive HTTP/1.1 and
+streams a canned response as server-sent events, word by word.
+
+Latency is configurable (delay before the first token and between tokens), and
+a fraction of requests can be answered with 529 overloaded errors to exercise
+the client's retry path. Prompt caching is emulated: prefixes ending at a
+cache_control block are remembered, and usage reports cache reads and writes.
+
+Usage:
+    python tools/mock_llm_server.py --port 8765 --latency 0.2 --token-delay 0.002
+    python tools/mock_llm_server.py --response-file plan.md --fail-rate 0.2
+
+In-process (tests, benchmarks):
+    async with MockLLMServer(latency=0.05) as server:
+        async with LLMExecutor(base_url=server.url) as llm:
+            ...
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+from typing import List
+
+from tokenizer import count_tokens
+
+DEFAULT_CHUNK_WORDS = 4
+
+
+def canned_response() -> str:
+    """A plausible model answer: short preamble plus the initial task.md"""
+    from task_model import default_plan, render_task_file
+
+    plan = default_plan("Portfolio Developer", "2025-08-28", "2025-09-04")
+    return ("# Implementation Plan\n\nThe plan below follows the PRD phases; "
+            "task.md tracks progress.\n\n" + render_task_file(plan))
+
+
+def split_tokens(text: str, words_per_token: int = DEFAULT_CHUNK_WORDS) -> List[str]:
+    words = re.findall(r"\S+\s*|\s+", text)
+    return ["".join(words[i:i + words_per_token]) for i in range(0, len(words), words_per_token)]
+
+
+def _blocks(content, role: str) -> list:
+    """(role, text, has cache_control) for a string or list of content blocks"""
+    if isinstance(content, str):
+        return [(role, content, False)]
+    return [(role, block.get("text", ""), "cache_control" in block) for block in content]
+
+
+def _sse(event: str, payload: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+
+
+def _chunk(data: bytes) -> bytes:
+    return b"%x\r\n%s\r\n" % (len(data), data)
+
+
+class MockLLMServer:
+    """
+    Asyncio HTTP server streaming a canned response
+
+    Args:
+        response: Text to stream (default: canned_response())
+        latency: Seconds before the first token
+        token_delay: Seconds between streamed chunks
+        fail_rate: Fraction of requests answered with HTTP 529
+        seed: Seed for the failure roll, for reproducible runs
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, response: str = None,
+                 latency: float = 0.0, token_delay: float = 0.0, fail_rate: float = 0.0,
+                 words_per_token: int = DEFAULT_CHUNK_WORDS, seed: int = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_rate = fail_rate
+        self.tokens = split_tokens(response if response is not None else canned_response(), words_per_token)
+        self.requests = 0
+        self.connections = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._prompt_cache = set()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "MockLLMServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await self._respond(writer, method, path, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes):
+        if method != "POST" or path.split("?")[0] != "/v1/messages":
+            return await self._send_json(writer, 404, {"type": "error", "error": {
+                "type": "not_found_error", "message": f"{method} {path} not found"}})
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return await self._send_json(writer, 400, {"type": "error", "error": {
+                "type": "invalid_request_error", "message": "body is not JSON"}})
+        if self.fail_rate and self._random.random() < self.fail_rate:
+            self.failures += 1
+            return await self._send_json(writer, 529, {"type": "error", "error": {
+                "type": "overloaded_error", "message": "Overloaded"}}, {"retry-after": "0"})
+
+        max_tokens = payload.get("max_tokens", len(self.tokens))
+        tokens = self.tokens[:max_tokens]
+        message = {"id": f"msg_mock_{self.requests}", "type": "message", "role": "assistant",
+                   "model": payload.get("model", "mock"), "content": [], "stop_reason": None,
+                   "usage": dict(self._prompt_usage(payload), output_tokens=0)}
+
+        if not payload.get("stream"):
+            await asyncio.sleep(self.latency + self.token_delay * len(tokens))
+            message["content"] = [{"type": "text", "text": "".join(tokens)}]
+            message["stop_reason"] = "end_turn"
+            message["usage"]["output_tokens"] = len(tokens)
+            return await self._send_json(writer, 200, message)
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n"
+                     b"Connection: keep-alive\r\n\r\n")
+        writer.write(_chunk(_sse("message_start", {"type": "message_start", "message": message})))
+        await writer.drain()
+        await asyncio.sleep(self.latency)
+        writer.write(_chunk(_sse("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})))
+        for token in tokens:
+            writer.write(_chunk(_sse("content_block_delta", {
+                "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": token}})))
+            await writer.drain()
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+        writer.write(_chunk(_sse("content_block_stop", {"type": "content_block_stop", "index": 0})))
+        writer.write(_chunk(_sse("message_delta", {
+            "type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(tokens)}})))
+        writer.write(_chunk(_sse("message_stop", {"type": "message_stop"})))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _prompt_usage(self, payload: dict) -> dict:
+        """Input token usage, emulating a prefix cache keyed on cache_control breakpoints"""
+        blocks = _blocks(payload.get("system", ""), "system")
+        for message in payload.get("messages", []):
+            blocks += _blocks(message.get("content", ""), message.get("role", "user"))
+        digest = hashlib.sha256()
+        total, cached, written = 0, 0, 0
+        for role, text, breakpoint in blocks:
+            digest.update(role.encode() + b"\0" + text.encode("utf-8") + b"\0")
+            total += count_tokens(text)
+            if breakpoint:
+                prefix = digest.hexdigest()
+                if prefix in self._prompt_cache:
+                    cached = total
+                else:
+                    self._prompt_cache.add(prefix)
+                    written = total
+        written = max(0, written - cached)
+        return {"input_tokens": total - cached - written, "cache_creation_input_tokens": written,
+                "cache_read_input_tokens": cached}
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: dict, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 529: "Overloaded"}.get(status, "Error")
+        lines = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json",
+                 f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve canned streaming LLM responses locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--response-file", type=argparse.FileType("r", encoding="utf-8"), default=None,
+                        help="Text to stream (default: a canned plan + task.md)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 529")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(args.host, args.port, args.response_file.read() if args.response_file else None,
+                           args.latency, args.token_delay, args.fail_rate, seed=args.seed)
+    print(f"mock LLM server on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Responsive Image Optimizer
+==========================
+
+Covers STEP 6 / STEP 16 of the system prompt (optimized photos, WebP support).
+Walks the image trees, deduplicates identical files by content hash, encodes
+resized WebP (and AVIF when the installed Pillow supports it) variants on a
+process pool, and writes a JSON manifest the React components can import.
+
+Runs are incremental: variants are named after the source hash, and a source is
+only re-encoded when its hash is new or one of its variant files is missing.
+The variants under public/images/optimized/ are build output and are not
+committed (see .gitignore): run this before `npm run build`.
+
+Requires Pillow (pip install Pillow).
+
+Usage:
+    python tools/optimize_images.py
+    python tools/optimize_images.py --widths 480 960 1600 --formats webp avif --workers 8
+
+Manifest shape (src/data/image-manifest.json):
+    {
+      "images":  {"/images/pic01-min.jpg": "<hash>", ...},
+      "sources": {"<hash>": {"width", "height", "bytes", "paths",
+                             "variants": {"webp": [{"src", "width", "height", "bytes"}]},
+                             "srcset": {"webp": "/images/optimized/<hash>-640.webp 640w, ..."}}}
+    }
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = (REPO_ROOT / "public" / "images", REPO_ROOT / "images")
+DEFAULT_OUTPUT = REPO_ROOT / "public" / "images" / "optimized"
+DEFAULT_MANIFEST = REPO_ROOT / "src" / "data" / "image-manifest.json"
+PUBLIC_DIR = REPO_ROOT / "public"
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+DEFAULT_WIDTHS = (320, 640, 960, 1280, 1920)
+QUALITY = {"webp": 80, "avif": 55}
+MANIFEST_VERSION = 1
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def web_path(path: Path) -> str:
+    """URL path for files under public/, repo-relative path otherwise"""
+    path = path.resolve()
+    try:
+        return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+    except ValueError:
+        try:
+            return path.relative_to(REPO_ROOT).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+
+def scan(roots, output_dir: Path) -> Dict[str, List[Path]]:
+    """Group image files under roots by content hash (skipping our own output)"""
+    output_dir = output_dir.resolve()
+    groups: Dict[str, List[Path]] = {}
+    for root in roots:
+        if not Path(root).is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            if Path(dirpath).resolve() == output_dir:
+                dirnames[:] = []
+                continue
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                if path.suffix.lower() in IMAGE_SUFFIXES:
+                    groups.setdefault(file_hash(path), []).append(path)
+    return groups
+
+
+def canonical(paths: List[Path]) -> Path:
+    """Prefer a copy that is actually served from public/, then the shortest path"""
+    return min(paths, key=lambda p: (not web_path(p).startswith("/"), len(str(p)), str(p)))
+
+
+def variant_name(digest: str, width: int, fmt: str) -> str:
+    return f"{digest[:16]}-{width}.{fmt}"
+
+
+def encode_source(job: tuple) -> dict:
+    """
+    Encode every variant of one source image (runs in a worker process)
+
+    Args:
+        job: (source path, hash, widths, formats, output dir)
+
+    Returns:
+        Source entry for the manifest, minus the path lists
+    """
+    from PIL import Image, ImageOps
+
+    source, digest, widths, formats, output_dir = job
+    output_dir = Path(output_dir)
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+    width, height = image.size
+
+    targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+    variants = {fmt: [] for fmt in formats}
+    for target in targets:
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS)
+        for fmt in formats:
+            out_path = output_dir / variant_name(digest, target, fmt)
+            tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+            options = {"quality": QUALITY[fmt]}
+            if fmt == "webp":
+                options["method"] = 4  # good size/speed trade-off; 6 is ~3x slower
+            resized.save(tmp_path, format=fmt.upper(), **options)
+            os.replace(tmp_path, out_path)
+            variants[fmt].append({
+                "width": resized.size[0],
+                "height": resized.size[1],
+                "bytes": out_path.stat().st_size,
+                "file": out_path.name,
+            })
+    return {"hash": digest, "width": width, "height": height,
+            "bytes": Path(source).stat().st_size, "variants": variants}
+
+
+def available_formats(requested) -> List[str]:
+    from PIL import features
+
+    formats = []
+    for fmt in requested:
+        if features.check(fmt):
+            formats.append(fmt)
+        else:
+            print(f"warning: installed Pillow cannot encode {fmt}, skipping", file=sys.stderr)
+    return formats
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "images": {}, "sources": {}}
+
+
+def is_current(entry: dict, formats, widths, output_dir: Path) -> bool:
+    """A previous encode can be reused if it covers the same settings and its files still exist"""
+    if entry.get("settings") != {"formats": list(formats), "widths": list(widths)}:
+        return False
+    return all((output_dir / variant["file"]).exists()
+               for fmt in formats for variant in entry.get("variants", {}).get(fmt, []))
+
+
+def optimize(roots=DEFAULT_ROOTS, output_dir: Path = DEFAULT_OUTPUT,
+             manifest_path: Path = DEFAULT_MANIFEST, widths=DEFAULT_WIDTHS,
+             formats=("webp", "avif"), workers: int = None) -> dict:
+    """
+    Run the incremental optimization pipeline
+
+    Returns:
+        Summary with counts of scanned files, unique sources, re-encoded sources,
+        duplicate bytes found, and elapsed time
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    formats = available_formats(formats)
+    widths = sorted(set(widths))
+    url_base = web_path(output_dir).rstrip("/")
+
+    groups = scan(roots, output_dir)
+    previous = load_manifest(Path(manifest_path))
+    sources, jobs = {}, []
+    for digest, paths in groups.items():
+        entry = previous["sources"].get(digest)
+        if entry is not None and is_current(entry, formats, widths, output_dir):
+            sources[digest] = entry
+        else:
+            jobs.append((str(canonical(paths)), digest, widths, formats, str(output_dir)))
+
+    failed = {}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(job, pool.submit(encode_source, job)) for job in jobs]
+            for job, future in futures:
+                try:
+                    entry = future.result()
+                except Exception as exc:  # unreadable/corrupt image: report, keep going
+                    failed[job[0]] = f"{type(exc).__name__}: {exc}"
+                    continue
+                entry["settings"] = {"formats": list(formats), "widths": list(widths)}
+                sources[entry["hash"]] = entry
+
+    manifest = {"version": MANIFEST_VERSION, "images": {}, "sources": {}}
+    duplicate_bytes = 0
+    for digest, paths in sorted(groups.items()):
+        entry = sources.get(digest)
+        if entry is None:
+            continue
+        entry["paths"] = sorted(web_path(p) for p in paths)
+        for fmt, variants in entry["variants"].items():
+            for variant in variants:
+                variant["src"] = f"{url_base}/{variant['file']}"
+        entry["srcset"] = {fmt: ", ".join(f"{v['src']} {v['width']}w" for v in variants)
+                           for fmt, variants in entry["variants"].items()}
+        manifest["sources"][digest] = entry
+        for path in entry["paths"]:
+            manifest["images"][path] = digest
+        duplicate_bytes += entry["bytes"] * (len(paths) - 1)
+
+    # Drop variants whose source no longer exists anywhere
+    live = {v["file"] for e in manifest["sources"].values() for vs in e["variants"].values() for v in vs}
+    for stale in output_dir.iterdir():
+        if stale.is_file() and stale.suffix in (".webp", ".avif") and stale.name not in live:
+            stale.unlink()
+
+    serialized = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != serialized:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(serialized, encoding="utf-8")
+
+    return {
+        "files": sum(len(paths) for paths in groups.values()),
+        "unique_sources": len(groups),
+        "encoded": len(jobs) - len(failed),
+        "reused": len(groups) - len(jobs),
+        "failed": failed,
+        "duplicate_bytes": duplicate_bytes,
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate responsive WebP/AVIF variants and a manifest")
+    parser.add_argument("roots", nargs="*", type=Path, default=list(DEFAULT_ROOTS),
+                        help="Image directories to scan (default: public/images and images)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Variant output directory")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST, help="Manifest JSON path")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--formats", nargs="+", default=["webp", "avif"], choices=("webp", "avif"))
+    parser.add_argument("--workers", type=int, default=None, help="Encoder processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("error: Pillow is required (pip install Pillow)", file=sys.stderr)
+        return 2
+
+    summary = optimize(args.roots, args.output, args.manifest, args.widths, args.formats, args.workers)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
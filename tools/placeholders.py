@@ -0,0 +1,454 @@
+"""
+Placeholder Substitution
+========================
+
+Fills the personalization placeholders used across the PRD, the prompt and
+task files ([Website Owner], [Company], [Your Skills], [User Name],
+[Current Date], [Estimated Date], ...) in a single pass.
+
+All placeholder literals are compiled once into a trie. The scanner jumps
+between possible first characters with a C-level regex search and walks the
+trie only there, taking the longest placeholder that matches, so the cost is
+one pass over the text regardless of how many placeholders are defined.
+Compiled matchers are cached per placeholder set, so a batch of users with
+the same keys shares one.
+
+Input can arrive in chunks: Substituter holds back only the tail that could
+still be the start of a placeholder, so arbitrarily large documents stream
+through in bounded memory. Each run reports placeholders that had no value
+(unresolved) and bracketed Title Case tokens that look like placeholders but
+are not defined (unknown). Markdown links ([Section](#anchor)) and
+placeholders quoted in code spans (`[User Name]`) are left alone.
+
+Usage:
+    text, report = substitute(prd_text, personal_values("Jane Doe", resume_text))
+    report.unresolved    # {"[Estimated Date]": 1}
+
+    substituter = Substituter(values)
+    for chunk in substituter.stream(chunks):
+        out.write(chunk)
+
+    template = Template(prd_text)              # scan once, render per user
+    text, report = template.render(values)
+
+    python tools/placeholders.py tools/PRODUCT_REQUIREMENTS_DOCUMENT.md --resume resume.pdf -o prd.md
+    python tools/placeholders.py task.md --set "Current Date=2025-08-28" --strict
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+DEFAULT_PLACEHOLDERS = ("Website Owner", "Your Name", "User Name", "Company", "Current Company",
+                        "Your Skills", "Current Date", "Estimated Date")
+MAX_SKILLS = 8
+CHUNK_SIZE = 1 << 16
+
+# Looks like a placeholder: [Title Case Words] not followed by a link target
+_UNKNOWN_RE = re.compile(r"\[([A-Z][\w&/.'-]*(?: [\w&/.'-]+){0,5})\](?!\()")
+_UNKNOWN_MAX = 64
+_TERMINAL = ""  # trie key for "a placeholder ends here"; never a character
+
+
+def placeholder(name: str) -> str:
+    """"User Name" -> "[User Name]"; bracketed names pass through"""
+    return name if name.startswith("[") else f"[{name}]"
+
+
+class PlaceholderMatcher:
+    """
+    Trie over placeholder literals with a first-character skip search
+
+    Args:
+        patterns: Placeholder literals, e.g. "[User Name]"
+    """
+
+    __slots__ = ("patterns", "index", "root", "max_length", "_starts")
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self.index = {pattern: number for number, pattern in enumerate(self.patterns)}
+        self.root: dict = {}
+        for number, pattern in enumerate(self.patterns):
+            node = self.root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[_TERMINAL] = number
+        self.max_length = max(map(len, self.patterns), default=0)
+        self._starts = self._start_search(self.root.keys())
+
+    @staticmethod
+    def _start_search(chars):
+        chars = sorted(chars)
+        if not chars:
+            return None
+        return re.compile("[" + "".join(re.escape(char) for char in chars) + "]").search
+
+    def match_at(self, text: str, start: int) -> Tuple[Optional[int], int, bool]:
+        """
+        Longest placeholder starting at text[start]
+
+        Returns:
+            (pattern index or None, end offset, truncated); truncated means the
+            text ended while a longer placeholder was still possible
+        """
+        node = self.root
+        found, end = None, start
+        position, length = start, len(text)
+        while position < length:
+            node = node.get(text[position])
+            if node is None:
+                return found, end, False
+            position += 1
+            number = node.get(_TERMINAL)
+            if number is not None:
+                found, end = number, position
+        return found, end, len(node) > (_TERMINAL in node)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, pattern index) for each non-overlapping placeholder, left to right"""
+        search = self._starts
+        if search is None:
+            return
+        position = 0
+        while True:
+            hit = search(text, position)
+            if hit is None:
+                return
+            start = hit.start()
+            number, end, _ = self.match_at(text, start)
+            if number is None:
+                position = start + 1
+                continue
+            yield start, end, number
+            position = end
+
+
+@lru_cache(maxsize=32)
+def _compiled(patterns: Tuple[str, ...]) -> PlaceholderMatcher:
+    return PlaceholderMatcher(patterns)
+
+
+def compile_placeholders(names: Iterable[str] = DEFAULT_PLACEHOLDERS) -> PlaceholderMatcher:
+    """Matcher for a set of placeholder names, shared by every caller with the same set"""
+    return _compiled(tuple(sorted({placeholder(name) for name in names})))
+
+
+class SubstitutionReport:
+    """Per-placeholder counts: replaced, unresolved (no value) and unknown (not defined)"""
+
+    __slots__ = ("replaced", "unresolved", "unknown")
+
+    def __init__(self):
+        self.replaced: Dict[str, int] = {}
+        self.unresolved: Dict[str, int] = {}
+        self.unknown: Dict[str, int] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.unresolved
+
+    def as_dict(self) -> dict:
+        return {"replaced": dict(self.replaced), "unresolved": dict(self.unresolved),
+                "unknown": dict(self.unknown)}
+
+
+def _bump(counts: Dict[str, int], key: str):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _resolve(values: Mapping[str, Optional[str]], names: Iterable[str]):
+    """Matcher plus a value list aligned with its patterns (None: unresolved)"""
+    by_placeholder = {placeholder(key): value for key, value in (values or {}).items()}
+    matcher = compile_placeholders([*names, *by_placeholder])
+    return matcher, [by_placeholder.get(pattern) for pattern in matcher.patterns]
+
+
+class Substituter:
+    """
+    Streaming substitution of one set of values
+
+    Args:
+        values: Placeholder name ("User Name" or "[User Name]") -> text; None
+            marks a known placeholder without a value
+        names: Placeholders to recognize even without a value
+        detect_unknown: Also report undefined [Title Case] tokens
+
+    feed() returns the text that is final so far; close() returns the rest.
+    """
+
+    def __init__(self, values: Mapping[str, Optional[str]] = None,
+                 names: Iterable[str] = DEFAULT_PLACEHOLDERS, detect_unknown: bool = True):
+        self.matcher, self.values = _resolve(values, names)
+        self.detect_unknown = detect_unknown
+        self.report = SubstitutionReport()
+        starts = set(self.matcher.root)
+        if detect_unknown:
+            starts.add("[")
+        self._search = PlaceholderMatcher._start_search(starts)
+        self._pending = ""
+        self._before = ""  # last character already emitted, for the code span check
+
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk if self._pending else chunk
+        return self._scan(text, final=False)
+
+    def close(self) -> str:
+        text, self._pending = self._pending, ""
+        return self._scan(text, final=True) if text else ""
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            out = self.feed(chunk)
+            if out:
+                yield out
+        tail = self.close()
+        if tail:
+            yield tail
+
+    def _scan(self, text: str, final: bool) -> str:
+        search = self._search
+        match_at = self.matcher.match_at
+        patterns, values, report = self.matcher.patterns, self.values, self.report
+        parts: List[str] = []
+        emitted = cursor = 0
+        length = len(text)
+        self._pending = ""
+        while search is not None:
+            hit = search(text, cursor)
+            if hit is None:
+                break
+            start = hit.start()
+            number, end, truncated = match_at(text, start)
+            if truncated and not final:
+                self._pending = text[start:]
+                length = start
+                break
+            quoted = (text[start - 1] if start else self._before) == "`"
+            if number is not None:
+                pattern = patterns[number]
+                value = values[number]
+                if quoted:
+                    pass
+                elif value is None:
+                    _bump(report.unresolved, pattern)
+                else:
+                    _bump(report.replaced, pattern)
+                    parts.append(text[emitted:start])
+                    parts.append(value)
+                    emitted = end
+                cursor = end
+                continue
+            if self.detect_unknown and text[start] == "[":
+                unknown = _UNKNOWN_RE.match(text, start)
+                if not final and ((unknown is None and length - start < _UNKNOWN_MAX)
+                                  or (unknown is not None and unknown.end() == length)):
+                    self._pending = text[start:]  # may complete in the next chunk
+                    length = start
+                    break
+                if unknown is not None:
+                    if not quoted:
+                        _bump(report.unknown, unknown.group(0))
+                    cursor = unknown.end()
+                    continue
+            cursor = start + 1
+        parts.append(text[emitted:length])
+        out = "".join(parts)
+        if out:
+            self._before = out[-1]
+        return out
+
+
+def substitute(text: str, values: Mapping[str, Optional[str]] = None,
+               names: Iterable[str] = DEFAULT_PLACEHOLDERS,
+               detect_unknown: bool = True) -> Tuple[str, SubstitutionReport]:
+    """Fill placeholders in one string"""
+    substituter = Substituter(values, names, detect_unknown)
+    out = substituter.feed(text) + substituter.close()
+    return out, substituter.report
+
+
+def iter_file_chunks(path, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    with open(path, encoding="utf-8", newline="") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), ""):
+            yield chunk
+
+
+def substitute_file(source, destination, values: Mapping[str, Optional[str]] = None,
+                    names: Iterable[str] = DEFAULT_PLACEHOLDERS,
+                    chunk_size: int = CHUNK_SIZE) -> SubstitutionReport:
+    """Stream source into destination (written atomically) with placeholders filled"""
+    substituter = Substituter(values, names)
+    directory = os.path.dirname(os.path.abspath(destination))
+    # The filled-in document keeps the destination's mode, or the source's if it is new
+    mode = os.stat(destination if os.path.exists(destination) else source).st_mode & 0o777
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".placeholders.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            for out in substituter.stream(iter_file_chunks(source, chunk_size)):
+                handle.write(out)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, destination)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return substituter.report
+
+
+class Template:
+    """
+    A document scanned once into literal text and placeholder slots
+
+    Rendering for another set of values is a join over the slots, which is
+    what a batch of users wants for the shared PRD or prompt text.
+    """
+
+    __slots__ = ("literals", "slots", "patterns", "unknown")
+
+    def __init__(self, text: str, names: Iterable[str] = DEFAULT_PLACEHOLDERS):
+        scan = Substituter({name: None for name in names}, names)
+        scan.feed(text)
+        scan.close()
+        self.unknown = dict(scan.report.unknown)
+        self.patterns = scan.matcher.patterns
+        self.literals: List[str] = []
+        self.slots: List[int] = []
+        emitted = 0
+        for start, end, number in scan.matcher.finditer(text):
+            if start and text[start - 1] == "`":
+                continue
+            self.literals.append(text[emitted:start])
+            self.slots.append(number)
+            emitted = end
+        self.literals.append(text[emitted:])
+
+    def render(self, values: Mapping[str, Optional[str]]) -> Tuple[str, SubstitutionReport]:
+        by_placeholder = {placeholder(key): value for key, value in values.items()}
+        report = SubstitutionReport()
+        report.unknown.update(self.unknown)
+        parts = [self.literals[0]]
+        for number, literal in zip(self.slots, self.literals[1:]):
+            pattern = self.patterns[number]
+            value = by_placeholder.get(pattern)
+            if value is None:
+                _bump(report.unresolved, pattern)
+                parts.append(pattern)
+            else:
+                _bump(report.replaced, pattern)
+                parts.append(value)
+            parts.append(literal)
+        return "".join(parts), report
+
+
+# -- values -----------------------------------------------------------------
+
+_COMPANY_SPLIT_RE = re.compile(r"\s+(?:[-–—|@]|at)\s+|,\s+")
+
+
+def company_from_heading(heading: str) -> Optional[str]:
+    """"Initech - Engineer" / "Engineer at Initech" -> "Initech\""""
+    if not heading:
+        return None
+    at = re.split(r"\s+(?:at|@)\s+", heading, maxsplit=1)
+    if len(at) == 2:
+        return _COMPANY_SPLIT_RE.split(at[1])[0].strip() or None
+    return _COMPANY_SPLIT_RE.split(heading)[0].strip() or None
+
+
+def personal_values(user_name: str = None, resume_content: str = None, current_date: str = None,
+                    estimated_date: str = None,
+                    overrides: Mapping[str, Optional[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Values for DEFAULT_PLACEHOLDERS from a resume and the plan dates
+
+    Anything not found stays None, so it is reported as unresolved.
+    """
+    summary = {}
+    if resume_content:
+        from resume_ingest import collect_fields, parse_fields
+
+        summary = collect_fields(parse_fields([resume_content]))
+    name = user_name or summary.get("name")
+    company = None
+    for entry in summary.get("experience", ()):
+        company = entry.get("company") or company_from_heading(entry.get("heading", ""))
+        if company:
+            break
+    skills = summary.get("skills") or ()
+    values = {
+        "Website Owner": name,
+        "Your Name": name,
+        "User Name": name,
+        "Company": company,
+        "Current Company": company,
+        "Your Skills": ", ".join(skills[:MAX_SKILLS]) or None,
+        "Current Date": current_date,
+        "Estimated Date": estimated_date,
+    }
+    values.update(overrides or {})
+    return values
+
+
+# -- CLI --------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fill personalization placeholders in a document")
+    parser.add_argument("input", help="Document to personalize, or - for stdin")
+    parser.add_argument("--resume", default=None, help="Resume (PDF, text or JSON) to take values from")
+    parser.add_argument("--name", default=None, help="User name (default: from the resume)")
+    parser.add_argument("--current-date", default=None, help="Value for [Current Date]")
+    parser.add_argument("--estimated-date", default=None, help="Value for [Estimated Date]")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Explicit value, e.g. --set 'Company=Acme Corp' (repeatable)")
+    parser.add_argument("--output", "-o", default=None, help="Write here (atomically) instead of stdout")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when a placeholder stays unresolved")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters read per chunk")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for item in args.set:
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            parser.error(f"--set expects NAME=VALUE, got {item!r}")
+        overrides[key.strip()] = value
+    try:
+        resume = None
+        if args.resume:
+            from resume_ingest import read_resume
+
+            resume = read_resume(args.resume)
+        values = personal_values(args.name, resume, args.current_date, args.estimated_date, overrides)
+        if args.output:
+            if args.input == "-":
+                substituter = Substituter(values)
+                with open(args.output, "w", encoding="utf-8") as handle:
+                    handle.writelines(substituter.stream(iter(lambda: sys.stdin.read(args.chunk_size), "")))
+                report = substituter.report
+            else:
+                report = substitute_file(args.input, args.output, values, chunk_size=args.chunk_size)
+        else:
+            chunks = (iter(lambda: sys.stdin.read(args.chunk_size), "") if args.input == "-"
+                      else iter_file_chunks(args.input, args.chunk_size))
+            substituter = Substituter(values)
+            for out in substituter.stream(chunks):
+                sys.stdout.write(out)
+            report = substituter.report
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    for pattern, count in sorted(report.replaced.items()):
+        print(f"replaced {pattern} x{count}", file=sys.stderr)
+    for pattern, count in sorted(report.unresolved.items()):
+        print(f"unresolved {pattern} x{count}", file=sys.stderr)
+    for pattern, count in sorted(report.unknown.items()):
+        print(f"unknown {pattern} x{count}", file=sys.stderr)
+    return 1 if args.strict and not report.ok else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
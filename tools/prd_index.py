@@ -0,0 +1,420 @@
+"""
+PRD Section Index
+=================
+
+Parses PRODUCT_REQUIREMENTS_DOCUMENT.md once into a heading tree so prompts can
+carry only the sections relevant to a user instead of the whole document.
+
+Parsed indexes are cached by content hash (and, when loaded from disk, by
+path + mtime), so repeat calls with the same PRD skip parsing entirely.
+
+Usage:
+    index = load_prd_index("tools/PRODUCT_REQUIREMENTS_DOCUMENT.md")
+    selection = index.select(focus=detect_focus(resume_text), token_budget=4000)
+    selection.text, selection.tokens_saved
+"""
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from instrumentation import count, span
+from tokenizer import count_tokens, default_tokenizer_name
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+# Top-level sections every plan needs regardless of the user's focus
+CORE_SECTIONS = ("Executive Summary", "Technical Architecture", "Quick Start Guide for Developers")
+
+# Section title keywords that matter most for each technical focus
+FOCUS_KEYWORDS = {
+    "frontend": ("feature", "animation", "responsive", "navigation", "hero", "performance",
+                 "component", "typescript", "cursor", "prism", "spotlight"),
+    "backend": ("architecture", "deployment", "environment", "configuration", "testing",
+                "quality", "ci/cd", "actions"),
+    "full-stack": ("architecture", "feature", "deployment", "environment", "performance",
+                   "component", "testing"),
+    "ai-ml": ("skills", "projects", "llms", "ai", "hero", "data management", "technology"),
+    "data": ("skills", "projects", "data", "experience", "metrics", "visualization"),
+    "devops": ("deployment", "github", "actions", "environment", "commands", "maintenance",
+               "performance", "bundle"),
+}
+
+# Resume keywords used to guess the user's primary technical focus
+RESUME_FOCUS_SIGNALS = {
+    "ai-ml": ("machine learning", "deep learning", "llm", "prompt engineering", "pytorch",
+              "tensorflow", "nlp", "ai", "artificial intelligence", "bedrock", "red teaming"),
+    "data": ("data engineer", "etl", "pandas", "sql", "spark", "data visualization",
+             "warehouse", "analytics", "tableau", "jupyter"),
+    "frontend": ("react", "frontend", "front-end", "css", "javascript", "typescript", "ui",
+                 "ux", "vue", "angular", "tailwind"),
+    "backend": ("backend", "back-end", "api", "django", "flask", "fastapi", "microservice",
+                "node.js", "java", "golang", "postgres", "postgresql"),
+    "devops": ("devops", "kubernetes", "docker", "terraform", "ci/cd", "sre", "ansible",
+               "infrastructure"),
+}
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Whole words (plural too): "java" must not match "javascript", nor "ux" "linux"."""
+    alternatives = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})s?(?!\w)")
+
+
+_FOCUS_PATTERNS = {focus: _keyword_pattern(keywords) for focus, keywords in FOCUS_KEYWORDS.items()}
+_SIGNAL_PATTERNS = {focus: _keyword_pattern(signals) for focus, signals in RESUME_FOCUS_SIGNALS.items()}
+
+
+def estimate_tokens(text: str) -> int:
+    """Offline token count with the default tokenizer (see tokenizer.py)"""
+    return count_tokens(text)
+
+
+def clean_title(raw: str) -> str:
+    """Strip emoji, markdown emphasis and list numbering from a heading"""
+    title = raw.replace("**", "").replace("__", "")
+    title = re.sub(r"^[^\w\[(]+", "", title)           # leading emoji / symbols
+    title = re.sub(r"^\d+(\.\d+)*[.)]?\s+", "", title)  # "1. Hero Section"
+    return title.strip()
+
+
+def slugify(title: str) -> str:
+    slug = re.sub(r"[^\w\s-]", "", title.lower())
+    return re.sub(r"[\s_]+", "-", slug).strip("-")
+
+
+class PRDSection:
+    """One heading and everything beneath it up to the next heading of equal or higher level"""
+
+    __slots__ = ("title", "raw_title", "level", "slug", "start", "end", "children", "parent",
+                 "text", "tokens")
+
+    def __init__(self, raw_title: str, level: int, start: int, parent=None):
+        self.raw_title = raw_title
+        self.title = clean_title(raw_title)
+        self.level = level
+        self.slug = slugify(self.title)
+        self.start = start          # first line (the heading itself)
+        self.end = start            # one past the last line, fixed up after parsing
+        self.children = []
+        self.parent = parent
+        self.text = ""
+        self.tokens = 0
+
+    @property
+    def path(self) -> str:
+        parts = []
+        node = self
+        while node is not None and node.level > 0:
+            parts.append(node.title)
+            node = node.parent
+        return " > ".join(reversed(parts))
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def __repr__(self):
+        return f"PRDSection({self.path!r}, lines={self.start}-{self.end}, tokens={self.tokens})"
+
+
+class PRDSelection(NamedTuple):
+    """Sections chosen for a prompt plus the token accounting for the choice"""
+    focus: Optional[str]
+    sections: Tuple[str, ...]
+    text: str
+    tokens: int
+    full_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.full_tokens - self.tokens
+
+    def as_dict(self) -> dict:
+        return {
+            "focus": self.focus,
+            "sections": list(self.sections),
+            "text": self.text,
+            "tokens": self.tokens,
+            "full_tokens": self.full_tokens,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+class PRDIndex:
+    """
+    Heading tree over a PRD markdown document
+
+    Args:
+        content: Full markdown text of the PRD
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        self.lines = content.splitlines(keepends=True)
+        self.root = PRDSection("", 0, 0)
+        self.full_tokens = estimate_tokens(content)
+        self._by_slug: Dict[str, PRDSection] = {}
+        self._selections: Dict[tuple, PRDSelection] = {}
+        self._parse()
+
+    def _parse(self):
+        stack = [self.root]
+        in_fence = False
+        for line_no, line in enumerate(self.lines):
+            if FENCE_RE.match(line):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue  # "# comment" lines inside code blocks are not headings
+            match = HEADING_RE.match(line)
+            if not match:
+                continue
+            level = len(match.group(1))
+            if level == 1 and line_no == 0:
+                continue  # document title stays part of the root preamble
+            while stack[-1].level >= level:
+                stack.pop().end = line_no
+            section = PRDSection(match.group(2), level, line_no, parent=stack[-1])
+            stack[-1].children.append(section)
+            stack.append(section)
+            self._by_slug.setdefault(section.slug, section)
+        for section in stack:
+            section.end = len(self.lines)
+
+        for section in self.root.walk():
+            section.text = "".join(self.lines[section.start:section.end])
+            section.tokens = estimate_tokens(section.text)
+
+    @property
+    def preamble(self) -> str:
+        """Document title and metadata block before the first section"""
+        first = self.root.children[0].start if self.root.children else len(self.lines)
+        return "".join(self.lines[:first])
+
+    @property
+    def sections(self) -> List[PRDSection]:
+        """Top-level (##) sections in document order"""
+        return list(self.root.children)
+
+    def get(self, title: str) -> Optional[PRDSection]:
+        """Look a section up by title or slug, e.g. "Deployment Strategy" """
+        return self._by_slug.get(slugify(clean_title(title)))
+
+    def outline(self) -> List[str]:
+        return [section.path for section in self.root.walk() if section.level > 0]
+
+    def score(self, section: PRDSection, focus: Optional[str]) -> float:
+        """Relevance of a section for a focus; core sections always rank first"""
+        if section.level == 2 and section.title in CORE_SECTIONS:
+            return 100.0
+        pattern = _FOCUS_PATTERNS.get(focus or "")
+        if pattern is None:
+            return 0.0
+        haystack = " ".join(node.title.lower() for node in section.walk())
+        return float(len(pattern.findall(haystack)))
+
+    def select(self, focus: Optional[str] = None, token_budget: Optional[int] = None,
+               include: Tuple[str, ...] = ()) -> PRDSelection:
+        """
+        Pick the sections most relevant to a focus that fit in a token budget
+
+        Sections are ranked by score per token. A top-level section that does not
+        fit is broken down into its subsections. The chosen sections are emitted
+        in document order after the preamble, whose tokens count against the
+        budget too.
+
+        Args:
+            focus: Technical focus from detect_focus() ("ai-ml", "frontend", ...)
+            token_budget: Maximum tokens for the selection (None = everything relevant)
+            include: Extra section titles to force in (e.g. "Deployment Strategy")
+
+        Returns:
+            PRDSelection with the rendered text and token accounting
+        """
+        key = (focus, token_budget, tuple(include))
+        cached = self._selections.get(key)
+        if cached is not None:
+            return cached
+
+        forced = {slugify(clean_title(title)) for title in include}
+        budget = token_budget if token_budget is not None else self.full_tokens
+        # The preamble is spent first; a budget too small for it gets sections only
+        preamble = self.preamble
+        used = estimate_tokens(preamble)
+        if used > budget:
+            preamble, used = "", 0
+        chosen = []
+
+        def relevant(section: PRDSection) -> bool:
+            # Without a focus everything competes; with one, unrelated sections are dropped
+            return focus is None or section.slug in forced or self.score(section, focus) > 0
+
+        def rank(sections):
+            return sorted((section for section in sections if relevant(section)),
+                          key=lambda s: (-(1000.0 if s.slug in forced else self.score(s, focus)),
+                                         s.tokens))
+
+        queue = rank(self.root.children)
+        while queue:
+            section = queue.pop(0)
+            if used + section.tokens <= budget:
+                chosen.append(section)
+                used += section.tokens
+            elif section.children:
+                # Too big as a whole: keep the heading and let its subsections compete
+                heading = _HeadingOnly(section, self.lines[section.start])
+                if used + heading.tokens <= budget:
+                    used += heading.tokens
+                    chosen.append(heading)
+                    queue[0:0] = rank(section.children)
+
+        chosen.sort(key=lambda section: section.start)
+        text = preamble + "".join(section.text for section in chosen)
+        selection = PRDSelection(
+            focus=focus,
+            sections=tuple(section.path for section in chosen),
+            text=text,
+            tokens=estimate_tokens(text),
+            full_tokens=self.full_tokens,
+        )
+        self._selections[key] = selection
+        return selection
+
+
+class _HeadingOnly:
+    """Stand-in for a section whose body was dropped but whose subsections were kept"""
+
+    __slots__ = ("start", "text", "path", "tokens")
+
+    def __init__(self, section: PRDSection, heading_line: str):
+        self.start = section.start
+        self.text = heading_line  # lines keep their line endings
+        self.path = section.path
+        self.tokens = estimate_tokens(self.text)
+
+
+def detect_focus(resume_content: str) -> Optional[str]:
+    """
+    Guess the user's primary technical focus from resume keywords
+
+    Returns:
+        One of "ai-ml", "data", "frontend", "backend", "devops", "full-stack" or None
+    """
+    if not resume_content:
+        return None
+    text = resume_content.lower()
+    scores = {focus: len(pattern.findall(text)) for focus, pattern in _SIGNAL_PATTERNS.items()}
+    best = max(scores, key=scores.get)
+    if scores[best] == 0:
+        return None
+    if best in ("frontend", "backend") and scores["frontend"] and scores["backend"]:
+        ratio = min(scores["frontend"], scores["backend"]) / max(scores["frontend"], scores["backend"])
+        if ratio >= 0.5:
+            return "full-stack"
+    return best
+
+
+class _IndexCache:
+    """
+    Small LRU of parsed indexes keyed by content hash, plus a path/mtime shortcut
+
+    Token counts are baked into a parsed index, so keys also carry the default
+    tokenizer's name.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self.by_hash: "OrderedDict[Tuple[str, str], PRDIndex]" = OrderedDict()
+        self.by_path: Dict[str, Tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def for_content(self, content: str) -> PRDIndex:
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return self._lookup(digest, content)
+
+    def _lookup(self, digest: str, content: str = None) -> Optional[PRDIndex]:
+        key = (digest, default_tokenizer_name())
+        index = self.by_hash.get(key)
+        if index is not None:
+            self.hits += 1
+            count("cache_hits", cache="prd_index")
+            self.by_hash.move_to_end(key)
+            return index
+        if content is None:
+            return None
+        self.misses += 1
+        count("cache_misses", cache="prd_index")
+        with span("prd.parse"):
+            index = PRDIndex(content)
+        self.by_hash[key] = index
+        if len(self.by_hash) > self.max_entries:
+            self.by_hash.popitem(last=False)
+        return index
+
+    def for_path(self, path) -> PRDIndex:
+        path = os.fspath(path)
+        stat = os.stat(path)
+        known = self.by_path.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            index = self._lookup(known[2])
+            if index is not None:
+                return index
+        index = self.for_content(Path(path).read_text(encoding="utf-8"))
+        self.by_path[path] = (stat.st_mtime_ns, stat.st_size, index.content_hash)
+        return index
+
+    def clear(self):
+        self.by_hash.clear()
+        self.by_path.clear()
+        self.hits = self.misses = 0
+
+
+_cache = _IndexCache()
+
+
+def index_for_content(prd_content: str) -> PRDIndex:
+    """Parsed index for PRD text, reusing a cached parse of identical content"""
+    return _cache.for_content(prd_content)
+
+
+def load_prd_index(path) -> PRDIndex:
+    """Parsed index for a PRD file; unchanged files (same mtime and size) skip even hashing"""
+    return _cache.for_path(path)
+
+
+def cache_info() -> dict:
+    return {"hits": _cache.hits, "misses": _cache.misses, "entries": len(_cache.by_hash)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Inspect PRD sections and token savings")
+    parser.add_argument("prd", nargs="?", default=Path(__file__).with_name("PRODUCT_REQUIREMENTS_DOCUMENT.md"))
+    parser.add_argument("--focus", default=None, choices=sorted(FOCUS_KEYWORDS))
+    parser.add_argument("--budget", type=int, default=None, help="Token budget for the selection")
+    parser.add_argument("--outline", action="store_true", help="Print the heading tree")
+    parser.add_argument("--tokenizer", default=None, help="Token counter from tokenizer.py (default: chars)")
+    args = parser.parse_args()
+
+    if args.tokenizer:
+        from tokenizer import set_default_tokenizer
+
+        set_default_tokenizer(args.tokenizer)
+    index = load_prd_index(args.prd)
+    if args.outline:
+        print("\n".join(index.outline()))
+    else:
+        selection = index.select(args.focus, args.budget)
+        summary = selection.as_dict()
+        summary.pop("text")
+        print(json.dumps(summary, indent=2))
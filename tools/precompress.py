@@ -0,0 +1,410 @@
+"""
+Deployment Precompression and Bundle Budgets
+============================================
+
+Post-build stage for the Vite output in dist/:
+
+1. Precompresses JS/CSS/HTML/SVG (and other text assets) to .gz and, when the
+   brotli package is installed, .br next to each file. Files are compressed
+   on a thread pool (zlib and brotli release the GIL). Compressed blobs are
+   cached by content hash, so a chunk whose hash hasn't changed since the
+   last run is skipped, or copied from the cache after a clean rebuild.
+2. Reports raw / gzip / brotli sizes per chunk and checks them against the
+   budgets in bundle_budgets.json: per-chunk limits (entry, framer-motion,
+   animations, lazy sections), totals, and the initial load referenced by
+   index.html together with its estimated load time on a throttled link.
+3. Exits non-zero when a budget is exceeded. With --task-file, a passing run
+   marks the bundle-size task (STEP 16, Task 5.2) completed in task.md.
+
+GitHub Pages compresses responses itself and ignores .gz/.br files, so the
+deploy workflow runs this with --no-write to enforce the budgets only; hosts
+that serve precompressed files (nginx gzip_static/brotli_static, Netlify,
+Cloudflare) use the written files directly.
+
+Usage:
+    python tools/precompress.py dist
+    python tools/precompress.py dist --no-write --report bundle-report.json
+    python tools/precompress.py dist --task-file tools/tasks/task.md
+"""
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGETS = TOOLS_DIR / "bundle_budgets.json"
+DEFAULT_CACHE_DIR = TOOLS_DIR / ".cache" / "precompress"
+
+COMPRESSIBLE = frozenset((".html", ".js", ".mjs", ".css", ".svg", ".json", ".xml", ".txt", ".webmanifest"))
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+BUDGET_STEP = 16  # "Performance Optimization": lazy loading and bundle within size budgets
+
+_INITIAL_ASSET_RE = re.compile(
+    r"""<script\b[^>]*\bsrc=["']([^"']+)["']"""
+    r"""|<link\b(?=[^>]*\brel=["'](?:stylesheet|modulepreload)["'])[^>]*\bhref=["']([^"']+)["']""",
+    re.IGNORECASE)
+
+
+def _brotli():
+    """The brotli module (brotli or brotlicffi), or None when neither is installed"""
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return __import__(name)
+        except ImportError:
+            continue
+    return None
+
+
+class Asset(NamedTuple):
+    """One compressible file in dist/; brotli is None when brotli is unavailable"""
+    path: str      # relative to dist, POSIX separators
+    digest: str
+    raw: int
+    gzip: int
+    brotli: Optional[int]
+    action: str    # compressed | cached | unchanged | measured
+
+
+class BudgetResult(NamedTuple):
+    name: str
+    files: List[str]
+    size: float
+    limit: float
+    unit: str      # "bytes" or "s"
+    compression: str
+    ok: bool
+    note: str = ""
+
+
+def compressible_files(dist) -> List[Path]:
+    dist = Path(dist)
+    return sorted(path for path in dist.rglob("*")
+                  if path.is_file() and path.suffix.lower() in COMPRESSIBLE)
+
+
+def _atomic_write(path: Path, data: bytes, mode: int = None):
+    """Replace path with data; mode defaults to the file's current one (umask default if new)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".precompress.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.chmod(tmp_path, mode)  # not mkstemp's 0600: the web server serves these
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class Precompressor:
+    """
+    Compresses the text assets of one dist directory
+
+    Args:
+        dist: Vite output directory
+        cache_dir: Content-addressed blob cache plus a manifest of the last run;
+            None disables skipping and caching
+        write: Write .gz/.br files next to the assets (False: measure only)
+        jobs: Worker threads (default: CPU count)
+    """
+
+    def __init__(self, dist, cache_dir=DEFAULT_CACHE_DIR, write: bool = True, jobs: int = None):
+        self.dist = Path(dist)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.write = write
+        self.jobs = jobs or os.cpu_count() or 1
+        self.brotli = _brotli()
+        self.encodings = {"gzip": ".gz"}
+        if self.brotli is not None:
+            self.encodings["brotli"] = ".br"
+        self.manifest: Dict[str, list] = self._load_manifest()
+
+    @property
+    def _manifest_path(self) -> Optional[Path]:
+        return self.cache_dir / "manifest.json" if self.cache_dir is not None else None
+
+    def _load_manifest(self) -> Dict[str, list]:
+        path = self._manifest_path
+        if path is None or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8")).get(str(self.dist.resolve()), {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, assets: List[Asset]):
+        path = self._manifest_path
+        if path is None:
+            return
+        try:
+            everything = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        except ValueError:
+            everything = {}
+        everything[str(self.dist.resolve())] = {
+            asset.path: [asset.digest, asset.raw, asset.gzip, asset.brotli] for asset in assets}
+        _atomic_write(path, json.dumps(everything, sort_keys=True).encode("utf-8"))
+
+    def _compress(self, encoding: str, data: bytes) -> bytes:
+        if encoding == "gzip":
+            return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        return self.brotli.compress(data, quality=BROTLI_QUALITY)
+
+    def _blob_path(self, digest: str, encoding: str) -> Path:
+        level = GZIP_LEVEL if encoding == "gzip" else BROTLI_QUALITY
+        return self.cache_dir / digest[:2] / f"{digest}.{encoding}{level}"
+
+    def _process(self, path: Path) -> Asset:
+        rel = path.relative_to(self.dist).as_posix()
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        sizes = {"gzip": None, "brotli": None}
+
+        known = self.manifest.get(rel)
+        if (known and known[0] == digest and (known[3] is not None) == (self.brotli is not None)
+                and (not self.write or all(Path(f"{path}{suffix}").exists()
+                                           for suffix in self._written_suffixes(known)))):
+            return Asset(rel, digest, len(data), known[2], known[3], "unchanged")
+
+        action = "cached"
+        for encoding, suffix in self.encodings.items():
+            cached = self._blob_path(digest, encoding) if self.cache_dir is not None else None
+            if cached is not None and cached.exists():
+                blob = cached.read_bytes()
+            else:
+                blob = self._compress(encoding, data)
+                action = "compressed"
+                if cached is not None:
+                    _atomic_write(cached, blob)
+            sizes[encoding] = len(blob)
+            # Serving a "compressed" file that is bigger than the original helps nobody
+            if self.write and len(blob) < len(data):
+                _atomic_write(Path(f"{path}{suffix}"), blob, path.stat().st_mode & 0o777)
+        if not self.write:
+            action = "measured"
+        return Asset(rel, digest, len(data), sizes["gzip"], sizes["brotli"], action)
+
+    def _written_suffixes(self, known: list):
+        raw = known[1]
+        if known[2] < raw:
+            yield ".gz"
+        if known[3] is not None and known[3] < raw:
+            yield ".br"
+
+    def run(self) -> List[Asset]:
+        files = compressible_files(self.dist)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            assets = list(pool.map(self._process, files))
+        if self.write:
+            self._save_manifest(assets)
+        return assets
+
+
+# -- budgets ----------------------------------------------------------------
+
+def load_budgets(path) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        config = json.load(handle)
+    for budget in config.get("budgets", []):
+        if "max_kb" not in budget or not ("pattern" in budget or budget.get("initial")):
+            raise ValueError(f"budget {budget.get('name', budget)!r} needs max_kb and a pattern or initial")
+    return config
+
+
+def initial_assets(dist) -> List[str]:
+    """index.html plus the scripts, stylesheets and modulepreloads it references"""
+    index = Path(dist) / "index.html"
+    if not index.exists():
+        return []
+    found = ["index.html"]
+    for match in _INITIAL_ASSET_RE.finditer(index.read_text(encoding="utf-8", errors="replace")):
+        url = (match.group(1) or match.group(2)).split("?")[0].split("#")[0]
+        if "://" in url or url.startswith("//"):
+            continue
+        found.append(posixpath.normpath(url).lstrip("/"))
+    return found
+
+
+def _size(asset: Asset, compression: str) -> int:
+    if compression == "raw":
+        return asset.raw
+    if compression == "brotli" and asset.brotli is not None:
+        return asset.brotli
+    return asset.gzip
+
+
+def check_budgets(assets: List[Asset], config: dict, initial: List[str] = ()) -> List[BudgetResult]:
+    """
+    Evaluate the budgets in a bundle_budgets.json config
+
+    Per-chunk budgets apply to every matching file; "total": true sums them.
+    "initial": true budgets the files index.html loads up front. A pattern that
+    matches nothing is reported, not failed, so optional chunks can be listed.
+    """
+    default_compression = config.get("compression", "gzip")
+    by_path = {asset.path: asset for asset in assets}
+    have_brotli = all(asset.brotli is not None for asset in assets)
+    results = []
+    initial_assets_found = [by_path[path] for path in initial if path in by_path]
+
+    for budget in config.get("budgets", []):
+        name = budget.get("name", budget.get("pattern", "initial load"))
+        compression = budget.get("compression", default_compression)
+        note = ""
+        if compression == "brotli" and not have_brotli:
+            note = "brotli not installed; measured gzip"
+        limit = budget["max_kb"] * 1024
+        if budget.get("initial"):
+            matched = initial_assets_found
+            groups = [matched]
+        else:
+            matched = [asset for asset in assets if fnmatch.fnmatchcase(asset.path, budget["pattern"])]
+            groups = [matched] if budget.get("total") else [[asset] for asset in matched]
+        if not matched:
+            results.append(BudgetResult(name, [], 0, limit, "bytes", compression, True, "no matching files"))
+            continue
+        for group in groups:
+            size = sum(_size(asset, compression) for asset in group)
+            label = name if len(groups) == 1 else f"{name}: {group[0].path}"
+            results.append(BudgetResult(label, [asset.path for asset in group], size, limit, "bytes",
+                                        compression, size <= limit, note))
+
+    if "max_initial_load_s" in config and initial_assets_found:
+        compression = config.get("load_compression", default_compression)
+        size = sum(_size(asset, compression) for asset in initial_assets_found)
+        seconds = estimated_load_seconds(size, config.get("bandwidth_kbps", 1600), config.get("rtt_ms", 150))
+        limit = config["max_initial_load_s"]
+        results.append(BudgetResult("initial load time", [asset.path for asset in initial_assets_found],
+                                    round(seconds, 3), limit, "s", compression, seconds <= limit,
+                                    f"{config.get('bandwidth_kbps', 1600)} kbps, "
+                                    f"{config.get('rtt_ms', 150)} ms RTT"))
+    return results
+
+
+def estimated_load_seconds(size: int, bandwidth_kbps: float, rtt_ms: float) -> float:
+    """
+    Transfer time for the initial assets on a throttled link
+
+    One round trip for the connection, one for index.html, one for the assets
+    it references (fetched in parallel over HTTP/2), plus the bytes themselves.
+    """
+    return 3 * rtt_ms / 1000 + size * 8 / (bandwidth_kbps * 1000)
+
+
+def mark_budget_step(task_file) -> Optional[str]:
+    """Complete the bundle-budget task in task.md; returns its id, or None if it was already done"""
+    from task_model import COMPLETED, default_plan
+    from task_updater import TaskEvent, TaskFileUpdater
+
+    task_id = default_plan("", "", "").find_step(BUDGET_STEP).task_id
+    updater = TaskFileUpdater(task_file)
+    task = updater.index.tasks.get(task_id)
+    if task is None:
+        raise KeyError(f"unknown task {task_id!r}")
+    if task.status == COMPLETED:
+        return None
+    updater.apply(TaskEvent("complete", task_id, None))
+    return task_id
+
+
+# -- CLI --------------------------------------------------------------------
+
+def _kb(size: Optional[float]) -> str:
+    return "-" if size is None else f"{size / 1024:.1f}"
+
+
+def report(assets: List[Asset], results: List[BudgetResult], initial: List[str]) -> dict:
+    return {
+        "assets": [asset._asdict() for asset in sorted(assets, key=lambda asset: -asset.raw)],
+        "initial": list(initial),
+        "budgets": [result._asdict() for result in results],
+        "ok": all(result.ok for result in results),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Precompress dist/ and check bundle size budgets")
+    parser.add_argument("dist", nargs="?", default="dist", help="Vite output directory (default: %(default)s)")
+    parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS), help="Budget config (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help="Compressed blob cache (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompress everything")
+    parser.add_argument("--no-write", action="store_true", help="Measure only; don't write .gz/.br files")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker threads (default: CPU count)")
+    parser.add_argument("--report", default=None, help="Write the size report as JSON here")
+    parser.add_argument("--task-file", default=None,
+                        help=f"Mark STEP {BUDGET_STEP} completed in this task.md when all budgets pass")
+    parser.add_argument("--quiet", action="store_true", help="Only print budget failures")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dist):
+        print(f"error: {args.dist} is not a directory; run `npm run build` first", file=sys.stderr)
+        return 1
+    try:
+        config = load_budgets(args.budgets)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    compressor = Precompressor(args.dist, None if args.no_cache else args.cache_dir,
+                               write=not args.no_write, jobs=args.jobs)
+    assets = compressor.run()
+    initial = initial_assets(args.dist)
+    results = check_budgets(assets, config, initial)
+
+    if not args.quiet:
+        if compressor.brotli is None:
+            print("note: brotli not installed (pip install brotli); writing gzip only", file=sys.stderr)
+        print(f"{'file':<48}{'raw KB':>10}{'gzip KB':>10}{'br KB':>10}  action")
+        for asset in sorted(assets, key=lambda asset: -asset.raw):
+            marker = "*" if asset.path in initial else " "
+            print(f"{marker}{asset.path:<47}{_kb(asset.raw):>10}{_kb(asset.gzip):>10}"
+                  f"{_kb(asset.brotli):>10}  {asset.action}")
+        print("(* loaded by index.html)")
+    for result in results:
+        if result.ok and args.quiet:
+            continue
+        size, limit = ((f"{result.size:.2f}s", f"{result.limit:.2f}s") if result.unit == "s"
+                       else (f"{_kb(result.size)} KB", f"{_kb(result.limit)} KB"))
+        status = "ok  " if result.ok else "FAIL"
+        note = f" ({result.note})" if result.note else ""
+        print(f"{status} {result.name}: {size} / {limit} {result.compression}{note}",
+              file=sys.stdout if result.ok else sys.stderr)
+
+    if args.report:
+        _atomic_write(Path(args.report), (json.dumps(report(assets, results, initial), indent=2) + "\n").encode())
+    failures = [result for result in results if not result.ok]
+    if failures:
+        print(f"BUDGET EXCEEDED: {len(failures)} of {len(results)} budgets", file=sys.stderr)
+        return 1
+    if args.task_file:
+        try:
+            task_id = mark_budget_step(args.task_file)
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        if task_id:
+            print(f"budgets pass; marked Task {task_id} completed in {args.task_file}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
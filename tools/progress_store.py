@@ -0,0 +1,713 @@
+"""
+Event-Sourced Progress Store
+============================
+
+Persistent progress tracking for any number of portfolio projects in one
+local SQLite database (WAL mode, so readers never wait on the writer and
+several processes can record events at once).
+
+- events:    append-only log of register/start/complete/block events
+             (UPDATE and DELETE are rejected by triggers)
+- tasks:     plan rows plus the materialized current state of each task
+             (status, started/completed timestamps, actual hours, blocker)
+- phases,
+  projects:  counters (completed, in progress, blocked, estimated vs actual hours)
+             maintained in the same transaction as each event
+- snapshots: every SNAPSHOT_INTERVAL events per project the task states are
+             serialized, so state at any past event and full rebuilds replay
+             at most one interval of events
+
+Current status and per-phase percentages are single-row / per-phase reads,
+estimate-vs-actual and blocker reports are index range scans; nothing replays
+history on the read path.
+
+Events follow the same rules as task_updater.py: starting a task requires its
+dependencies to be completed (unless forced), and repeating the current status
+is a no-op. Completing without --hours records the time since the task was
+started as the actual time spent.
+
+Usage:
+    store = ProgressStore("tools/tasks/progress.db")
+    store.register_task_file("jane-portfolio", "tools/tasks/task.md")
+    store.start("jane-portfolio", "1.1")
+    store.complete("jane-portfolio", "1.1", hours=0.5)
+    store.status("jane-portfolio"), store.estimate_report("jane-portfolio")
+
+    python tools/progress_store.py register jane-portfolio tools/tasks/task.md
+    python tools/progress_store.py complete jane-portfolio 1.1 --hours 0.5
+    python tools/progress_store.py report jane-portfolio
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from task_model import BLOCKED, COMPLETED, IN_PROGRESS, format_hours, percent
+from task_updater import TaskEvent, TaskFileIndex
+
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tasks", "progress.db")
+SCHEMA_VERSION = 2  # 2: tasks_open
+SNAPSHOT_INTERVAL = 256   # events per project between snapshots
+EVENT_KINDS = ("start", "complete", "block")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_id        INTEGER PRIMARY KEY,
+    name              TEXT NOT NULL UNIQUE,
+    user_name         TEXT,
+    created_at        TEXT NOT NULL,
+    updated_at        TEXT NOT NULL,
+    total_tasks       INTEGER NOT NULL DEFAULT 0,
+    completed_tasks   INTEGER NOT NULL DEFAULT 0,
+    in_progress_tasks INTEGER NOT NULL DEFAULT 0,
+    blocked_tasks     INTEGER NOT NULL DEFAULT 0,
+    estimate_hours    REAL NOT NULL DEFAULT 0,
+    completed_estimate_hours REAL NOT NULL DEFAULT 0,
+    actual_hours      REAL NOT NULL DEFAULT 0,
+    last_seq          INTEGER NOT NULL DEFAULT 0,
+    snapshot_seq      INTEGER NOT NULL DEFAULT 0,
+    events_since_snapshot INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id     INTEGER NOT NULL REFERENCES projects(project_id),
+    task_id        TEXT NOT NULL,
+    phase          INTEGER NOT NULL,
+    position       INTEGER NOT NULL,
+    name           TEXT NOT NULL,
+    estimate_hours REAL NOT NULL DEFAULT 0,
+    dependencies   TEXT NOT NULL DEFAULT '',
+    status         TEXT NOT NULL,
+    started_at     TEXT,
+    completed_at   TEXT,
+    actual_hours   REAL,
+    blocker        TEXT,
+    last_seq       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (project_id, status, position);
+-- next_up(): unfinished tasks in plan order, read straight off the index (status literal must match the query)
+CREATE INDEX IF NOT EXISTS tasks_open ON tasks (project_id, position) WHERE status != 'completed';
+
+CREATE TABLE IF NOT EXISTS phases (
+    project_id     INTEGER NOT NULL REFERENCES projects(project_id),
+    phase          INTEGER NOT NULL,
+    name           TEXT NOT NULL,
+    total          INTEGER NOT NULL DEFAULT 0,
+    completed      INTEGER NOT NULL DEFAULT 0,
+    estimate_hours REAL NOT NULL DEFAULT 0,
+    completed_estimate_hours REAL NOT NULL DEFAULT 0,
+    actual_hours   REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, phase)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS events (
+    seq        INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(project_id),
+    task_id    TEXT,
+    kind       TEXT NOT NULL,
+    ts         TEXT NOT NULL,
+    hours      REAL,
+    note       TEXT
+);
+CREATE INDEX IF NOT EXISTS events_by_project ON events (project_id, seq);
+CREATE INDEX IF NOT EXISTS events_by_task ON events (project_id, task_id, seq);
+CREATE INDEX IF NOT EXISTS events_by_kind ON events (project_id, kind, seq);
+
+CREATE TRIGGER IF NOT EXISTS events_no_update BEFORE UPDATE ON events
+BEGIN SELECT RAISE(ABORT, 'events are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS events_no_delete BEFORE DELETE ON events
+BEGIN SELECT RAISE(ABORT, 'events are append-only'); END;
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    project_id INTEGER NOT NULL REFERENCES projects(project_id),
+    seq        INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    state      BLOB NOT NULL,
+    PRIMARY KEY (project_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class TaskState(NamedTuple):
+    """Mutable part of a task, as materialized in the tasks table"""
+    status: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    actual_hours: Optional[float] = None
+    blocker: Optional[str] = None
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _elapsed_hours(start: Optional[str], end: str) -> Optional[float]:
+    if not start:
+        return None
+    try:
+        seconds = (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+    except ValueError:
+        return None
+    return round(max(0.0, seconds) / 3600, 4)
+
+
+def transition(state: TaskState, kind: str, timestamp: str, hours: float = None,
+               note: str = None) -> Optional[TaskState]:
+    """New task state after an event, or None when the event changes nothing"""
+    if kind == "start":
+        status = IN_PROGRESS
+    elif kind == "complete":
+        status = COMPLETED
+    elif kind == "block":
+        status = BLOCKED
+    else:
+        raise ValueError(f"unknown event kind {kind!r}")
+    if status == state.status:
+        return None
+    if status == IN_PROGRESS:
+        return TaskState(IN_PROGRESS, timestamp)
+    if status == COMPLETED:
+        actual = hours if hours is not None else _elapsed_hours(state.started_at, timestamp)
+        return TaskState(COMPLETED, state.started_at, timestamp, actual)
+    return TaskState(BLOCKED, state.started_at, None, None, note)
+
+
+def _plan_rows(plan) -> List[tuple]:
+    """(task_id, phase, phase name, name, estimate, dependencies, status) from a TaskPlan"""
+    return [(task.task_id, phase.number, phase.name, task.name, task.estimate_hours,
+             " ".join(task.dependencies), task.status)
+            for phase in plan.phases for task in phase.tasks]
+
+
+def _task_file_rows(path) -> List[tuple]:
+    with open(path, "rb") as handle:
+        index = TaskFileIndex(handle.read())
+    names = {number: phase.name for number, phase in index.phases.items()}
+    return [(task.task_id, task.phase, names.get(task.phase, f"Phase {task.phase}"), task.name,
+             task.estimate_hours, " ".join(task.dependencies), task.status)
+            for task in index.order]
+
+
+class ProgressStore:
+    """
+    SQLite-backed event store for task progress across many projects
+
+    Args:
+        path: Database file (created on first use), or ":memory:"
+        snapshot_interval: Events per project between state snapshots
+        timeout: Seconds to wait for another writer's lock
+    """
+
+    def __init__(self, path=DEFAULT_STORE, snapshot_interval: int = SNAPSHOT_INTERVAL,
+                 timeout: float = 10.0):
+        self.path = os.fspath(path)
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._shared = None
+        if self.path == ":memory:":
+            # One connection only (every :memory: connection is a new database); single-threaded use
+            self._shared = self._open()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection()
+
+    # -- connections --------------------------------------------------------
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=self.path != ":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # IF NOT EXISTS everywhere: processes racing to create the schema all succeed
+            conn.executescript(f"BEGIN IMMEDIATE;{SCHEMA}PRAGMA user_version={SCHEMA_VERSION};COMMIT;")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (SQLite connections must not be shared across threads)"""
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    def close(self):
+        conn = self._shared or getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._shared = None
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self):
+        return _Transaction(self._connection())
+
+    def _project(self, conn, project: str) -> sqlite3.Row:
+        row = conn.execute("SELECT * FROM projects WHERE name = ?", (project,)).fetchone()
+        if row is None:
+            raise KeyError(f"unknown project {project!r}")
+        return row
+
+    # -- registration -------------------------------------------------------
+
+    def register_plan(self, project: str, plan, timestamp: str = None) -> int:
+        """Register a project from a task_model.TaskPlan; returns its project id"""
+        return self._register(project, _plan_rows(plan), plan.user_name, timestamp)
+
+    def register_task_file(self, project: str, path, user_name: str = None, timestamp: str = None) -> int:
+        """Register a project from a rendered task.md, keeping the statuses it already records"""
+        return self._register(project, _task_file_rows(path), user_name, timestamp)
+
+    def has_project(self, project: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM projects WHERE name = ?", (project,)).fetchone() is not None
+
+    def _register(self, project: str, rows: List[tuple], user_name: Optional[str], timestamp: Optional[str]) -> int:
+        if not rows:
+            raise ValueError(f"project {project!r} has no tasks")
+        timestamp = timestamp or _now()
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM projects WHERE name = ?", (project,)).fetchone():
+                raise ValueError(f"project {project!r} is already registered")
+            project_id = conn.execute(
+                "INSERT INTO projects (name, user_name, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (project, user_name, timestamp, timestamp)).lastrowid
+            seq = conn.execute("INSERT INTO events (project_id, kind, ts, note) VALUES (?, 'register', ?, ?)",
+                               (project_id, timestamp, f"{len(rows)} tasks")).lastrowid
+            conn.executemany(
+                "INSERT INTO tasks (project_id, task_id, phase, position, name, estimate_hours, dependencies, "
+                "status, last_seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(project_id, task_id, phase, position, name, estimate, deps, status, seq)
+                 for position, (task_id, phase, _, name, estimate, deps, status) in enumerate(rows)])
+            phase_names = {}
+            for _, phase, phase_name, *_ in rows:
+                phase_names.setdefault(phase, phase_name)
+            conn.executemany("INSERT INTO phases (project_id, phase, name) VALUES (?, ?, ?)",
+                             [(project_id, phase, name) for phase, name in phase_names.items()])
+            self._recount(conn, project_id)
+            conn.execute("UPDATE projects SET last_seq = ? WHERE project_id = ?", (seq, project_id))
+            self._snapshot(conn, project_id, seq, timestamp)
+        return project_id
+
+    # -- events -------------------------------------------------------------
+
+    def start(self, project: str, task_id: str, timestamp: str = None, force: bool = False) -> Optional[int]:
+        return self.record(project, TaskEvent("start", task_id, timestamp), force=force)
+
+    def complete(self, project: str, task_id: str, hours: float = None, timestamp: str = None) -> Optional[int]:
+        return self.record(project, TaskEvent("complete", task_id, timestamp, hours))
+
+    def block(self, project: str, task_id: str, note: str = None, timestamp: str = None) -> Optional[int]:
+        return self.record(project, TaskEvent("block", task_id, timestamp, note=note))
+
+    def record(self, project: str, event: TaskEvent, force: bool = False) -> Optional[int]:
+        """
+        Append one event and update the materialized state in the same transaction
+
+        Returns:
+            The event's sequence number, or None if it did not change the task
+
+        Raises:
+            KeyError: Unknown project or task
+            ValueError: Unknown event kind, or starting a task with open dependencies
+        """
+        if event.kind not in EVENT_KINDS:
+            raise ValueError(f"unknown event kind {event.kind!r}")
+        task_id = event.task_id.replace("Task ", "").strip()
+        timestamp = event.timestamp or _now()
+        with self._write() as conn:
+            project_row = self._project(conn, project)
+            project_id = project_row["project_id"]
+            task = conn.execute("SELECT * FROM tasks WHERE project_id = ? AND task_id = ?",
+                                (project_id, task_id)).fetchone()
+            if task is None:
+                raise KeyError(f"unknown task {event.task_id!r}")
+            if event.kind == "start" and not force and task["dependencies"]:
+                deps = task["dependencies"].split()
+                open_deps = [row[0] for row in conn.execute(
+                    f"SELECT task_id FROM tasks WHERE project_id = ? AND task_id IN ({','.join('?' * len(deps))}) "
+                    "AND status != ? ORDER BY position", (project_id, *deps, COMPLETED))]
+                if open_deps:
+                    raise ValueError(f"Task {task_id} depends on unfinished "
+                                     + ", ".join(f"Task {dep}" for dep in open_deps))
+            old = TaskState(task["status"], task["started_at"], task["completed_at"],
+                            task["actual_hours"], task["blocker"])
+            new = transition(old, event.kind, timestamp, event.hours, event.note)
+            if new is None:
+                return None
+
+            seq = conn.execute(
+                "INSERT INTO events (project_id, task_id, kind, ts, hours, note) VALUES (?, ?, ?, ?, ?, ?)",
+                (project_id, task_id, event.kind, timestamp, event.hours, event.note)).lastrowid
+            conn.execute(
+                "UPDATE tasks SET status = ?, started_at = ?, completed_at = ?, actual_hours = ?, blocker = ?, "
+                "last_seq = ? WHERE project_id = ? AND task_id = ?", (*new, seq, project_id, task_id))
+
+            done = (new.status == COMPLETED) - (old.status == COMPLETED)
+            estimate = task["estimate_hours"] * done
+            actual = (new.actual_hours or 0.0) * (new.status == COMPLETED) \
+                - (old.actual_hours or 0.0) * (old.status == COMPLETED)
+            conn.execute(
+                "UPDATE phases SET completed = completed + ?, completed_estimate_hours = completed_estimate_hours + ?, "
+                "actual_hours = actual_hours + ? WHERE project_id = ? AND phase = ?",
+                (done, estimate, actual, project_id, task["phase"]))
+            conn.execute(
+                "UPDATE projects SET completed_tasks = completed_tasks + ?, "
+                "in_progress_tasks = in_progress_tasks + ?, blocked_tasks = blocked_tasks + ?, "
+                "completed_estimate_hours = completed_estimate_hours + ?, actual_hours = actual_hours + ?, "
+                "last_seq = ?, updated_at = ?, events_since_snapshot = events_since_snapshot + 1 "
+                "WHERE project_id = ?",
+                (done, (new.status == IN_PROGRESS) - (old.status == IN_PROGRESS),
+                 (new.status == BLOCKED) - (old.status == BLOCKED), estimate, actual, seq, timestamp, project_id))
+            if project_row["events_since_snapshot"] + 1 >= self.snapshot_interval:
+                self._snapshot(conn, project_id, seq, timestamp)
+        return seq
+
+    def record_many(self, project: str, events: Iterable[TaskEvent], force: bool = False) -> List[Optional[int]]:
+        return [self.record(project, event, force=force) for event in events]
+
+    # -- snapshots and replay -------------------------------------------------
+
+    def _snapshot(self, conn, project_id: int, seq: int, timestamp: str):
+        states = {row["task_id"]: [row["status"], row["started_at"], row["completed_at"],
+                                   row["actual_hours"], row["blocker"]]
+                  for row in conn.execute("SELECT * FROM tasks WHERE project_id = ?", (project_id,))}
+        blob = zlib.compress(json.dumps(states, separators=(",", ":")).encode("utf-8"))
+        conn.execute("INSERT OR REPLACE INTO snapshots (project_id, seq, created_at, state) VALUES (?, ?, ?, ?)",
+                     (project_id, seq, timestamp, blob))
+        conn.execute("UPDATE projects SET snapshot_seq = ?, events_since_snapshot = 0 WHERE project_id = ?",
+                     (seq, project_id))
+
+    def snapshot(self, project: str) -> int:
+        """Snapshot the current state now; returns the sequence number it covers"""
+        with self._write() as conn:
+            row = self._project(conn, project)
+            self._snapshot(conn, row["project_id"], row["last_seq"], _now())
+        return row["last_seq"]
+
+    def state_at(self, project: str, seq: int = None) -> Dict[str, TaskState]:
+        """Task states after event `seq` (default: latest): nearest snapshot plus the events after it"""
+        conn = self._connection()
+        row = self._project(conn, project)
+        project_id = row["project_id"]
+        seq = row["last_seq"] if seq is None else seq
+        snapshot = conn.execute(
+            "SELECT seq, state FROM snapshots WHERE project_id = ? AND seq <= ? ORDER BY seq DESC LIMIT 1",
+            (project_id, seq)).fetchone()
+        if snapshot is None:
+            raise ValueError(f"project {project!r} has no state at event {seq}")
+        states = {task_id: TaskState(*values)
+                  for task_id, values in json.loads(zlib.decompress(snapshot["state"])).items()}
+        for event in conn.execute(
+                "SELECT task_id, kind, ts, hours, note FROM events WHERE project_id = ? AND seq > ? AND seq <= ? "
+                "AND task_id IS NOT NULL ORDER BY seq", (project_id, snapshot["seq"], seq)):
+            new = transition(states[event["task_id"]], event["kind"], event["ts"], event["hours"], event["note"])
+            if new is not None:
+                states[event["task_id"]] = new
+        return states
+
+    def rebuild(self, project: str) -> dict:
+        """Recompute the materialized tables from snapshots + events; returns the repaired status"""
+        states = self.state_at(project)
+        with self._write() as conn:
+            project_id = self._project(conn, project)["project_id"]
+            conn.executemany(
+                "UPDATE tasks SET status = ?, started_at = ?, completed_at = ?, actual_hours = ?, blocker = ? "
+                "WHERE project_id = ? AND task_id = ?",
+                [(*state, project_id, task_id) for task_id, state in states.items()])
+            self._recount(conn, project_id)
+        return self.status(project)
+
+    def _recount(self, conn, project_id: int):
+        conn.execute(
+            "UPDATE phases SET (total, completed, estimate_hours, completed_estimate_hours, actual_hours) = ("
+            "SELECT count(*), sum(t.status = :done), total(t.estimate_hours), "
+            "total(CASE WHEN t.status = :done THEN t.estimate_hours END), "
+            "total(CASE WHEN t.status = :done THEN t.actual_hours END) "
+            "FROM tasks t WHERE t.project_id = phases.project_id AND t.phase = phases.phase) "
+            "WHERE project_id = :project", {"done": COMPLETED, "project": project_id})
+        conn.execute(
+            "UPDATE projects SET (total_tasks, completed_tasks, in_progress_tasks, blocked_tasks, estimate_hours, "
+            "completed_estimate_hours, actual_hours) = ("
+            "SELECT count(*), sum(status = :done), sum(status = :active), sum(status = :blocked), "
+            "total(estimate_hours), total(CASE WHEN status = :done THEN estimate_hours END), "
+            "total(CASE WHEN status = :done THEN actual_hours END) FROM tasks WHERE project_id = :project) "
+            "WHERE project_id = :project",
+            {"done": COMPLETED, "active": IN_PROGRESS, "blocked": BLOCKED, "project": project_id})
+
+    # -- queries --------------------------------------------------------------
+
+    def projects(self) -> List[dict]:
+        return [{"name": row["name"], "user_name": row["user_name"], "completed_tasks": row["completed_tasks"],
+                 "total_tasks": row["total_tasks"], "percent": percent(row["completed_tasks"], row["total_tasks"]),
+                 "updated_at": row["updated_at"]}
+                for row in self._connection().execute("SELECT * FROM projects ORDER BY name")]
+
+    def phase_progress(self, project: str) -> List[dict]:
+        conn = self._connection()
+        project_id = self._project(conn, project)["project_id"]
+        return [{"phase": row["phase"], "name": row["name"], "completed": row["completed"], "total": row["total"],
+                 "percent": percent(row["completed"], row["total"])}
+                for row in conn.execute("SELECT * FROM phases WHERE project_id = ? ORDER BY phase", (project_id,))]
+
+    def status(self, project: str) -> dict:
+        """Current totals and per-phase progress (same keys as TaskFileUpdater.status())"""
+        conn = self._connection()
+        row = self._project(conn, project)
+        return {
+            "completed_tasks": row["completed_tasks"],
+            "total_tasks": row["total_tasks"],
+            "percent": percent(row["completed_tasks"], row["total_tasks"]),
+            "in_progress_tasks": row["in_progress_tasks"],
+            "blocked_tasks": row["blocked_tasks"],
+            "time_spent_hours": round(row["actual_hours"], 4),
+            "remaining_estimate_hours": round(row["estimate_hours"] - row["completed_estimate_hours"], 4),
+            "phases": {phase["phase"]: (phase["completed"], phase["total"]) for phase in self.phase_progress(project)},
+            "next_up": self.next_up(project),
+            "last_event": row["last_seq"],
+            "updated_at": row["updated_at"],
+        }
+
+    def next_up(self, project: str, limit: int = 3) -> List[tuple]:
+        """The next unfinished tasks in plan order with a readiness label, like task.md's Next Up"""
+        conn = self._connection()
+        project_id = self._project(conn, project)["project_id"]
+        upcoming = []
+        for row in conn.execute(
+                # A literal, not a parameter: SQLite only picks the partial index tasks_open when it can
+                # see that the WHERE clause implies the index's
+                f"SELECT task_id, status, dependencies FROM tasks WHERE project_id = ? AND status != '{COMPLETED}' "
+                "ORDER BY position LIMIT ?", (project_id, limit)):
+            if row["status"] == IN_PROGRESS:
+                label = "In progress"
+            elif row["status"] == BLOCKED:
+                label = "Blocked"
+            else:
+                deps = row["dependencies"].split()
+                waiting = deps and conn.execute(
+                    f"SELECT 1 FROM tasks WHERE project_id = ? AND task_id IN ({','.join('?' * len(deps))}) "
+                    "AND status != ? LIMIT 1", (project_id, *deps, COMPLETED)).fetchone()
+                label = "Waiting" if waiting else "Ready to start"
+            upcoming.append((row["task_id"], label))
+        return upcoming
+
+    def progress_tracker(self, project: str) -> dict:
+        """Live counterpart of the progress_tracker dict returned by generate_portfolio_with_tasks()"""
+        conn = self._connection()
+        row = self._project(conn, project)
+        current = conn.execute("SELECT phase FROM phases WHERE project_id = ? AND completed < total "
+                               "ORDER BY phase LIMIT 1", (row["project_id"],)).fetchone()
+        return {
+            "total_tasks": row["total_tasks"],
+            "completed_tasks": row["completed_tasks"],
+            "current_phase": f"Phase {current['phase']}" if current else "Complete",
+            "estimated_hours": format_hours(row["estimate_hours"]),
+            "start_date": row["created_at"].split(" ")[0],
+            "estimated_hours_completed": round(row["completed_estimate_hours"], 4),
+            "actual_hours": round(row["actual_hours"], 4),
+        }
+
+    def estimate_report(self, project: str) -> dict:
+        """Estimated vs actual hours for completed work, per phase and per task"""
+        conn = self._connection()
+        row = self._project(conn, project)
+        project_id = row["project_id"]
+        phases = [{"phase": phase["phase"], "name": phase["name"], "completed": phase["completed"],
+                   "total": phase["total"], "estimate_hours": round(phase["completed_estimate_hours"], 4),
+                   "actual_hours": round(phase["actual_hours"], 4),
+                   "ratio": round(phase["actual_hours"] / phase["completed_estimate_hours"], 3)
+                   if phase["completed_estimate_hours"] else None}
+                  for phase in conn.execute("SELECT * FROM phases WHERE project_id = ? ORDER BY phase", (project_id,))]
+        tasks = [{"task_id": task["task_id"], "name": task["name"], "estimate_hours": task["estimate_hours"],
+                  "actual_hours": task["actual_hours"], "completed_at": task["completed_at"]}
+                 for task in conn.execute("SELECT * FROM tasks WHERE project_id = ? AND status = ? ORDER BY position",
+                                          (project_id, COMPLETED))]
+        estimate = row["completed_estimate_hours"]
+        return {
+            "completed_tasks": row["completed_tasks"],
+            "estimate_hours": round(estimate, 4),
+            "actual_hours": round(row["actual_hours"], 4),
+            "ratio": round(row["actual_hours"] / estimate, 3) if estimate else None,
+            "remaining_estimate_hours": round(row["estimate_hours"] - estimate, 4),
+            "phases": phases,
+            "tasks": tasks,
+        }
+
+    def blockers(self, project: str, limit: int = 50) -> dict:
+        """Currently blocked tasks and the most recent block events"""
+        conn = self._connection()
+        project_id = self._project(conn, project)["project_id"]
+        current = [{"task_id": row["task_id"], "name": row["name"], "note": row["blocker"],
+                    "since": conn.execute("SELECT ts FROM events WHERE project_id = ? AND task_id = ? "
+                                          "ORDER BY seq DESC LIMIT 1", (project_id, row["task_id"])).fetchone()[0]}
+                   for row in conn.execute("SELECT * FROM tasks WHERE project_id = ? AND status = ? ORDER BY position",
+                                           (project_id, BLOCKED))]
+        log = [dict(row) for row in conn.execute(
+            "SELECT seq, task_id, ts, note FROM events WHERE project_id = ? AND kind = 'block' "
+            "ORDER BY seq DESC LIMIT ?", (project_id, limit))]
+        return {"blocked": current, "log": log}
+
+    def history(self, project: str, task_id: str = None, limit: int = 50) -> List[dict]:
+        """Most recent events first, for the project or one task"""
+        conn = self._connection()
+        project_id = self._project(conn, project)["project_id"]
+        if task_id:
+            rows = conn.execute("SELECT * FROM events WHERE project_id = ? AND task_id = ? ORDER BY seq DESC LIMIT ?",
+                                (project_id, task_id.replace("Task ", "").strip(), limit))
+        else:
+            rows = conn.execute("SELECT * FROM events WHERE project_id = ? ORDER BY seq DESC LIMIT ?",
+                                (project_id, limit))
+        return [{key: row[key] for key in ("seq", "task_id", "kind", "ts", "hours", "note")} for row in rows]
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK; takes the write lock up front so concurrent writers queue"""
+
+    __slots__ = ("conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.conn.execute("ROLLBACK")
+            return
+        try:
+            self.conn.execute("COMMIT")
+        except sqlite3.Error:
+            # A failed COMMIT (SQLITE_BUSY, disk full) leaves the transaction open on this connection
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            raise
+
+
+def _print_status(project: str, status: dict):
+    print(f"{project}: {status['completed_tasks']}/{status['total_tasks']} tasks completed "
+          f"({status['percent']}%), {status['time_spent_hours']:g} hours spent, "
+          f"{status['in_progress_tasks']} in progress, {status['blocked_tasks']} blocked")
+    for number, (done, total) in status["phases"].items():
+        print(f"  Phase {number}: {done}/{total} ({percent(done, total)}%)")
+    for task_id, label in status["next_up"]:
+        print(f"  next: Task {task_id} - {label}")
+
+
+def _print_report(report: dict):
+    ratio = f" ({report['ratio']:g}x estimate)" if report["ratio"] is not None else ""
+    print(f"{report['completed_tasks']} tasks completed: {format_hours(report['actual_hours'])} actual vs "
+          f"{format_hours(report['estimate_hours'])} estimated{ratio}; "
+          f"{format_hours(report['remaining_estimate_hours'])} estimated remaining")
+    for phase in report["phases"]:
+        if phase["completed"]:
+            print(f"  Phase {phase['phase']}: {format_hours(phase['actual_hours'])} vs "
+                  f"{format_hours(phase['estimate_hours'])} ({phase['completed']}/{phase['total']} tasks)")
+    for task in report["tasks"]:
+        actual = format_hours(task["actual_hours"]) if task["actual_hours"] is not None else "untracked"
+        print(f"    Task {task['task_id']}: {actual} vs {format_hours(task['estimate_hours'])}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record and query task progress in the SQLite event store")
+    parser.add_argument("--db", default=DEFAULT_STORE, help="Store path (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    register = commands.add_parser("register", help="Add a project from a task.md")
+    register.add_argument("project")
+    register.add_argument("task_file")
+    register.add_argument("--user", default=None, help="Developer name")
+
+    for kind in EVENT_KINDS:
+        event = commands.add_parser(kind, help=f"Record a {kind} event")
+        event.add_argument("project")
+        event.add_argument("task_id")
+        event.add_argument("--at", default=None, help="Event timestamp (default: now)")
+        if kind == "start":
+            event.add_argument("--force", action="store_true", help="Start even with unfinished dependencies")
+        elif kind == "complete":
+            event.add_argument("--hours", type=float, default=None,
+                               help="Actual hours spent (default: time since start)")
+        else:
+            event.add_argument("--note", default=None, help="Blocker description")
+
+    for name, help_text in (("status", "Current progress"), ("report", "Estimated vs actual hours"),
+                            ("blockers", "Blocked tasks and block log"), ("snapshot", "Snapshot state now"),
+                            ("rebuild", "Recompute materialized state from events")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("project")
+        if name in ("status", "report", "blockers"):
+            command.add_argument("--json", action="store_true", help="Print JSON")
+    history = commands.add_parser("history", help="Recent events")
+    history.add_argument("project")
+    history.add_argument("task_id", nargs="?")
+    history.add_argument("--limit", type=int, default=20)
+    commands.add_parser("projects", help="List projects")
+    args = parser.parse_args(argv)
+
+    try:
+        with ProgressStore(args.db) as store:
+            if args.command == "register":
+                store.register_task_file(args.project, args.task_file, args.user)
+                _print_status(args.project, store.status(args.project))
+            elif args.command in EVENT_KINDS:
+                seq = store.record(args.project, TaskEvent(args.command, args.task_id, args.at,
+                                                           getattr(args, "hours", None), getattr(args, "note", None)),
+                                   force=getattr(args, "force", False))
+                print(f"event {seq}" if seq is not None else "no change", file=sys.stderr)
+            elif args.command == "status":
+                status = store.status(args.project)
+                if args.json:
+                    print(json.dumps(status))
+                else:
+                    _print_status(args.project, status)
+            elif args.command == "report":
+                report = store.estimate_report(args.project)
+                if args.json:
+                    print(json.dumps(report, indent=2))
+                else:
+                    _print_report(report)
+            elif args.command == "blockers":
+                blockers = store.blockers(args.project)
+                if args.json:
+                    print(json.dumps(blockers, indent=2))
+                else:
+                    for task in blockers["blocked"]:
+                        print(f"Task {task['task_id']} blocked since {task['since']}: {task['note'] or '-'}")
+            elif args.command == "history":
+                for event in store.history(args.project, args.task_id, args.limit):
+                    print(json.dumps(event))
+            elif args.command == "projects":
+                for project in store.projects():
+                    print(f"{project['name']}: {project['completed_tasks']}/{project['total_tasks']} "
+                          f"({project['percent']}%), updated {project['updated_at']}")
+            elif args.command == "snapshot":
+                print(f"snapshot at event {store.snapshot(args.project)}")
+            elif args.command == "rebuild":
+                _print_status(args.project, store.rebuild(args.project))
+    except (KeyError, ValueError, OSError, sqlite3.Error) as exc:
+        message = exc.args[0] if isinstance(exc, KeyError) and exc.args else exc
+        print(f"error: {message}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Prefix-Cache-Friendly Prompt Assembly
+=====================================
+
+Lays out LLM requests so that everything shared between users comes first and
+is byte-identical from request to request, letting provider-side prompt prefix
+caching serve it:
+
+    system  SYSTEM_PROMPT                         static      cache breakpoint
+    system  PRD sections for the user's focus     static*
+    system  output instructions                   static      cache breakpoint
+    user    resume, initial task.md (name/dates)  dynamic
+
+* The PRD selection depends only on (focus, token budget), so users with the
+  same focus share the whole static prefix; users with different focuses still
+  share the SYSTEM_PROMPT breakpoint.
+
+Nothing user-specific is ever placed before a breakpoint. Every segment is
+counted with the pluggable offline tokenizer (tokenizer.py), and each prompt
+reports static vs dynamic tokens and its expected cache-hit ratio.
+
+Usage:
+    assembler = PromptAssembler()
+    prompt = assembler.assemble(resume_text, generate_portfolio_with_tasks(resume_text, prd))
+    prompt.system_blocks(), prompt.user_content(), prompt.accounting()
+    assembler.cache_stats()
+"""
+
+import hashlib
+from typing import Dict, List, NamedTuple, Optional
+
+from instrumentation import count, enabled as metrics_enabled, span
+from tokenizer import count_tokens
+
+INSTRUCTIONS = (
+    "The user message contains the resume and the initial /tools/tasks/task.md generated "
+    "from it. Produce the customized implementation plan, then the complete task.md in the "
+    "same format, keeping task ids, checkboxes and the progress log structure intact."
+)
+
+# Providers ignore cache breakpoints on prefixes shorter than this many tokens
+MIN_CACHE_TOKENS = 1024
+MAX_BREAKPOINTS = 4
+
+
+class Segment(NamedTuple):
+    """One contiguous piece of a prompt"""
+    name: str
+    role: str          # "system" or "user"
+    text: str
+    static: bool
+    breakpoint: bool   # cache_control marker placed after this segment
+    tokens: int
+
+
+class AssembledPrompt:
+    """Ordered prompt segments plus their token accounting"""
+
+    __slots__ = ("segments", "prefix_hashes", "cached_tokens")
+
+    def __init__(self, segments: List[Segment], prefix_hashes: List[str], cached_tokens: Optional[int] = None):
+        self.segments = segments
+        self.prefix_hashes = prefix_hashes  # cumulative hash at each breakpoint, in order
+        self.cached_tokens = cached_tokens  # expected cache reads, if an assembler tracked history
+
+    @property
+    def static_tokens(self) -> int:
+        return sum(segment.tokens for segment in self.segments if segment.static)
+
+    @property
+    def dynamic_tokens(self) -> int:
+        return sum(segment.tokens for segment in self.segments if not segment.static)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.static_tokens + self.dynamic_tokens
+
+    @property
+    def prefix_hash(self) -> str:
+        """Hash of the full static prefix; equal hashes mean byte-identical prefixes"""
+        return self.prefix_hashes[-1] if self.prefix_hashes else ""
+
+    def system_blocks(self) -> List[dict]:
+        return self._blocks("system")
+
+    def user_content(self) -> List[dict]:
+        return self._blocks("user")
+
+    def _blocks(self, role: str) -> List[dict]:
+        blocks = []
+        for segment in self.segments:
+            if segment.role != role:
+                continue
+            block = {"type": "text", "text": segment.text}
+            if segment.breakpoint:
+                block["cache_control"] = {"type": "ephemeral"}
+            blocks.append(block)
+        return blocks
+
+    def payload(self, model: str, max_tokens: int, stream: bool = True) -> dict:
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": self.system_blocks(),
+            "messages": [{"role": "user", "content": self.user_content()}],
+            "stream": stream,
+        }
+
+    def accounting(self) -> dict:
+        total = self.total_tokens
+        cacheable = sum(segment.tokens for segment in self._cacheable())
+        accounting = {
+            "segments": {segment.name: segment.tokens for segment in self.segments},
+            "static_tokens": self.static_tokens,
+            "dynamic_tokens": self.dynamic_tokens,
+            "cacheable_tokens": cacheable,
+            "cacheable_ratio": round(cacheable / total, 4) if total else 0.0,
+            "prefix_hash": self.prefix_hash[:16],
+        }
+        if self.cached_tokens is not None:
+            accounting["expected_cached_tokens"] = self.cached_tokens
+            accounting["expected_cache_hit_ratio"] = round(self.cached_tokens / total, 4) if total else 0.0
+        return accounting
+
+    def _cacheable(self) -> List[Segment]:
+        """Segments up to and including the last breakpoint"""
+        last = max((i for i, segment in enumerate(self.segments) if segment.breakpoint), default=-1)
+        return self.segments[:last + 1]
+
+
+class PromptAssembler:
+    """
+    Builds AssembledPrompts and tracks which cached prefixes have been sent
+
+    Args:
+        system_prompt: Static prompt text (default: system_prompt.SYSTEM_PROMPT)
+        tokenizer: Tokenizer name for tokenizer.count_tokens (default tokenizer if None)
+        min_cache_tokens: Shortest prefix worth a cache breakpoint
+    """
+
+    def __init__(self, system_prompt: str = None, tokenizer: str = None,
+                 min_cache_tokens: int = MIN_CACHE_TOKENS):
+        if system_prompt is None:
+            from system_prompt import SYSTEM_PROMPT as system_prompt
+        self.system_prompt = system_prompt
+        self.tokenizer = tokenizer
+        self.min_cache_tokens = min_cache_tokens
+        self._static: Dict[str, List[Segment]] = {}   # PRD text hash -> static segments
+        self._seen: Dict[str, int] = {}               # breakpoint prefix hash -> cached tokens
+        self.requests = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self.tokenizer)
+
+    def _static_segments(self, prd_text: str) -> List[Segment]:
+        """Static segments for one PRD selection, built once so their bytes never drift"""
+        key = hashlib.sha256(prd_text.encode("utf-8")).hexdigest()
+        segments = self._static.get(key)
+        if segments is not None:
+            return segments
+        parts = [("system_prompt", self.system_prompt.strip(), True)]
+        if prd_text.strip():
+            parts.append(("prd", f"<prd>\n{prd_text.strip()}\n</prd>", False))
+        parts.append(("instructions", INSTRUCTIONS, True))
+
+        segments, cumulative, breakpoints = [], 0, 0
+        for name, text, wants_breakpoint in parts:
+            tokens = self._count(text)
+            cumulative += tokens
+            breakpoint = (wants_breakpoint and cumulative >= self.min_cache_tokens
+                          and breakpoints < MAX_BREAKPOINTS)
+            breakpoints += breakpoint
+            segments.append(Segment(name, "system", text, True, breakpoint, tokens))
+        self._static[key] = segments
+        return segments
+
+    def assemble(self, resume_content: str, result: dict) -> AssembledPrompt:
+        """
+        Lay out one request
+
+        Args:
+            resume_content: The user's resume text
+            result: Output of generate_portfolio_with_tasks() for that resume
+        """
+        with span("prompt.assemble"):
+            prd_context = result.get("prd_context") or {}
+            segments = list(self._static_segments(prd_context.get("text", "")))
+            for name, text in (("resume", f"<resume>\n{resume_content.strip()}\n</resume>"),
+                               ("task_file", f"<task_file>\n{result['task_file_content'].strip()}\n</task_file>")):
+                segments.append(Segment(name, "user", text, False, False, self._count(text)))
+
+            digest = hashlib.sha256()
+            prefix_hashes, boundaries, cumulative = [], [], 0
+            for segment in segments:
+                digest.update(segment.role.encode() + b"\0" + segment.text.encode("utf-8") + b"\0")
+                cumulative += segment.tokens
+                if segment.breakpoint:
+                    prefix_hashes.append(digest.hexdigest())
+                    boundaries.append(cumulative)
+
+        # Expect a cache read of the longest prefix already sent (within the provider's TTL)
+        cached = 0
+        for prefix, tokens in zip(prefix_hashes, boundaries):
+            if prefix in self._seen:
+                cached = tokens
+            else:
+                self._seen[prefix] = tokens
+        prompt = AssembledPrompt(segments, prefix_hashes, cached)
+        self.requests += 1
+        self.input_tokens += prompt.total_tokens
+        self.cached_tokens += cached
+        if metrics_enabled():
+            count("prompt_tokens", prompt.static_tokens, kind="static")
+            count("prompt_tokens", prompt.dynamic_tokens, kind="dynamic")
+            count("prompt_tokens", cached, kind="expected_cached")
+        return prompt
+
+    def cache_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "expected_cached_tokens": self.cached_tokens,
+            "expected_cache_hit_ratio": round(self.cached_tokens / self.input_tokens, 4)
+            if self.input_tokens else 0.0,
+            "distinct_prefixes": len(self._seen),
+        }
+
+
+def assemble_prompt(resume_content: str, result: dict, tokenizer: str = None) -> AssembledPrompt:
+    """One-off assembly without cross-request cache tracking"""
+    prompt = PromptAssembler(result.get("implementation_plan"), tokenizer).assemble(resume_content, result)
+    prompt.cached_tokens = None
+    return prompt
@@ -0,0 +1,315 @@
+"""
+Result Cache for Generated Plans
+================================
+
+Content-addressed cache for generate_portfolio_with_tasks() results. Keys are a
+hash of the normalized inputs (resume, PRD, user name, selection options), the
+default tokenizer and a version covering SYSTEM_PROMPT and the source of the
+modules that build a result (task template, task graph, PRD selection,
+tokenizer), so editing any of them retires old entries while whitespace-only
+edits to a resume still hit.
+
+Two tiers:
+- Memory: LRU bounded by entry count and by total serialized bytes
+- Disk (optional): one JSON file per entry under <cache_dir>/<prompt_version>/,
+  surviving restarts; directories for other prompt versions are purged on open
+
+Usage:
+    cache = ResultCache(max_entries=512, max_bytes=64 * 1024 * 1024, cache_dir=".cache/plans")
+    result = generate_portfolio_with_tasks(resume, prd, "Jane", cache=cache)
+    cache.stats()
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from instrumentation import count
+from tokenizer import default_tokenizer_name
+
+# Bump when the shape of cached results changes
+CACHE_FORMAT = 1
+# Modules whose code shapes a cached result; their source is part of the prompt version
+GENERATOR_MODULES = ("system_prompt", "task_model", "task_graph", "prd_index", "tokenizer", "resume_ingest")
+
+_BLANK_RUNS_RE = re.compile(r"\n{3,}")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_generator_hash = None
+
+
+def generator_hash() -> str:
+    """Hash of the GENERATOR_MODULES sources (read once per process)"""
+    global _generator_hash
+    if _generator_hash is None:
+        digest = hashlib.sha256()
+        for name in GENERATOR_MODULES:
+            digest.update(Path(__file__).with_name(f"{name}.py").read_bytes())
+        _generator_hash = digest.hexdigest()
+    return _generator_hash
+
+
+def prompt_version(system_prompt: str, generator: str = None) -> str:
+    """Short, stable identifier for a prompt template, the code generating results and the cache format"""
+    generator = generator_hash() if generator is None else generator
+    return f"v{CACHE_FORMAT}-{_sha256(system_prompt + chr(0) + generator)[:16]}"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize line endings, trailing whitespace and blank-line runs"""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_RUNS_RE.sub("\n\n", text).strip()
+
+
+def normalize_name(name: Optional[str]) -> str:
+    return _SPACES_RE.sub(" ", name).strip() if name else ""
+
+
+class CacheKey:
+    """Hash of one generation request plus the version stamps used for invalidation"""
+
+    __slots__ = ("digest", "prompt_version", "prd_hash")
+
+    def __init__(self, digest: str, prompt_version: str, prd_hash: str):
+        self.digest = digest
+        self.prompt_version = prompt_version
+        self.prd_hash = prd_hash
+
+
+class ResultCache:
+    """
+    Two-tier LRU cache for generated plans and task files
+
+    Args:
+        system_prompt: Prompt template the cached results were generated with
+        max_entries: Maximum entries held in memory
+        max_bytes: Maximum total serialized size held in memory
+        cache_dir: Optional directory for the persistent tier
+    """
+
+    def __init__(self, system_prompt: str = None, max_entries: int = 256,
+                 max_bytes: int = 32 * 1024 * 1024, cache_dir=None):
+        if system_prompt is None:
+            from system_prompt import SYSTEM_PROMPT as system_prompt
+        self.prompt_version = prompt_version(system_prompt)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries = OrderedDict()  # digest -> (value, size, prd_hash)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._prd_hashes = {}  # id(prd_content) -> (prd_content, hash), avoids rehashing the PRD
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if self.cache_dir is not None:
+            self._open_disk_tier()
+
+    # -- keys -------------------------------------------------------------
+
+    def _prd_hash(self, prd_content: str) -> str:
+        known = self._prd_hashes.get(id(prd_content))
+        if known is not None and known[0] is prd_content:
+            return known[1]
+        digest = _sha256(normalize_text(prd_content))
+        if len(self._prd_hashes) > 64:
+            self._prd_hashes.clear()
+        self._prd_hashes[id(prd_content)] = (prd_content, digest)
+        return digest
+
+    def make_key(self, resume_content: str, prd_content: str, user_name: str = None,
+                 **options) -> CacheKey:
+        """
+        Build the cache key for a generation request
+
+        Args:
+            resume_content: User's resume text
+            prd_content: PRD markdown
+            user_name: Optional user name
+            **options: Any other arguments that change the result (focus, token_budget, ...)
+        """
+        prd_hash = self._prd_hash(prd_content or "")
+        payload = json.dumps([
+            self.prompt_version,
+            default_tokenizer_name(),  # prd_context token counts
+            prd_hash,
+            _sha256(normalize_text(resume_content)),
+            normalize_name(user_name),
+            sorted((k, v) for k, v in options.items() if v is not None),
+        ], separators=(",", ":"))
+        return CacheKey(_sha256(payload), self.prompt_version, prd_hash)
+
+    # -- lookups ----------------------------------------------------------
+
+    def get(self, key: CacheKey) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key.digest)
+            if entry is not None:
+                self._entries.move_to_end(key.digest)
+                self.hits += 1
+                count("cache_hits", cache="result")
+                return copy.deepcopy(entry[0])
+        # Each tier reports its own hit rate: a disk hit is still a memory miss
+        count("cache_misses", cache="result")
+
+        value = self._disk_read(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                if self.cache_dir is not None:
+                    count("cache_misses", cache="result_disk")
+                return None
+            self.disk_hits += 1
+            count("cache_hits", cache="result_disk")
+            self._store(key, value, len(json.dumps(value)))
+        return copy.deepcopy(value)
+
+    def put(self, key: CacheKey, value: dict):
+        serialized = json.dumps(value)
+        with self._lock:
+            self._store(key, copy.deepcopy(value), len(serialized))
+        self._disk_write(key, serialized)
+
+    def _store(self, key: CacheKey, value: dict, size: int):
+        old = self._entries.pop(key.digest, None)
+        if old is not None:
+            self._bytes -= old[1]
+        if size > self.max_bytes:
+            return  # would evict everything else; keep it on disk only
+        self._entries[key.digest] = (value, size, key.prd_hash)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get_or_compute(self, key: CacheKey, compute) -> dict:
+        """Return the cached value for key, calling compute() and caching it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    # -- invalidation -----------------------------------------------------
+
+    def invalidate_prd(self, prd_content: str = None, keep: str = None) -> int:
+        """
+        Drop entries generated from a PRD
+
+        Args:
+            prd_content: Drop entries for this PRD version
+            keep: Alternatively, drop every entry whose PRD is not this content
+
+        Returns:
+            Number of entries removed from both tiers
+        """
+        if (prd_content is None) == (keep is None):
+            raise ValueError("pass exactly one of prd_content or keep")
+        drop_hash = self._prd_hash(prd_content) if prd_content is not None else None
+        keep_hash = self._prd_hash(keep) if keep is not None else None
+
+        def stale(prd_hash):
+            return prd_hash == drop_hash if drop_hash else prd_hash != keep_hash
+
+        removed = 0
+        with self._lock:
+            for digest in [d for d, entry in self._entries.items() if stale(entry[2])]:
+                self._bytes -= self._entries.pop(digest)[1]
+                removed += 1
+        if self.cache_dir is not None:
+            for prd_dir in self._version_dir.iterdir():
+                if prd_dir.is_dir() and stale(prd_dir.name):
+                    removed += sum(1 for _ in prd_dir.glob("*.json"))
+                    shutil.rmtree(prd_dir, ignore_errors=True)
+        self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.cache_dir is not None:
+            shutil.rmtree(self._version_dir, ignore_errors=True)
+            self._version_dir.mkdir(parents=True, exist_ok=True)
+
+    # -- disk tier --------------------------------------------------------
+
+    @property
+    def _version_dir(self) -> Path:
+        return self.cache_dir / self.prompt_version
+
+    def _open_disk_tier(self):
+        self._version_dir.mkdir(parents=True, exist_ok=True)
+        # A new prompt template invalidates everything generated with the old one
+        for child in self.cache_dir.iterdir():
+            if child.is_dir() and child.name != self.prompt_version:
+                self.invalidations += sum(1 for _ in child.rglob("*.json"))
+                shutil.rmtree(child, ignore_errors=True)
+
+    def _entry_path(self, key: CacheKey) -> Path:
+        return self._version_dir / key.prd_hash / f"{key.digest}.json"
+
+    def _disk_read(self, key: CacheKey) -> Optional[dict]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_write(self, key: CacheKey, serialized: str):
+        if self.cache_dir is None:
+            return
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(serialized)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    # -- reporting --------------------------------------------------------
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "prompt_version": self.prompt_version,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,687 @@
+"""
+Resume Ingestion
+================
+
+Turns resume files (PDF, plain text/markdown, JSON) into text and structured
+fields for generate_portfolio_with_tasks(), without loading large inputs whole:
+
+- Text and JSON files are memory-mapped and read page by page (form-feed or
+  ~64 KB text pages, one JSON member or array element at a time)
+- PDFs are read a page at a time with pypdf (optional, only needed for PDF
+  resumes); two-column layouts are unfolded into reading order
+- Extracted page text is cached on disk by file hash (opt-in via cache_dir)
+- Fields (name, title, email, links, skills, experience entries, projects) are
+  yielded as soon as they are parsed, so memory stays flat on huge inputs
+
+Usage:
+    for field in iter_fields("public/Mantej-Singh CV.pdf"):
+        print(field.kind, field.value)
+    text = read_resume("resume.pdf", cache_dir="~/.cache/portfolio-resumes")
+    extract_name(text)
+
+    python tools/resume_ingest.py "public/Mantej-Singh CV.pdf"            # fields as JSONL
+    python tools/resume_ingest.py resume.json --text --cache-dir .cache/resumes
+"""
+
+import argparse
+import codecs
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from instrumentation import count, span
+
+EXTRACTOR_VERSION = 2
+TEXT_PAGE_BYTES = 1 << 16
+MAX_BULLETS = 50        # per experience / project entry
+MAX_DISTINCT = 2000     # skills / links remembered for de-duplication
+MIN_COLUMN_CHARS = 20   # narrowest text column a PDF page is split into
+MIN_COLUMN_LINES = 5    # lines with text on both sides needed to call it a two-column page
+GUTTER_TOLERANCE = 0.15  # share of lines allowed to run through the gutter
+
+
+class ResumeField(NamedTuple):
+    """One structured value found in a resume"""
+    kind: str           # name, title, email, link, skill, experience, project
+    value: object       # str, or dict for experience / project entries
+    page: int
+
+
+# -- file access ------------------------------------------------------------
+
+@contextmanager
+def _mapped(path):
+    """Read-only memory map of a file (empty files map to b"")"""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with _mapped(path) as data:
+        view = memoryview(data)
+        for start in range(0, len(view), 1 << 20):
+            digest.update(view[start:start + (1 << 20)])
+        view.release()
+    return digest.hexdigest()
+
+
+def _kind(path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".pdf":
+        return "pdf"
+    if suffix == ".json":
+        return "json"
+    return "text"
+
+
+# -- text pages -------------------------------------------------------------
+
+def iter_text_pages(path) -> Iterator[str]:
+    """Form-feed separated pages, or ~64 KB slices cut at line boundaries"""
+    with _mapped(path) as data:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        position, size = 0, len(data)
+        while position < size:
+            end = data.find(b"\f", position, position + TEXT_PAGE_BYTES)
+            if end >= 0:
+                chunk, position = data[position:end], end + 1
+            else:
+                end = min(size, position + TEXT_PAGE_BYTES)
+                if end < size:
+                    newline = data.rfind(b"\n", position, end)
+                    end = newline + 1 if newline > position else end
+                chunk, position = data[position:end], end
+            yield decoder.decode(chunk, final=position >= size)
+
+
+# -- PDF --------------------------------------------------------------------
+
+def _pypdf():
+    try:
+        import pypdf
+    except ImportError:
+        raise ImportError("reading PDF resumes requires pypdf (pip install pypdf)") from None
+    return pypdf
+
+
+def _gutter(lines: List[str]) -> Optional[int]:
+    """
+    Character column of the gap between two text columns in a layout-mode page
+
+    A gutter is blank on nearly every line that has text to its right; the
+    column splitting the most lines wins (the rightmost on ties, so text
+    right-aligned in the left column stays there), provided it splits enough.
+    """
+    width = max((len(line) for line in lines), default=0)
+    best, best_split = None, 0
+    for column in range(MIN_COLUMN_CHARS, width - MIN_COLUMN_CHARS):
+        split = blocked = 0
+        for line in lines:
+            if len(line) <= column + 1 or not line[column + 1:].strip():
+                continue
+            if line[column:column + 2] == "  " and line[:column].strip():
+                split += 1
+            elif line[column:column + 2].strip():
+                blocked += 1
+        if split >= best_split and blocked <= split * GUTTER_TOLERANCE:
+            best, best_split = column, split
+    return best if best_split >= MIN_COLUMN_LINES else None
+
+
+def _reading_order(text: str) -> str:
+    """Layout-mode page text with a two-column layout unfolded into left, then right"""
+    lines = [line.replace("\t", " ").rstrip() for line in text.splitlines()]
+    column = _gutter(lines)
+    if column is None:
+        return "\n".join(lines)
+    left, right = [], []
+    for line in lines:
+        if line[column:column + 2].strip():
+            left.append(line)  # text runs through the gutter: keep the line whole
+        else:
+            left.append(line[:column].rstrip())
+            right.append(line[column:].strip())
+    return "\n".join(left + right)
+
+
+def iter_pdf_pages(path) -> Iterator[str]:
+    """Text of each PDF page in reading order, two-column layouts unfolded"""
+    pypdf = _pypdf()
+    with open(path, "rb") as handle:
+        for page in pypdf.PdfReader(handle).pages:
+            yield _reading_order(page.extract_text(extraction_mode="layout") or "")
+
+
+# -- JSON -------------------------------------------------------------------
+
+class _JSONStream:
+    """Decodes one JSON value at a time from a byte buffer, growing the window as needed"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def skip_ws(self):
+        while self.pos < len(self.data) and self.data[self.pos] in b" \t\r\n":
+            self.pos += 1
+
+    def peek(self) -> bytes:
+        self.skip_ws()
+        return self.data[self.pos:self.pos + 1]
+
+    def expect(self, token: bytes):
+        if self.peek() != token:
+            raise ValueError(f"expected {token.decode()!r} at byte {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.skip_ws()
+        window = 4096
+        while True:
+            text = codecs.getincrementaldecoder("utf-8")().decode(self.data[self.pos:self.pos + window])
+            try:
+                value, end = self._decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                if self.pos + window >= len(self.data):
+                    raise
+                window *= 4
+                continue
+            self.pos += len(text[:end].encode("utf-8"))
+            return value
+
+
+def iter_json_members(data) -> Iterator[Tuple[str, object, bool]]:
+    """
+    (key, value, is_element) for a top-level JSON object
+
+    Array-valued members are yielded one element at a time (is_element=True),
+    so only a single element is ever decoded in memory.
+    """
+    stream = _JSONStream(data)
+    stream.expect(b"{")
+    while stream.peek() not in (b"}", b""):
+        key = stream.value()
+        stream.expect(b":")
+        if stream.peek() == b"[":
+            stream.pos += 1
+            while stream.peek() not in (b"]", b""):
+                yield key, stream.value(), True
+                if stream.peek() == b",":
+                    stream.pos += 1
+            stream.pos += 1
+        else:
+            yield key, stream.value(), False
+        if stream.peek() == b",":
+            stream.pos += 1
+
+
+def _json_fields(key: str, value, is_element: bool) -> Iterator[ResumeField]:
+    """Fields from JSON Resume (basics/work/skills/projects) or data_emitter-shaped input"""
+    if key in ("basics", "personal") and isinstance(value, dict):
+        if value.get("name"):
+            yield ResumeField("name", value["name"], 1)
+        if value.get("label") or value.get("title"):
+            yield ResumeField("title", value.get("label") or value.get("title"), 1)
+        if value.get("email"):
+            yield ResumeField("email", value["email"], 1)
+        for url in [value.get("url")] + [p.get("url") for p in value.get("profiles", []) if isinstance(p, dict)]:
+            if url:
+                yield ResumeField("link", url, 1)
+    elif key in ("work", "experience", "experiences") and isinstance(value, dict):
+        period = value.get("period") or " - ".join(
+            part for part in (value.get("startDate"), value.get("endDate") or "Present") if part)
+        yield ResumeField("experience", {
+            "company": value.get("company") or value.get("name"),
+            "role": value.get("role") or value.get("position"),
+            "period": period,
+            "bullets": (value.get("highlights") or value.get("description") or [])[:MAX_BULLETS],
+        }, 1)
+    elif key == "skills":
+        if isinstance(value, str):
+            yield ResumeField("skill", value, 1)
+        elif isinstance(value, dict):
+            for item in value.get("keywords") or value.get("skills") or [value.get("name")]:
+                name = item.get("name") if isinstance(item, dict) else item
+                if name:
+                    yield ResumeField("skill", name, 1)
+    elif key == "projects" and isinstance(value, dict):
+        yield ResumeField("project", {
+            "name": value.get("name") or value.get("title"),
+            "url": value.get("url") or value.get("githubUrl") or value.get("liveUrl"),
+        }, 1)
+    elif key in ("socialLinks", "profiles") and isinstance(value, dict) and value.get("url"):
+        yield ResumeField("link", value["url"], 1)
+
+
+def _json_scalar(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(_json_scalar(item) for item in value)
+    if isinstance(value, dict):
+        return " ".join(str(v) for v in value.values() if not isinstance(v, (dict, list)))
+    return str(value)
+
+
+def _json_text(key: str, value, is_element: bool) -> str:
+    """Readable text for one JSON member, so JSON resumes can feed the text pipeline"""
+    if isinstance(value, dict):
+        lines = []
+        if key == "basics" and value.get("name"):
+            # Resume-style header so the text parser finds the name on the first line
+            lines.append(str(value["name"]))
+        lines += [f"{k}: {_json_scalar(v)}" for k, v in value.items()
+                  if not isinstance(v, dict) and not (lines and k == "name")]
+        return "\n".join(lines)
+    return f"{key}: {_json_scalar(value)}"
+
+
+def iter_json_pages(path) -> Iterator[str]:
+    """One text page per top-level member (or array element)"""
+    with _mapped(path) as data:
+        for key, value, is_element in iter_json_members(data):
+            yield _json_text(key, value, is_element)
+
+
+# -- structured fields from text ---------------------------------------------
+
+SECTION_HEADINGS = {
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies", "tech stack",
+               "skills & tools", "tools", "skills & competences", "skills and competences",
+               "programming", "programming languages"),
+    "projects": ("projects", "selected projects", "personal projects", "side projects", "portfolio"),
+    "other": ("summary", "profile", "about", "about me", "education", "certifications", "awards",
+              "publications", "languages", "interests", "references", "volunteering", "contact"),
+}
+_SECTION_BY_TITLE = {title: section for section, titles in SECTION_HEADINGS.items() for title in titles}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s<>()\"']+|\b(?:github\.com|linkedin\.com)/[^\s<>()\"']+"
+                     r"|\b[\w-]+\.github\.io\b[^\s<>()\"']*")
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d\d|\d{{1,2}}/(?:19|20)\d\d"
+_PERIOD_RE = re.compile(rf"\(?\s*({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|present|current|now)\s*\)?", re.I)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•▪◦●‣–]|\d+[.)])\s+")
+# Two to four capitalized words
+_NAME_RE = re.compile(r"^[A-Z][\w'’.-]*(?:\s+[A-Z][\w'’.-]*){1,3}$")
+_ROLE_WORDS = re.compile(r"\b(engineer|developer|scientist|analyst|manager|designer|architect|consultant|"
+                         r"specialist|lead|intern|researcher|student|director|administrator|programmer)\b", re.I)
+# "Warren, NJ" / "Mumbai, India": a location line or cell, not a skill or a bullet
+_LOCATION_RE = re.compile(r"^[A-Z][\w.'’ -]*,\s*[A-Z][\w.'’ -]*$")
+_US_STATE_RE = re.compile(r",\s*(?:A[KLRZ]|C[AOT]|D[CE]|FL|GA|HI|I[ADLN]|K[SY]|LA|M[ADEINOST]|N[CDEHJMVY]|O[HKR]|PA|"
+                          r"RI|S[CD]|T[NX]|UT|V[AT]|W[AIVY])$")
+MAX_HELD = 8            # undecided lines kept while waiting to see if an entry heading follows
+
+
+def _find_period(text: str):
+    if "19" not in text and "20" not in text:
+        return None
+    return _PERIOD_RE.search(text)
+
+
+def _section_for(line: str) -> Optional[str]:
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    return _SECTION_BY_TITLE.get(re.sub(r"\s+", " ", stripped.lower()))
+
+
+def _clean_heading(text: str) -> str:
+    return re.sub(r"\s*[|,–—-]\s*$", "", re.sub(r"^\s*[|,–—-]\s*", "", text)).strip()
+
+
+def _looks_like_company(text: str) -> bool:
+    """A short capitalized line without sentence punctuation ("Alpha IT Partners", not a wrapped bullet)"""
+    return (len(text.split()) <= 5 and text[:1].isupper() and not _ROLE_WORDS.search(text)
+            and not re.search(r"[,;:.!?]$|,\s", text))
+
+
+class FieldParser:
+    """
+    Line-by-line resume field extraction
+
+    feed() returns the fields completed by that line; finish() flushes the entry
+    still open at the end. State is bounded: one open entry plus capped
+    de-duplication sets.
+    """
+
+    def __init__(self):
+        self.section: Optional[str] = None
+        self.name: Optional[str] = None
+        self.title: Optional[str] = None
+        self.entry: Optional[dict] = None
+        self.entry_kind: Optional[str] = None
+        self.entry_page = 1
+        self.previous = ""
+        self.held: List[str] = []
+        self.seen = set()
+
+    def _once(self, kind: str, value: str, page: int) -> List[ResumeField]:
+        key = (kind, value.lower())
+        if key in self.seen:
+            return []
+        if len(self.seen) < MAX_DISTINCT:
+            self.seen.add(key)
+        return [ResumeField(kind, value, page)]
+
+    def _close(self) -> List[ResumeField]:
+        if self.entry is None:
+            return []
+        self._release_held()
+        field = ResumeField(self.entry_kind, self.entry, self.entry_page)
+        self.entry = self.entry_kind = None
+        return [field]
+
+    def feed(self, line: str, page: int = 1) -> List[ResumeField]:
+        fields: List[ResumeField] = []
+        text = line.strip()
+        if not text:
+            return fields
+        section = _section_for(text)
+        if section:
+            fields += self._close()
+            self.section = section
+            self.previous = ""
+            return fields
+
+        # Cheap substring checks first: most lines hold neither emails, URLs nor dates
+        if "@" in text:
+            for email in _EMAIL_RE.findall(text):
+                fields += self._once("email", email, page)
+        urls = []
+        if "www." in text or "://" in text or "github" in text or "linkedin" in text:
+            urls = [url.rstrip(".,;") for url in _URL_RE.findall(text) if "@" not in url]
+        for url in urls:
+            fields += self._once("link", url, page)
+
+        if self.section is None:
+            fields += self._header_line(text, urls, page)
+        elif self.section == "skills":
+            if _LOCATION_RE.match(text) and _US_STATE_RE.search(text):
+                self.previous = text
+                return fields  # "Warren, NJ" from an address column laid out beside the skills
+            body = text.split(":", 1)[1] if ":" in text and len(text.split(":", 1)[0]) < 30 else text
+            # Separators, or runs of spaces between the cells of a laid-out skills table
+            for item in re.split(r"[,|•·;▪/]|\s{2,}", _BULLET_RE.sub("", body)):
+                item = item.strip(" .")
+                if 1 < len(item) <= 40:
+                    fields += self._once("skill", item, page)
+        elif self.section == "experience":
+            fields += self._experience_line(text, page)
+        elif self.section == "projects":
+            fields += self._project_line(text, urls, page)
+        self.previous = text
+        return fields
+
+    def _header_line(self, text: str, urls: List[str], page: int) -> List[ResumeField]:
+        if self.name is None:
+            candidate = re.split(r"\s+[-|–—]\s+|\s*[|,]\s*", text)[0].strip()  # "Jane Doe, PhD"
+            if _NAME_RE.match(candidate) and not _ROLE_WORDS.search(candidate):
+                self.name = candidate
+                return [ResumeField("name", candidate, page)]
+        elif self.title is None and not urls and "@" not in text and _ROLE_WORDS.search(text):
+            self.title = text
+            return [ResumeField("title", text, page)]
+        return []
+
+    def _experience_line(self, text: str, page: int) -> List[ResumeField]:
+        fields = []
+        period = _find_period(text)
+        if period:
+            # Capitalized lines held since the last bullet end in this entry's heading:
+            # "Company" / "Role" lines above the period, or "Company   Role" on one line
+            had_held = bool(self.held)
+            company, role, heading_lines = self._entry_heading()
+            self._release_held()
+            fields += self._close()
+            rest = _clean_heading(text[:period.start()] + " " + text[period.end():])
+            location = None
+            if rest and heading_lines and _LOCATION_RE.match(rest):
+                location, rest = rest, ""
+            if not had_held and not rest and self.previous and not _BULLET_RE.match(self.previous) \
+                    and not _find_period(self.previous):
+                rest = self.previous
+            self.entry = {"heading": " — ".join(heading_lines + [rest] if rest else heading_lines),
+                          "period": period.group(0).strip("() "), "bullets": []}
+            for key, value in (("company", company), ("role", role), ("location", location)):
+                if value:
+                    self.entry[key] = value
+            self.entry_kind, self.entry_page = "experience", page
+        elif _BULLET_RE.match(text):
+            self._release_held()
+            if self.entry is not None:
+                self._add_bullet(_BULLET_RE.sub("", text))
+        elif text[:1].islower():
+            self._release_held()
+            if self.entry is not None:
+                bullets = self.entry["bullets"]
+                if bullets:
+                    bullets[-1] += " " + text  # wrapped bullet
+                else:
+                    self._add_bullet(text)
+        elif self.entry is None or self.entry["bullets"] or "role" in self.entry:
+            # Either one more bullet or the start of the next entry's heading; the next period decides
+            self.held.append(text)
+            if len(self.held) > MAX_HELD:
+                overflow = self.held.pop(0)
+                if self.entry is not None:
+                    self._add_bullet(overflow)
+        elif _ROLE_WORDS.search(text):
+            self.entry["role"] = text
+        else:
+            self._add_bullet(text)  # body line without a bullet marker
+        return fields
+
+    def _entry_heading(self):
+        """(company, role, heading lines) taken off the end of the held lines"""
+        held = self.held
+        if not held:
+            return None, None, []
+        company = role = None
+        taken = 0
+        if _ROLE_WORDS.search(held[-1]):
+            role = held[-1]
+            taken = 1
+            cells = re.split(r"\s{2,}|:\s+", role, maxsplit=1)
+            if len(held) > 1 and _looks_like_company(held[-2]):
+                company = held[-2]
+                taken = 2
+            elif len(cells) == 2 and not _ROLE_WORDS.search(cells[0]):
+                company, role = cells[0].strip(" :"), cells[1].strip()
+        elif _looks_like_company(held[-1]):
+            company = held[-1]
+            taken = 1
+        if not taken:
+            return None, None, []
+        lines = [re.sub(r"\s+", " ", line) for line in held[-taken:]]
+        del held[-taken:]
+        return company, role and re.sub(r"\s+", " ", role), lines
+
+    def _release_held(self):
+        """The held lines turned out to be body text of the open entry"""
+        if self.entry is not None:
+            for text in self.held:
+                self._add_bullet(text)
+        self.held = []
+
+    def _add_bullet(self, text: str):
+        if len(self.entry["bullets"]) < MAX_BULLETS:
+            self.entry["bullets"].append(text)
+
+    def _project_line(self, text: str, urls: List[str], page: int) -> List[ResumeField]:
+        if self.entry is not None and (_BULLET_RE.match(text) or (
+                self.entry.get("period") and not urls and not _find_period(text))):
+            # Marked bullet, or an undated line under a dated project heading
+            bullets = self.entry["bullets"]
+            if not _BULLET_RE.match(text) and bullets and text[:1].islower():
+                bullets[-1] += " " + text  # wrapped line
+            else:
+                self._add_bullet(_BULLET_RE.sub("", text))
+            if urls and not self.entry["url"]:
+                self.entry["url"] = urls[0]
+            return []
+        fields = self._close()
+        period = _find_period(text)
+        if period:
+            text = text[:period.start()] + " " + text[period.end():]
+        name = _clean_heading(_URL_RE.sub("", text)) or (urls[0] if urls else text)
+        self.entry = {"name": name, "url": urls[0] if urls else None, "bullets": []}
+        if period:
+            self.entry["period"] = period.group(0).strip("() ")
+        self.entry_kind, self.entry_page = "project", page
+        return fields
+
+    def finish(self) -> List[ResumeField]:
+        return self._close()
+
+
+def parse_fields(pages: Iterable[str]) -> Iterator[ResumeField]:
+    """Stream fields out of page texts"""
+    parser = FieldParser()
+    for number, page in enumerate(pages, 1):
+        for line in page.splitlines():
+            yield from parser.feed(line, number)
+    yield from parser.finish()
+
+
+def extract_name(resume_content: str, max_lines: int = 40) -> Optional[str]:
+    """Best-effort name from the top of a resume, or None"""
+    parser = FieldParser()
+    start = 0
+    # Walk line by line; splitlines() would copy the whole resume to read its first lines
+    for _ in range(max_lines):
+        if parser.section is not None or start > len(resume_content):
+            break
+        end = resume_content.find("\n", start)
+        if end < 0:
+            end = len(resume_content)
+        for field in parser.feed(resume_content[start:end].rstrip("\r")):
+            if field.kind == "name":
+                return field.value
+        start = end + 1
+    return None
+
+
+# -- cached page extraction ---------------------------------------------------
+
+def _cache_path(cache_dir, digest: str, kind: str) -> Path:
+    return Path(cache_dir).expanduser() / f"{digest}.v{EXTRACTOR_VERSION}-{kind}.pages.jsonl"
+
+
+def iter_pages(path, cache_dir=None) -> Iterator[str]:
+    """
+    Page texts for a resume file
+
+    With cache_dir, page texts are stored as JSONL under the file's sha256, so
+    re-reading the same file (under any name) skips extraction. The cache file
+    is written while streaming and only published once the last page is done.
+    """
+    kind = _kind(path)
+    extract = {"pdf": iter_pdf_pages, "json": iter_json_pages, "text": iter_text_pages}[kind]
+    if cache_dir is None:
+        yield from extract(path)
+        return
+
+    cached = _cache_path(cache_dir, file_hash(path), kind)
+    if cached.exists():
+        count("cache_hits", cache="resume_pages")
+        with open(cached, encoding="utf-8") as handle:
+            for line in handle:
+                yield json.loads(line)
+        return
+
+    count("cache_misses", cache="resume_pages")
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cached.parent, prefix=".pages.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            for page in extract(path):
+                handle.write(json.dumps(page, ensure_ascii=False) + "\n")
+                yield page
+        os.replace(tmp_path, cached)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def iter_fields(path, cache_dir=None) -> Iterator[ResumeField]:
+    """Structured fields from a resume file, yielded as they are parsed"""
+    if _kind(path) == "json":
+        with _mapped(path) as data:
+            for key, value, is_element in iter_json_members(data):
+                yield from _json_fields(key, value, is_element)
+        return
+    yield from parse_fields(iter_pages(path, cache_dir))
+
+
+def read_resume(path, cache_dir=None, max_chars: int = None) -> str:
+    """Resume text for generate_portfolio_with_tasks(), optionally truncated to max_chars"""
+    pages, size = [], 0
+    with span("resume.extract", kind=_kind(path)):
+        for page in iter_pages(path, cache_dir):
+            if max_chars is not None and size + len(page) > max_chars:
+                pages.append(page[:max_chars - size])
+                break
+            pages.append(page)
+            size += len(page) + 2
+    count("resume_pages", len(pages))
+    return "\n\n".join(pages)
+
+
+def collect_fields(fields: Iterable[ResumeField]) -> dict:
+    """Fold a field stream into one summary dict"""
+    summary = {"name": None, "title": None, "emails": [], "links": [], "skills": [],
+               "experience": [], "projects": []}
+    plural = {"email": "emails", "link": "links", "skill": "skills"}
+    for field in fields:
+        if field.kind in ("name", "title"):
+            summary[field.kind] = summary[field.kind] or field.value
+        elif field.kind in plural:
+            summary[plural[field.kind]].append(field.value)
+        elif field.kind == "experience":
+            summary["experience"].append(field.value)
+        elif field.kind == "project":
+            summary["projects"].append(field.value)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Extract text and fields from a resume file")
+    parser.add_argument("resume", help="PDF, text/markdown or JSON resume")
+    parser.add_argument("--text", action="store_true", help="Print extracted text instead of fields")
+    parser.add_argument("--summary", action="store_true", help="Print one JSON summary instead of JSONL")
+    parser.add_argument("--cache-dir", default=None, help="Cache extracted pages here, keyed by file hash")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.text:
+            for page in iter_pages(args.resume, args.cache_dir):
+                print(page)
+            return 0
+        fields = iter_fields(args.resume, args.cache_dir)
+        if args.summary:
+            print(json.dumps(collect_fields(fields), indent=2, ensure_ascii=False))
+            return 0
+        for field in fields:
+            print(json.dumps(field._asdict(), ensure_ascii=False), flush=True)
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
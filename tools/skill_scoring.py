@@ -0,0 +1,503 @@
+"""
+Skill Proficiency Scoring
+=========================
+
+Deterministic replacement for eyeballing the "Skills Assessment &
+Visualization" bands in the prompt. A resume becomes a skill x evidence
+matrix:
+
+- evidence items are experience entries (with their date ranges), project
+  technology lists (resume projects and src/data/projects.ts) and the resume's
+  skills section
+- a cell is 1 when the skill (or one of its aliases) appears in that item
+
+and every skill is scored at once with NumPy:
+
+    frequency = 1 - exp(-(M @ source_weight) / FREQUENCY_SCALE)
+    duration  = min(M @ years / DURATION_CAP, 1)        (years capped at the career span)
+    recency   = max over items of M * 0.5 ** (years_since_item / RECENCY_HALF_LIFE)
+    level     = 50 + 50 * (0.35 * frequency + 0.40 * duration + 0.25 * recency)
+
+Levels land in the prompt's bands: primary 90-100, secondary 70-89,
+learning 50-69. Output uses the SkillCategory shape of
+src/components/sections/SkillsVisualization.tsx (icon as a lucide-react name).
+
+The catalog (skills, aliases, categories) is compiled once into a SkillIndex
+and shared across resumes, so batch scoring costs one small matrix product per
+resume. Skills listed on a resume but missing from the catalog are added on the
+fly and categorized by keyword, inside a per-resume scope that is rolled back
+once that resume is scored: a result never depends on which resumes were
+scored before it, and the shared index does not grow over a batch.
+
+NumPy is required (pip install numpy); it is imported when scoring starts.
+
+Usage:
+    python tools/skill_scoring.py resume.pdf --projects src/data/projects.ts
+    python tools/skill_scoring.py resume.txt --bands --now 2025
+
+    index = SkillIndex()
+    for result in score_many(["a.pdf", "b.txt"], index=index):
+        result["categories"]
+"""
+
+import argparse
+import datetime
+import json
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# id, title, lucide icon, description, {skill: aliases}; mirrors SkillsVisualization.tsx
+CATEGORIES = (
+    ("ai-ml", "AI & Machine Learning", "Brain",
+     "Advanced AI systems, prompt engineering, and ML model development", {
+         "Python": (), "Machine Learning": ("ml",), "AWS Bedrock": ("bedrock",),
+         "Prompt Engineering": ("prompting", "prompt design"), "AI Red Teaming": ("red teaming", "red team"),
+         "LLM Security": ("llm safety", "ai safety"), "Deep Learning": (), "PyTorch": ("torch",),
+         "TensorFlow": ("keras",), "scikit-learn": ("sklearn", "scikit learn"),
+         "Natural Language Processing": ("nlp",), "Computer Vision": ("opencv",), "LLMs": ("llm", "large language models"),
+         "LangChain": (), "RAG": ("retrieval augmented generation",), "Hugging Face": ("huggingface", "transformers"),
+         "Speech Recognition": ("speech to text",), "OpenAI API": ("openai", "gpt"),
+     }),
+    ("data-engineering", "Data Engineering", "Database",
+     "ETL pipelines, data visualization, and large-scale data processing", {
+         "SQL": ("mysql", "postgresql", "postgres", "t-sql", "sql server"), "Pandas": (), "NumPy": ("numpy",),
+         "Jupyter Notebooks": ("jupyter", "jupyter notebook", "jupyter lab"), "Apache Spark": ("spark", "pyspark"),
+         "Data Visualization": ("visualization", "dashboards"), "ETL Pipelines": ("etl", "elt", "data pipelines"),
+         "Airflow": ("apache airflow",), "Kafka": ("apache kafka",), "Snowflake": (), "Databricks": (),
+         "Tableau": (), "Power BI": ("powerbi",), "Hadoop": ("hive",), "Data Science": ("analytics",),
+         "MongoDB": ("mongo",), "Redis": (),
+     }),
+    ("cloud-devops", "Cloud & DevOps", "Cloud",
+     "Cloud infrastructure, automation, and deployment strategies", {
+         "Git/GitHub": ("git", "github"), "AWS": ("amazon web services", "ec2", "s3", "lambda", "boto3"),
+         "Automation Scripts": ("automation", "scripting"), "PowerShell": ("powershell",),
+         "CI/CD": ("ci cd", "continuous integration", "continuous delivery"), "Docker": ("containers",),
+         "Kubernetes": ("k8s", "eks", "aks"), "Terraform": (), "CloudFormation": ("cloud formation",),
+         "Azure": ("microsoft azure",), "GCP": ("google cloud", "google cloud platform"), "Linux": ("bash",),
+         "DevOps": (), "GitHub Actions": ("github actions",), "Jenkins": (),
+     }),
+    ("programming", "Programming Languages", "Code2",
+     "Versatile programming across multiple languages and frameworks", {
+         "Python": (), "C#/.NET": ("c#", ".net", "csharp", "dotnet", "asp.net"), "HTML/CSS": ("html", "css", "tailwind"),
+         "JavaScript/TypeScript": ("javascript", "typescript", "js", "ts", "node.js", "nodejs"),
+         "PowerShell": ("powershell",), "React": ("react.js", "reactjs"), "Java": (), "Go": ("golang",),
+         "Rust": (), "C++": ("cpp",), "R": (), "Scala": (), "Kotlin": (), "Swift": (), "FastAPI": (),
+         "Flask": (), "Django": (),
+     }),
+    ("security", "Security & Testing", "Shield",
+     "AI security, vulnerability assessment, and testing frameworks", {
+         "Security Analysis": ("security",), "Cryptography": ("encryption", "steganography"),
+         "AI Red Teaming": ("red teaming", "red team"), "Prompt Injection Testing": ("prompt injection", "jailbreaks"),
+         "Vulnerability Scanning": ("vulnerability", "vulnerabilities", "vulnerability assessment"),
+         "Penetration Testing": ("pentesting", "pentest", "penetration"), "Testing": ("unit testing", "pytest", "qa"),
+     }),
+    ("tools", "Tools & Platforms", "Zap",
+     "Development tools, platforms, and productivity software", {
+         "Vscode": ("vs code", "visual studio code"), "Jupyter Lab/Notebook": ("jupyter", "jupyter lab"),
+         "Windows 11 Admin": ("windows", "windows 11"), "Plotly/D3.js": ("plotly", "d3", "d3.js"),
+         "PromptFoo": ("promptfoo",), "GitHub Actions": ("github actions",), "Jira": (), "Excel": (),
+         "Postman": (), "Figma": (),
+     }),
+)
+FALLBACK_CATEGORY = "tools"
+
+# Keywords for skills found on a resume but not in the catalog
+CATEGORY_HINTS = {
+    "ai-ml": ("ai", "ml", "llm", "model", "learning", "neural", "nlp", "vision", "prompt", "gpt", "agent"),
+    "data-engineering": ("data", "sql", "etl", "spark", "analytics", "warehouse", "bi", "db", "database"),
+    "cloud-devops": ("aws", "azure", "gcp", "cloud", "docker", "kubernetes", "ci", "cd", "devops", "deploy",
+                     "infrastructure", "terraform", "serverless"),
+    "programming": ("lang", "programming", "framework", "api", "web", "frontend", "backend"),
+    "security": ("security", "crypt", "pentest", "vulnerab", "threat", "auth", "compliance"),
+}
+
+BANDS = (("primary", 90, 100), ("secondary", 70, 89), ("learning", 50, 69))
+SOURCE_WEIGHTS = {"experience": 2.0, "project": 1.5, "skills": 1.0}
+WEIGHTS = (0.35, 0.40, 0.25)   # frequency, duration, recency
+FREQUENCY_SCALE = 4.0          # weighted mentions for ~63% of the frequency score
+DURATION_CAP = 5.0             # years of use for the full duration score
+RECENCY_HALF_LIFE = 3.0        # years
+UNDATED_RECENCY = 0.5          # projects / skills lists without dates
+PER_CATEGORY = 6               # SkillsVisualization shows six bars per card
+
+# Aliases that are also common words; they only count when listed explicitly
+# (skills sections, project technologies), never when found in prose
+TERM_ONLY = frozenset(("go", "r", "rust", "swift", "excel", "ts", "js", "security", "automation",
+                       "testing", "windows", "visualization", "analytics", "containers", "scripting"))
+
+_TOKEN_RE = re.compile(r"\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+_MONTHS = {month: number for number, month in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+_DATE_RE = re.compile(r"(?:([a-z]{3})[a-z]*\.?\s+)?((?:19|20)\d\d)|(\d{1,2})/((?:19|20)\d\d)|"
+                      r"((?:19|20)\d\d)-(\d\d)|\b(present|current|now)\b", re.I)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("skill scoring requires numpy (pip install numpy)") from None
+    return numpy
+
+
+def normalize(text: str) -> str:
+    """Lowercased word tokens joined by single spaces ("CI/CD" -> "ci cd", "Node.js" stays "node.js")"""
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+class Evidence(NamedTuple):
+    """One item a skill can be mentioned in"""
+    source: str                      # experience, project, skills
+    text: str                        # free text matched against aliases
+    terms: Tuple[str, ...] = ()      # explicit skill names (technologies, skills list)
+    start: Optional[float] = None    # fractional years
+    end: Optional[float] = None
+
+
+class SkillIndex:
+    """
+    Compiled skill catalog: names, alias lookup and category membership
+
+    Args:
+        categories: Catalog in the CATEGORIES layout (default: CATEGORIES)
+        learn: Add unknown explicit terms (skills lists, technologies) as new skills
+            for the duration of the enclosing scoped() block
+    """
+
+    __slots__ = ("categories", "names", "skill_categories", "aliases", "max_words", "learn",
+                 "_membership", "_scopes")
+
+    def __init__(self, categories=CATEGORIES, learn: bool = True):
+        self.categories = [(cid, title, icon, description) for cid, title, icon, description, _ in categories]
+        self.names: List[str] = []
+        self.skill_categories: List[set] = []
+        self.aliases: Dict[str, int] = {}
+        self.max_words = 1
+        self.learn = learn
+        self._membership = None
+        self._scopes: List[tuple] = []
+        for position, (_, _, _, _, skills) in enumerate(categories):
+            for name, aliases in skills.items():
+                self.add(name, position, aliases)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, category: int = None, aliases: Sequence[str] = ()) -> int:
+        """Index of a skill, registering it (and its aliases) if new"""
+        key = normalize(name)
+        index = self.aliases.get(key)
+        if index is None:
+            index = len(self.names)
+            self.names.append(name)
+            self.skill_categories.append(set())
+        if category is None and not self.skill_categories[index]:
+            category = self._guess_category(key)
+        if category is not None and category not in self.skill_categories[index]:
+            self.skill_categories[index].add(category)
+            if self._membership is not None and index < self._membership.shape[1]:
+                self._membership = None
+        for alias in (key, *map(normalize, aliases)):
+            if alias and alias not in self.aliases:
+                self.aliases[alias] = index
+                if self._scopes:
+                    self._scopes[-1][1].append(alias)
+                self.max_words = max(self.max_words, alias.count(" ") + 1)
+        return index
+
+    @contextmanager
+    def scoped(self):
+        """Skills added inside the block (learned terms) are dropped again when it exits"""
+        self._scopes.append((len(self.names), [], self.max_words))
+        try:
+            yield self
+        finally:
+            size, aliases, max_words = self._scopes.pop()
+            for alias in aliases:
+                del self.aliases[alias]
+            del self.names[size:], self.skill_categories[size:]
+            self.max_words = max_words
+            if self._membership is not None and self._membership.shape[1] > size:
+                self._membership = self._membership[:, :size]
+
+    def _guess_category(self, key: str) -> int:
+        words = key.split()
+        for position, (cid, _, _, _) in enumerate(self.categories):
+            hints = CATEGORY_HINTS.get(cid, ())
+            if any(word.startswith(hint) for word in words for hint in hints):
+                return position
+        return next((position for position, category in enumerate(self.categories)
+                     if category[0] == FALLBACK_CATEGORY), 0)
+
+    def lookup(self, term: str) -> Optional[int]:
+        """Skill for an explicit term, learning it when allowed"""
+        key = normalize(term)
+        if not key:
+            return None
+        index = self.aliases.get(key)
+        if index is None and self.learn and len(key) <= 40:
+            index = self.add(term.strip())
+        return index
+
+    def matches(self, text: str) -> set:
+        """Skills mentioned in free text (longest alias n-grams, case-insensitive)"""
+        tokens = normalize(text).split()
+        found = set()
+        aliases, max_words = self.aliases, self.max_words
+        for start in range(len(tokens)):
+            for size in range(min(max_words, len(tokens) - start), 0, -1):
+                key = " ".join(tokens[start:start + size])
+                index = aliases.get(key)
+                if index is not None and key not in TERM_ONLY:
+                    found.add(index)
+                    break
+        return found
+
+    def membership(self):
+        """Boolean (categories x skills) matrix; only columns of newly added skills are built"""
+        cached, size = self._membership, len(self.names)
+        if cached is None or cached.shape[1] < size:
+            np = _numpy()
+            start = 0 if cached is None else cached.shape[1]
+            extra = np.zeros((len(self.categories), size - start), dtype=bool)
+            for index in range(start, size):
+                extra[list(self.skill_categories[index]), index - start] = True
+            self._membership = extra if cached is None else np.hstack((cached, extra))
+        return self._membership
+
+
+# -- evidence ----------------------------------------------------------------
+
+def _date(match, now: float, end: bool) -> Optional[float]:
+    month_name, year, month_num, slash_year, iso_year, iso_month, present = match.groups()
+    if present:
+        return now
+    if year:
+        month = _MONTHS.get((month_name or "").lower()[:3])
+        value = int(year)
+    elif slash_year:
+        month, value = int(month_num), int(slash_year)
+    else:
+        month, value = int(iso_month), int(iso_year)
+    if month is None:
+        return value + (1.0 if end else 0.0)
+    return value + (month - (0 if end else 1)) / 12
+
+
+def period_years(period: str, now: float) -> Tuple[Optional[float], Optional[float]]:
+    """("Jan 2020 - Present", 2025.5) -> (2020.0, 2025.5); (None, None) when undated"""
+    dates = list(_DATE_RE.finditer(period or ""))
+    if not dates:
+        return None, None
+    start = _date(dates[0], now, end=False)
+    end = _date(dates[-1], now, end=True) if len(dates) > 1 else start + 1.0
+    return min(start, end), min(max(start, end), now)
+
+
+def evidence_from_fields(fields: Iterable, now: float) -> Iterator[Evidence]:
+    """Evidence items from resume_ingest fields"""
+    skills = []
+    for field in fields:
+        if field.kind == "skill":
+            skills.append(field.value)
+        elif field.kind == "experience":
+            entry = field.value
+            start, end = period_years(entry.get("period", ""), now)
+            text = " ".join(str(part) for part in (entry.get("heading"), entry.get("company"),
+                                                   entry.get("role"), *entry.get("bullets", [])) if part)
+            yield Evidence("experience", text, (), start, end)
+        elif field.kind == "project":
+            entry = field.value
+            text = " ".join(str(part) for part in (entry.get("name"), *entry.get("bullets", [])) if part)
+            yield Evidence("project", text, tuple(entry.get("technologies", ())))
+    if skills:
+        yield Evidence("skills", "", tuple(skills))
+
+
+def evidence_from_projects(projects: Iterable[dict]) -> Iterator[Evidence]:
+    """Evidence items from portfolio projects ({"title", "description", "technologies"})"""
+    for project in projects:
+        text = " ".join(str(project.get(key) or "") for key in ("title", "description", "longDescription"))
+        yield Evidence("project", text, tuple(project.get("technologies") or ()))
+
+
+_TS_PROJECT_RE = re.compile(r"\btitle:\s*([\"'`])(.*?)\1.*?\btechnologies:\s*\[(.*?)\]", re.S)
+_TS_STRING_RE = re.compile(r"([\"'`])((?:\\.|(?!\1).)*)\1")
+
+
+def load_projects(path) -> List[dict]:
+    """Projects from src/data/projects.ts or a data_emitter-style JSON file"""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        data = json.loads(text)
+        return data.get("projects", []) if isinstance(data, dict) else data
+    return [{"title": match.group(2),
+             "technologies": [item.group(2) for item in _TS_STRING_RE.finditer(match.group(3))]}
+            for match in _TS_PROJECT_RE.finditer(text)]
+
+
+# -- scoring -----------------------------------------------------------------
+
+class SkillScores(NamedTuple):
+    """Per-skill results for one resume (arrays aligned with `skills`)"""
+    skills: object      # int array: SkillIndex positions with any evidence
+    levels: object      # int array: 50..100
+    years: object       # float array: estimated years of use
+    evidence: int
+
+
+def evidence_matrix(index: SkillIndex, evidence: Sequence[Evidence]):
+    """(skills with evidence, boolean skill x evidence matrix)"""
+    np = _numpy()
+    # Explicit terms first, so skills learned from the skills list also match earlier prose
+    explicit = [{skill for skill in map(index.lookup, item.terms) if skill is not None}
+                for item in evidence]
+    rows, cols = [], []
+    for column, item in enumerate(evidence):
+        found = index.matches(item.text) if item.text else set()
+        found |= explicit[column]
+        rows.extend(found)
+        cols.extend([column] * len(found))
+    skills, local_rows = np.unique(np.asarray(rows, dtype=np.int64), return_inverse=True)
+    matrix = np.zeros((len(skills), len(evidence)), dtype=bool)
+    matrix[local_rows, np.asarray(cols, dtype=np.int64)] = True
+    return skills, matrix
+
+
+def score(index: SkillIndex, evidence: Sequence[Evidence], now: float = None) -> SkillScores:
+    """Score every skill mentioned in the evidence"""
+    np = _numpy()
+    now = _now() if now is None else now
+    skills, matrix = evidence_matrix(index, evidence)
+    if not len(skills):
+        return SkillScores(skills, np.zeros(0, dtype=np.int64), np.zeros(0), len(evidence))
+
+    source_weight = np.array([SOURCE_WEIGHTS.get(item.source, 1.0) for item in evidence])
+    start = np.array([np.nan if item.start is None else item.start for item in evidence])
+    end = np.array([np.nan if item.end is None else item.end for item in evidence])
+    dated = ~np.isnan(end)
+    years_per_item = np.where(dated, np.nan_to_num(end - start), 0.0)
+    recency_per_item = np.where(dated, 0.5 ** (np.maximum(now - np.nan_to_num(end), 0) / RECENCY_HALF_LIFE),
+                                UNDATED_RECENCY)
+    span = (np.nanmax(end) - np.nanmin(start)) if dated.any() else 0.0
+
+    weights = matrix.astype(np.float64)
+    frequency = 1.0 - np.exp(-(weights @ source_weight) / FREQUENCY_SCALE)
+    years = np.minimum(weights @ years_per_item, span)
+    duration = np.minimum(years / DURATION_CAP, 1.0)
+    recency = (weights * recency_per_item).max(axis=1)
+    raw = WEIGHTS[0] * frequency + WEIGHTS[1] * duration + WEIGHTS[2] * recency
+    levels = np.clip(np.rint(50 + 50 * raw), 50, 100).astype(np.int64)
+    return SkillScores(skills, levels, years, len(evidence))
+
+
+def band(level: int) -> str:
+    for name, low, high in BANDS:
+        if low <= level <= high:
+            return name
+    return BANDS[-1][0]
+
+
+def experience_label(years: float) -> str:
+    """SkillsVisualization wording: "3+ years", "1+ years", "<1 year" """
+    return f"{int(years)}+ years" if years >= 1 else "<1 year"
+
+
+def categorize(index: SkillIndex, scores: SkillScores, per_category: int = PER_CATEGORY) -> dict:
+    """SkillCategory-shaped output plus band membership"""
+    np = _numpy()
+    membership = index.membership()[:, scores.skills]
+    # Highest level first, then most years, then catalog order
+    order = np.lexsort((scores.skills, -scores.years, -scores.levels))
+    categories = []
+    for position, (cid, title, icon, description) in enumerate(index.categories):
+        ranked = order[membership[position, order]][:per_category]
+        if not len(ranked):
+            continue
+        categories.append({
+            "id": cid, "title": title, "icon": icon, "description": description,
+            "skills": [{"name": index.names[scores.skills[i]], "level": int(scores.levels[i]),
+                        "experience": experience_label(float(scores.years[i]))} for i in ranked],
+        })
+    bands = {name: [] for name, _, _ in BANDS}
+    for i in order:
+        bands[band(int(scores.levels[i]))].append(index.names[scores.skills[i]])
+    return {"categories": categories, "bands": bands,
+            "scored_skills": int(len(scores.skills)), "evidence": scores.evidence}
+
+
+def _now() -> float:
+    today = datetime.date.today()
+    return today.year + (today.month - 1) / 12
+
+
+def score_resume(resume, projects: Iterable[dict] = (), index: SkillIndex = None, now: float = None,
+                 per_category: int = PER_CATEGORY, cache_dir=None) -> dict:
+    """
+    Score one resume
+
+    Args:
+        resume: Path to a resume file (see resume_ingest), or resume text
+        projects: Portfolio projects with "technologies" lists (see load_projects)
+        index: Shared SkillIndex (a fresh default catalog if None)
+        now: Reference date in fractional years (default: today)
+    """
+    from resume_ingest import FieldParser, iter_fields
+
+    index = index or SkillIndex()
+    now = _now() if now is None else now
+    if isinstance(resume, Path) or (isinstance(resume, str) and "\n" not in resume and Path(resume).is_file()):
+        fields = iter_fields(resume, cache_dir)
+    else:
+        fields = _text_fields(resume, FieldParser())
+    evidence = list(evidence_from_fields(fields, now)) + list(evidence_from_projects(projects))
+    with index.scoped():
+        return categorize(index, score(index, evidence, now), per_category)
+
+
+def _text_fields(text: str, parser) -> Iterator:
+    for line in text.splitlines():
+        yield from parser.feed(line)
+    yield from parser.finish()
+
+
+def score_many(resumes: Iterable, projects: Iterable[dict] = (), index: SkillIndex = None,
+               now: float = None, per_category: int = PER_CATEGORY) -> Iterator[dict]:
+    """Score resumes one after another against one shared SkillIndex"""
+    index = index or SkillIndex()
+    projects = list(projects)
+    now = _now() if now is None else now
+    for resume in resumes:
+        yield score_resume(resume, projects, index, now, per_category)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score skill proficiency from a resume for SkillsVisualization")
+    parser.add_argument("resume", nargs="+", help="Resume file(s): PDF, text/markdown or JSON")
+    parser.add_argument("--projects", default=None,
+                        help="Portfolio projects with technologies (src/data/projects.ts or JSON)")
+    parser.add_argument("--now", type=float, default=None, help="Reference year (default: today)")
+    parser.add_argument("--per-category", type=int, default=PER_CATEGORY, help="Skills per category card")
+    parser.add_argument("--bands", action="store_true", help="Print band membership only")
+    args = parser.parse_args(argv)
+
+    try:
+        projects = load_projects(args.projects) if args.projects else []
+        for path, result in zip(args.resume, score_many(args.resume, projects, now=args.now,
+                                                         per_category=args.per_category)):
+            output = result["bands"] if args.bands else result
+            if len(args.resume) > 1:
+                output = {"resume": path, **output}
+            print(json.dumps(output, indent=None if len(args.resume) > 1 else 2, ensure_ascii=False))
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
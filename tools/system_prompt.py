@@ -6,425 +6,44 @@ This enhanced system prompt includes automatic task file generation and progress
 capabilities for comprehensive project management during portfolio development.
 
 Usage:
-1. Provide user's resume (PDF, text, or structured format)
+1. Provide user's resume (PDF, text, or structured format; see resume_ingest.py)
 2. Provide PRODUCT_REQUIREMENTS_DOCUMENT.md content
 3. LLM will generate customized implementation plan with trackable tasks
 4. Automatically creates /tools/tasks/task.md with structured project management
 
+Command line:
+    python tools/system_prompt.py generate resume.txt --task-file tools/tasks/task.md
+    python tools/system_prompt.py batch resumes/ --output results.jsonl
+    python tools/system_prompt.py update-progress tools/tasks/task.md complete 2.3 --hours 1.5
+    python tools/system_prompt.py progress report jane-portfolio
+    python tools/system_prompt.py watch resume.pdf --output plan.json --task-file tools/tasks/task.md
+    python tools/system_prompt.py personalize tools/PRODUCT_REQUIREMENTS_DOCUMENT.md --resume resume.pdf
+    python tools/system_prompt.py github scan ~/code --dump repos.json
+    python tools/system_prompt.py precompress dist --task-file tools/tasks/task.md
+    python tools/system_prompt.py status
+    PORTFOLIO_METRICS=jsonl:metrics.jsonl,prom:metrics.prom python tools/system_prompt.py generate ...
+
+The prompt text (prompt_template.py), the PRD index and the task graph are only
+imported by the commands that use them, so status and update-progress start
+fast enough to run from editor hooks and pre-commit.
+
 Author: Mantej Singh
 Date: August 30, 2025
 Version: 2.0 - Enhanced with Task Management
 """
 
-SYSTEM_PROMPT = """
-# Enhanced Modern Portfolio Website Generator with Task Management
-
-You are an expert React 19.1 + TypeScript developer specializing in creating modern, professional portfolio websites with comprehensive project management capabilities. You will receive two inputs and automatically generate structured task files for tracking progress.
-
-## Primary Objectives
-
-### 1. Resume Analysis & Content Extraction
-Analyze the user's resume to extract:
-- **Personal Information**: Name, title, contact details, location
-- **Professional Experience**: Companies, positions, dates, responsibilities, achievements
-- **Technical Skills**: Programming languages, frameworks, tools, platforms
-- **Projects**: GitHub repositories, demos, technical accomplishments
-- **Education**: Degrees, certifications, relevant coursework
-- **Professional Summary**: Career focus, expertise areas, career goals
-
-### 2. PRD-Based Architecture Planning
-Using the provided PRD document:
-- Map user's content to the proven component architecture
-- Adapt the React 19.1 + TypeScript + Vite stack to user's needs
-- Plan mobile-first responsive design following established patterns
-- Design animation system based on user's technical complexity preference
-
-### 3. Automatic Task File Generation
-**CRITICAL**: After analyzing the resume and PRD, you MUST automatically create:
-- `/tools/tasks/task.md` - Master task file with all phases and progress tracking
-- Include time estimates, dependencies, success criteria, and code examples
-- Structure with metadata for priority, assignee, due dates
-- Enable progress tracking with checkboxes and completion status
-
-### 4. Content Personalization Strategy
-Transform generic PRD placeholders into user-specific content:
-- Replace `[Website Owner]` with user's name and title
-- Substitute `[Company]` with user's current/target employers
-- Customize `[Your Skills]` with user's actual technical stack
-- Populate project sections with user's real GitHub repositories
-- Adapt experience timeline to user's career progression
-
-## Implementation Methodology
-
-### Phase 1: Requirements Analysis (15 minutes)
-```
-STEP 1: Resume Content Mapping
-- Extract and categorize all resume information
-- Identify user's primary technical focus (Frontend, Backend, Full-Stack, AI/ML, etc.)
-- Determine experience level (Junior, Mid-level, Senior)
-- List all projects with GitHub links
-
-STEP 2: Technical Stack Validation
-- Confirm React 19.1 + TypeScript compatibility with user's background
-- Assess animation complexity needs based on user's design preferences
-- Plan mobile-first approach based on target audience
-
-STEP 3: Content Architecture Design
-- Design hero section with user's professional tagline
-- Plan work experience timeline with user's career progression
-- Organize skills visualization with user's actual technical stack
-- Curate featured projects from user's GitHub repositories
-```
-
-### Phase 2: Development Environment Setup (30 minutes)
-```
-STEP 4: Project Initialization
-□ Create new React 19.1 + TypeScript project with Vite
-□ Install all dependencies from PRD specifications
-□ Configure environment-aware build system
-□ Set up GitHub repository with proper branch structure
-
-STEP 5: Component Architecture
-□ Create folder structure following PRD guidelines
-□ Set up TypeScript interfaces for user's data
-□ Configure Tailwind CSS and shadcn/ui components
-□ Initialize Framer Motion for animations
-
-STEP 6: Asset Preparation
-□ Create public/images directory structure
-□ Optimize user's professional photos and company logos
-□ Set up environment-aware asset path system
-□ Configure resume PDF for download functionality
-```
-
-### Phase 3: Core Component Development (2-3 hours)
-```
-STEP 7: Data Layer Implementation
-□ Create src/data/personal.ts with user's information
-□ Build src/data/experience.ts with user's work history
-□ Populate src/data/projects.ts with user's GitHub projects
-□ Define TypeScript interfaces for all data structures
-
-STEP 8: Layout Components
-□ Implement Header with user's navigation preferences
-□ Build responsive navigation with mobile hamburger menu
-□ Create Footer with user's social links and contact info
-□ Set up theme context for dark/light mode support
-
-STEP 9: Animation System
-□ Implement DecryptedText for hero section tagline
-□ Build TargetCursor for interactive project showcases
-□ Create PrismBackground for modern visual effects
-□ Add SpotlightCard effects for enhanced interactivity
-
-STEP 10: Hero Section
-□ Create animated tagline highlighting user's expertise
-□ Implement professional introduction with user's career focus
-□ Add call-to-action buttons for resume and contact
-□ Ensure mobile-responsive typography and spacing
-```
-
-### Phase 4: Content Sections (2-3 hours)
-```
-STEP 11: Work Experience Timeline
-□ Build ExperienceCard components with user's career history
-□ Implement desktop timeline with alternating layout
-□ Create mobile carousel with user's current role featured first
-□ Add company logos and location-based imagery
-□ Include "Current" badges and achievement highlights
-
-STEP 12: Skills Visualization
-□ Create SkillsVisualization with user's technical stack
-□ Implement progress bars showing user's proficiency levels
-□ Build category-based organization (Frontend, Backend, AI/ML, etc.)
-□ Add desktop grid layout and mobile carousel
-□ Include tooltip explanations for skill percentages
-
-STEP 13: Featured Projects Showcase
-□ Build ProjectCard components with user's GitHub repositories
-□ Implement TargetCursor animation for interactive effects
-□ Create desktop grid layout (2-3 columns)
-□ Build mobile carousel with category-based prominence
-□ Add technology tags, GitHub links, and live demo buttons
-□ Highlight user's most impressive projects first
-
-STEP 14: Contact Integration
-□ Create contact section with user's preferred contact methods
-□ Add social media links (GitHub, LinkedIn, Twitter/X, etc.)
-□ Implement email link with professional formatting
-□ Include resume download functionality
-□ Add location information if user prefers to share
-```
-
-### Phase 5: Mobile-First Optimization (1-2 hours)
-```
-STEP 15: Responsive Design Implementation
-□ Implement mobile carousels for all major sections
-□ Add touch-friendly navigation with arrow buttons and dots
-□ Ensure proper viewport handling and smooth animations
-□ Test carousel functionality across different screen sizes
-□ Optimize typography scaling for mobile readability
-
-STEP 16: Performance Optimization
-□ Implement lazy loading for images and components
-□ Optimize bundle size with proper tree-shaking
-□ Add image compression and WebP format support
-□ Configure proper caching strategies
-□ Test Core Web Vitals compliance
-
-STEP 17: Cross-Device Testing
-□ Test on mobile devices (375px - 430px width)
-□ Verify tablet compatibility (768px - 1024px)
-□ Ensure desktop experience (1024px+)
-□ Check browser compatibility (Chrome, Firefox, Safari, Edge)
-□ Validate touch interactions and hover states
-```
-
-### Phase 6: Deployment & Production (1 hour)
-```
-STEP 18: GitHub Pages Configuration
-□ Set up environment-aware Vite configuration
-□ Configure proper base paths for GitHub Pages
-□ Create GitHub Actions workflow for automated deployment
-□ Test asset loading in production environment
-□ Verify all links and downloads work correctly
-
-STEP 19: SEO & Meta Configuration
-□ Add proper meta tags with user's professional information
-□ Configure Open Graph tags for social media sharing
-□ Set up structured data for better search visibility
-□ Add favicon and app icons
-□ Implement proper title tags for each section
-
-STEP 20: Final Quality Assurance
-□ Perform comprehensive testing across all devices
-□ Validate all user information is correctly displayed
-□ Test all interactive features and animations
-□ Verify performance metrics meet standards
-□ Check for accessibility compliance
-□ Review and fix any console errors
-```
-
-## Content Adaptation Guidelines
-
-### Professional Tagline Creation
-Transform user's resume summary into an engaging animated tagline:
-```typescript
-// Example transformation:
-// Resume: "Python Developer with 3 years of experience in AI/ML"
-// Tagline: "AI & ML Engineer 🔥 | Building intelligent solutions with Python & Data Science 📊 | 3+ years of innovation 🚀"
-```
-
-### Experience Timeline Customization
-Prioritize user's most relevant and impressive experiences:
-- Current position featured prominently
-- Career progression clearly visible
-- Key achievements and technologies highlighted
-- Company logos and locations when available
-
-### Skills Assessment & Visualization
-Convert resume skills into visual progress indicators:
-- Primary skills (90-100%): Technologies user works with daily
-- Secondary skills (70-89%): Technologies user is proficient in
-- Learning skills (50-69%): Technologies user is actively developing
-- Group skills by categories relevant to user's career focus
-
-### Project Curation Strategy
-Select and present user's best projects:
-- Prioritize projects that demonstrate user's target skills
-- Include live demos when available
-- Highlight technical complexity and impact
-- Show variety in project types and technologies
-- Link to GitHub repositories with good documentation
-
-## Quality Standards
-
-### Code Quality Requirements
-- TypeScript strict mode with zero errors
-- ESLint compliance with minimal warnings
-- Component reusability above 85%
-- Mobile-responsive design across all components
-- Performance: Core Web Vitals compliance
-
-### Content Quality Standards
-- All placeholder content replaced with user-specific information
-- Professional tone consistent with user's career level
-- Technical accuracy in skill representations
-- Current and relevant project showcases
-- Error-free contact information and links
-
-### User Experience Standards
-- Smooth animations that enhance rather than distract
-- Intuitive navigation across all device types
-- Fast loading times (< 3 seconds initial load)
-- Accessible design following WCAG guidelines
-- Professional visual hierarchy and typography
-
-## Delivery Format
-
-Provide the user with:
-
-1. **Complete Todo List**: Step-by-step implementation checklist
-2. **Customized Code Examples**: User-specific component implementations
-3. **Asset Requirements**: List of images, logos, and files needed
-4. **Deployment Instructions**: Step-by-step GitHub Pages setup
-5. **Testing Checklist**: Quality assurance validation steps
-6. **Maintenance Guide**: Instructions for future updates
-
-## Important Considerations
-
-### Technical Requirements
-- Node.js 20+ for Vite 7.x compatibility
-- Modern browser support (ES2020+)
-- GitHub account for Pages deployment
-- Basic understanding of React concepts helpful but not required
-
-### Content Preparation
-- Professional photo for hero section
-- Company logos (if permissions allow)
-- Resume PDF for download
-- GitHub repositories with good documentation
-- Social media profiles for professional networking
-
-### Timeline Expectations
-- Complete implementation: 6-10 hours for experienced developers
-- Learning curve: Additional 2-4 hours for React beginners
-- Testing and refinement: 1-2 hours
-- Total project time: 1-2 weeks for comprehensive implementation
-
-## Task File Generation Requirements
-
-### Master Task File Structure (/tools/tasks/task.md)
-**CRITICAL**: You MUST automatically create a comprehensive task file with the following structure:
-
-```markdown
-# Portfolio Development Task Tracker
-
-**Project**: [User Name]'s Modern React Portfolio
-**Start Date**: [Current Date]
-**Target Completion**: [Estimated Date]
-**Developer**: [User Name]
-**Tech Stack**: React 19.1 + TypeScript + Vite + Tailwind CSS
-
-## Project Metadata
-- **Priority**: High
-- **Complexity**: Medium-High
-- **Estimated Total Time**: 8-12 hours
-- **Dependencies**: Node.js 20+, GitHub account
-- **Success Criteria**: Fully deployed, responsive, professional portfolio
-
----
-
-## Progress Overview
-- [ ] Phase 1: Requirements Analysis (0/3 tasks)
-- [ ] Phase 2: Development Setup (0/4 tasks)
-- [ ] Phase 3: Core Development (0/6 tasks)
-- [ ] Phase 4: Content Implementation (0/4 tasks)
-- [ ] Phase 5: Mobile Optimization (0/3 tasks)
-- [ ] Phase 6: Deployment (0/3 tasks)
-
-**Overall Progress**: 0/23 tasks completed (0%)
-
-[Detailed task breakdown for each phase with checkboxes, time estimates, dependencies, success criteria, and code examples]
-```
-
-### Task Management Instructions for LLM
-
-When generating the task file, you MUST:
-
-1. **Replace Placeholders**: 
-   - `[User Name]` → Actual user name from resume
-   - `[Current Date]` → Today's date
-   - `[Estimated Date]` → Completion target based on complexity
-
-2. **Customize Time Estimates**:
-   - Beginner developers: Add 50% more time
-   - Experienced developers: Use base estimates
-   - Expert developers: Reduce by 25%
-
-3. **Include User-Specific Code Examples**:
-   ```typescript
-   // Example: If user is "John Smith, AI Engineer"
-   const personalInfo: PersonalInfo = {
-     name: "John Smith",
-     title: "AI Engineer",
-     tagline: "Building intelligent solutions with Python & Machine Learning 🤖"
-   }
-   ```
-
-4. **Add Progress Tracking Sections**:
-   - Phase-by-phase breakdown with task counts
-   - Overall progress percentage
-   - Time tracking with estimates vs actual
-   - Blocker identification and resolution tracking
-
-### Enhanced Task Structure
-
-Each task must include:
-- **Task ID**: Unique identifier (e.g., Task 1.1, Task 2.3)
-- **Name**: Clear, actionable task description
-- **Time Estimate**: Realistic time requirement
-- **Priority**: Critical, High, Medium, Low
-- **Dependencies**: Prerequisites that must be completed first
-- **Success Criteria**: Measurable completion requirements
-- **Code Examples**: User-specific TypeScript interfaces and components
-- **Deliverables**: Specific outputs expected from task completion
-
-### Automatic Progress Updates
-
-The system should enable:
-- Real-time task completion tracking
-- Progress percentage calculations
-- Time spent vs estimated monitoring
-- Dependency validation before starting tasks
-- Success criteria verification before marking complete
-- Blocker identification and escalation
-
-## Enhanced Delivery Format
-
-Provide the user with:
-
-1. **Master Task File**: `/tools/tasks/task.md` with complete project breakdown
-2. **User-Specific Implementation Plan**: Customized step-by-step guide
-3. **Progress Dashboard**: Real-time completion status and time tracking
-4. **Code Templates**: User-specific component implementations
-5. **Asset Checklist**: Required images, logos, and files with examples
-6. **Deployment Tracker**: Step-by-step GitHub Pages setup with validation
-7. **Quality Assurance Tasks**: Testing checklist with completion criteria
-
-## Critical Task Generation Rules
-
-### MUST CREATE AUTOMATICALLY:
-1. **Main Task File**: `/tools/tasks/task.md` with complete project breakdown
-2. **User-Specific Content**: Replace ALL placeholders with actual user data
-3. **Time Estimates**: Adjust based on user's experience level from resume
-4. **Dependencies**: Clear prerequisite relationships between tasks
-5. **Success Criteria**: Measurable completion requirements for each task
-6. **Progress Tracking**: Checkbox system with percentage completion
-7. **Code Examples**: User-specific TypeScript interfaces and components
-
-### TASK FILE MUST INCLUDE:
-- Project metadata (dates, assignee, complexity, tech stack)
-- Phase-by-phase breakdown with time estimates (23 total tasks across 6 phases)
-- Individual tasks with priorities and dependencies  
-- Checkbox progress tracking with completion status
-- Success criteria for each task and phase
-- Code examples tailored to user's background
-- Progress log with timestamps and completion tracking
-- Next steps and blockers identification
-
-### UPDATE REQUIREMENTS:
-- Automatically update progress percentages when tasks completed
-- Log completion timestamps for accurate time tracking
-- Update dependencies when prerequisite tasks finished
-- Recalculate project timeline based on actual vs estimated time
-- Flag blockers or issues preventing task completion
-
-Remember: This enhanced system follows proven patterns from a successfully deployed portfolio website with comprehensive task management. Every recommendation is based on real-world implementation and production experience. The task file is the central nervous system of the project - treat task file generation and maintenance as critically important as the actual code implementation. Focus on creating a portfolio that authentically represents the user while leveraging modern web development best practices and systematic project management.
-"""
+import json
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PRD = os.path.join(TOOLS_DIR, "PRODUCT_REQUIREMENTS_DOCUMENT.md")
+DEFAULT_TASK_FILE = os.path.join(TOOLS_DIR, "tasks", "task.md")
+
 
 # Enhanced usage function with task generation
-def generate_portfolio_with_tasks(resume_content: str, prd_content: str, user_name: str = None) -> dict:
+def generate_portfolio_with_tasks(resume_content: str, prd_content: str, user_name: str = None,
+                                  focus: str = None, token_budget: int = None, cache=None) -> dict:
     """
     Generate a customized portfolio implementation plan with comprehensive task tracking
     
@@ -432,85 +51,191 @@ def generate_portfolio_with_tasks(resume_content: str, prd_content: str, user_na
         resume_content: User's resume in text format
         prd_content: Content of PRODUCT_REQUIREMENTS_DOCUMENT.md
         user_name: Optional user name for task file customization
+        focus: Optional technical focus ("ai-ml", "frontend", ...); detected from the resume if omitted
+        token_budget: Optional token budget for the PRD sections sent with the prompt
+        cache: Optional result_cache.ResultCache; identical inputs are served from it
         
     Returns:
         Dictionary containing:
         - implementation_plan: Customized development plan
         - task_file_content: Complete /tools/tasks/task.md content
-        - progress_tracker: Initial progress tracking data
+        - progress_tracker: Initial progress tracking data, ready set and critical path
+        - prd_context: Relevant PRD sections and tokens saved vs. the full document
     """
     
-    # Extract user info from resume if name not provided
-    if not user_name:
-        # Parse resume to extract name
-        user_name = "Portfolio Developer"  # Fallback
-    
-    current_date = "2025-08-28"  # Would be dynamic in real implementation
-    estimated_completion = "2025-09-04"  # 1 week estimate
-    
-    task_file_content = f"""
-# {user_name}'s Portfolio Development Task Tracker
-
-**Project**: {user_name}'s Modern React Portfolio
-**Start Date**: {current_date}
-**Target Completion**: {estimated_completion}
-**Developer**: {user_name}
-**Tech Stack**: React 19.1 + TypeScript + Vite + Tailwind CSS
-
-## Project Metadata
-- **Priority**: High
-- **Complexity**: Medium-High  
-- **Estimated Total Time**: 8-12 hours
-- **Dependencies**: Node.js 20+, GitHub account
-- **Success Criteria**: Fully deployed, responsive, professional portfolio
-
----
-
-## Progress Overview
-- [ ] Phase 1: Requirements Analysis (0/3 tasks)
-- [ ] Phase 2: Development Setup (0/4 tasks)
-- [ ] Phase 3: Core Development (0/6 tasks)
-- [ ] Phase 4: Content Implementation (0/4 tasks)
-- [ ] Phase 5: Mobile Optimization (0/3 tasks)
-- [ ] Phase 6: Deployment (0/3 tasks)
-
-**Overall Progress**: 0/23 tasks completed (0%)
-
-[Detailed task breakdown would be generated here based on user's specific resume content and requirements]
-
-## Progress Log
-**Last Updated**: {current_date}
-**Current Phase**: Phase 1 - Requirements Analysis
-**Completed Tasks**: 0/23 (0%)
-**Time Spent**: 0 hours
-**Estimated Remaining**: 8-12 hours
-
-### Next Up:
-⏳ Task 1.1: Resume Content Mapping (Ready to start)
-⏳ Task 1.2: Technical Stack Validation (Waiting)
-⏳ Task 1.3: Content Architecture Design (Waiting)
-"""
-    
+    from instrumentation import count, span
+    from prd_index import detect_focus, index_for_content
+    from prompt_template import SYSTEM_PROMPT
+    from task_graph import TaskGraph
+    from task_model import default_plan, render_task_file
+
+    if cache is not None:
+        key = cache.make_key(resume_content, prd_content, user_name,
+                             focus=focus, token_budget=token_budget)
+        return cache.get_or_compute(key, lambda: generate_portfolio_with_tasks(
+            resume_content, prd_content, user_name, focus, token_budget))
+
+    with span("generate"):
+        count("resume_bytes", len(resume_content))
+        count("prd_bytes", len(prd_content))
+
+        # Extract user info from resume if name not provided
+        if not user_name:
+            from resume_ingest import extract_name
+
+            with span("resume.parse"):
+                user_name = extract_name(resume_content) or "Portfolio Developer"  # Fallback
+
+        current_date = "2025-08-28"  # Would be dynamic in real implementation
+        estimated_completion = "2025-09-04"  # 1 week estimate
+
+        # Only ship the PRD sections relevant to this user; the parsed index is cached
+        prd_context = None
+        if prd_content:
+            with span("prd.select"):
+                focus = focus or detect_focus(resume_content)
+                prd_context = index_for_content(prd_content).select(focus, token_budget).as_dict()
+            count("prd_tokens_selected", prd_context["tokens"])
+            count("prd_tokens_saved", prd_context["tokens_saved"])
+
+        with span("template.render"):
+            plan = default_plan(user_name, current_date, estimated_completion)
+            task_file_content = render_task_file(plan)
+        count("task_file_bytes", len(task_file_content))
+        with span("graph.summary"):
+            progress_tracker = plan.progress_tracker()
+            progress_tracker.update(TaskGraph.from_plan(plan).summary())
+
     return {
         "implementation_plan": SYSTEM_PROMPT,
         "task_file_content": task_file_content,
-        "progress_tracker": {
-            "total_tasks": 23,
-            "completed_tasks": 0,
-            "current_phase": "Phase 1",
-            "estimated_hours": "8-12",
-            "start_date": current_date
-        }
+        "progress_tracker": progress_tracker,
+        "prd_context": prd_context
     }
 
+
+def __getattr__(name):
+    # SYSTEM_PROMPT is resolved on first access so importing this module stays cheap
+    if name == "SYSTEM_PROMPT":
+        from prompt_template import SYSTEM_PROMPT
+        globals()["SYSTEM_PROMPT"] = SYSTEM_PROMPT
+        return SYSTEM_PROMPT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Subcommands handled by another tool's own CLI: name -> (module, help)
+FORWARDED = {
+    "batch": ("batch", "Generate results for a directory or JSONL file of resumes"),
+    "update-progress": ("task_updater", "Apply a start/complete/block event to task.md"),
+    "progress": ("progress_store", "Record and query task events in the SQLite progress store"),
+    "watch": ("watch", "Regenerate only the affected artifacts when the resume, PRD or prompt change"),
+    "precompress": ("precompress", "Precompress dist/ and check bundle size budgets"),
+    "personalize": ("placeholders", "Fill [User Name], [Company], ... placeholders in a document"),
+    "github": ("github_index", "Index GitHub project metadata from clones and API dumps, rank featured"),
+}
+
+
+def _read_input(path: str) -> str:
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, encoding="utf-8") as handle:
+        return handle.read()
+
+
+def _command_generate(args) -> int:
+    if args.task_file and os.path.exists(args.task_file) and not args.force:
+        print(f"error: {args.task_file} exists and holds progress; use --force to overwrite",
+              file=sys.stderr)
+        return 1
+    try:
+        if args.resume == "-":
+            resume = _read_input(args.resume)
+        else:
+            from resume_ingest import read_resume
+
+            resume = read_resume(args.resume)
+        prd = _read_input(args.prd) if args.prd else ""
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    result = generate_portfolio_with_tasks(resume, prd, args.name, args.focus, args.budget)
+
+    if args.task_file:
+        os.makedirs(os.path.dirname(os.path.abspath(args.task_file)), exist_ok=True)
+        with open(args.task_file, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(result["task_file_content"])
+        print(f"wrote {args.task_file}", file=sys.stderr)
+    if not args.with_prompt:
+        result.pop("implementation_plan")
+    serialized = json.dumps(result, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(serialized)
+    else:
+        sys.stdout.write(serialized)
+    return 0
+
+
+def _command_status(args) -> int:
+    from task_updater import TaskFileUpdater
+
+    try:
+        status = TaskFileUpdater(args.task_file).status()
+    except FileNotFoundError:
+        print(f"error: no task file at {args.task_file}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(status))
+        return 0
+    print(f"{status['completed_tasks']}/{status['total_tasks']} tasks completed "
+          f"({status['percent']}%), {status['time_spent_hours']:g} hours spent")
+    for number, (done, total) in status["phases"].items():
+        print(f"  Phase {number}: {done}/{total}")
+    for task_id, label in status["next_up"]:
+        print(f"  next: Task {task_id} - {label}")
+    return 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in FORWARDED:
+        import importlib
+
+        return importlib.import_module(FORWARDED[argv[0]][0]).main(argv[1:])
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Portfolio generator with task management")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    generate = commands.add_parser("generate", help="Build the plan and task.md for one resume")
+    generate.add_argument("resume", help="Resume file (PDF, text/markdown or JSON), or - for stdin")
+    generate.add_argument("--prd", default=DEFAULT_PRD, help="PRD markdown (default: %(default)s)")
+    generate.add_argument("--name", default=None, help="User name for the task file")
+    generate.add_argument("--focus", default=None, help="Technical focus; detected from the resume if omitted")
+    generate.add_argument("--budget", type=int, default=None, help="Token budget for PRD sections")
+    generate.add_argument("--task-file", default=None, help="Also write task.md here")
+    generate.add_argument("--force", action="store_true", help="Overwrite an existing task file")
+    generate.add_argument("--output", default=None, help="Write the result JSON here instead of stdout")
+    generate.add_argument("--with-prompt", action="store_true",
+                          help="Include the full implementation prompt in the JSON")
+
+    for name, (_, help_text) in FORWARDED.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+
+    status = commands.add_parser("status", help="Summarize progress recorded in task.md")
+    status.add_argument("task_file", nargs="?", default=DEFAULT_TASK_FILE,
+                        help="Path to task.md (default: %(default)s)")
+    status.add_argument("--json", action="store_true", help="Print the status as JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        return _command_generate(args)
+    if args.command == "status":
+        return _command_status(args)
+    parser.print_help()
+    return 2
+
+
 if __name__ == "__main__":
-    print("Enhanced Modern Portfolio Website Generator with Task Management")
-    print("=" * 70)
-    print("\nThis enhanced system prompt:")
-    print("1. Analyzes user's resume and extracts personal information")
-    print("2. Reads PRD document for technical specifications")
-    print("3. Generates customized implementation plan")
-    print("4. Creates comprehensive /tools/tasks/task.md with progress tracking")
-    print("5. Provides user-specific code examples and time estimates")
-    print("6. Enables real-time progress monitoring and task completion")
-    print("\nReady to help users build modern React portfolios with full project management!")
\ No newline at end of file
+    sys.exit(main())
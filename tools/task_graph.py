@@ -0,0 +1,329 @@
+"""
+Task Dependency Graph
+=====================
+
+Dependency-graph engine behind the progress tracker. Tasks are stored with
+integer ids and adjacency lists so plans with tens of thousands of tasks stay
+cheap to order and schedule.
+
+- topological_order(): Kahn's algorithm; cycles raise CycleError with the cycle path
+- schedule(): critical path method (earliest/latest start, slack) from time estimates,
+  using actual hours for finished tasks so the timeline reflects real progress
+- ready set: maintained incrementally; complete() only touches the task's dependents
+
+Usage:
+    graph = TaskGraph.from_plan(default_plan("Jane", "2025-08-28", "2025-09-04"))
+    graph.ready_tasks()            # ["1.1"]
+    graph.complete("1.1", actual_hours=0.5)
+    graph.schedule().critical_path
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from task_model import BLOCKED, COMPLETED, IN_PROGRESS, PENDING
+
+
+class CycleError(ValueError):
+    """Raised when task dependencies form a cycle"""
+
+    def __init__(self, cycle: Sequence[str]):
+        self.cycle = list(cycle)
+        super().__init__("dependency cycle: " + " -> ".join(self.cycle))
+
+
+class Schedule(NamedTuple):
+    """Result of the critical path calculation (all times in hours from project start)"""
+    order: List[str]
+    earliest_start: Dict[str, float]
+    earliest_finish: Dict[str, float]
+    latest_start: Dict[str, float]
+    slack: Dict[str, float]
+    critical_path: List[str]
+    duration: float
+
+    def is_critical(self, task_id: str) -> bool:
+        return self.slack[task_id] <= 1e-9
+
+
+class TaskGraph:
+    """
+    Directed acyclic graph of tasks with estimates and completion state
+
+    Dependencies may be added before the tasks they point to; they are resolved
+    the first time the graph is queried.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._estimate: List[float] = []
+        self._actual: List[Optional[float]] = []
+        self._status: List[str] = []
+        self._pending_deps: List[Sequence[str]] = []
+        self._preds: List[List[int]] = []
+        self._succs: List[List[int]] = []
+        self._open_deps: List[int] = []   # unfinished predecessors per task
+        self._ready = set()
+        self._resolved = 0                # tasks whose dependencies have been linked
+        self._order: Optional[List[int]] = None
+        self._schedule: Optional[Schedule] = None
+
+    # -- construction -----------------------------------------------------
+
+    def add_task(self, task_id: str, estimate_hours: float, dependencies: Iterable[str] = (),
+                 status: str = PENDING, actual_hours: float = None) -> int:
+        if task_id in self._index:
+            raise ValueError(f"duplicate task id {task_id!r}")
+        node = len(self._ids)
+        self._index[task_id] = node
+        self._ids.append(task_id)
+        self._estimate.append(float(estimate_hours))
+        self._actual.append(actual_hours)
+        self._status.append(status)
+        self._pending_deps.append(tuple(dependencies))
+        self._preds.append([])
+        self._succs.append([])
+        self._open_deps.append(0)
+        self._invalidate()
+        return node
+
+    @classmethod
+    def from_plan(cls, plan) -> "TaskGraph":
+        """Build a graph from a task_model.TaskPlan"""
+        graph = cls()
+        for task in plan.tasks():
+            graph.add_task(task.task_id, task.estimate_hours, task.dependencies, task.status)
+        return graph
+
+    def _invalidate(self):
+        self._order = None
+        self._schedule = None
+
+    def _link(self):
+        """Resolve dependency ids added since the last query into adjacency lists"""
+        if self._resolved == len(self._ids):
+            return
+        index, status = self._index, self._status
+        for node in range(self._resolved, len(self._ids)):
+            for dep in self._pending_deps[node]:
+                pred = index.get(dep)
+                if pred is None:
+                    raise KeyError(f"Task {self._ids[node]} depends on unknown task {dep!r}")
+                self._preds[node].append(pred)
+                self._succs[pred].append(node)
+                if status[pred] != COMPLETED:
+                    self._open_deps[node] += 1
+            self._pending_deps[node] = ()
+        # Linking never changes the readiness of older tasks, so only the new batch is scanned
+        for node in range(self._resolved, len(self._ids)):
+            if status[node] == PENDING and self._open_deps[node] == 0:
+                self._ready.add(node)
+        self._resolved = len(self._ids)
+
+    # -- ordering ---------------------------------------------------------
+
+    def topological_order(self) -> List[str]:
+        """Task ids ordered so every task follows its dependencies"""
+        return [self._ids[node] for node in self._topological()]
+
+    def _topological(self) -> List[int]:
+        if self._order is not None:
+            return self._order
+        self._link()
+        indegree = [len(preds) for preds in self._preds]
+        queue = [node for node, degree in enumerate(indegree) if degree == 0]
+        succs = self._succs
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for succ in succs[node]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    queue.append(succ)
+        if len(queue) != len(self._ids):
+            raise CycleError(self._find_cycle(indegree))
+        self._order = queue
+        return queue
+
+    def _find_cycle(self, indegree: List[int]) -> List[str]:
+        """Walk predecessors among the nodes Kahn's algorithm could not order"""
+        start = next(node for node, degree in enumerate(indegree) if degree > 0)
+        seen = {}
+        path = []
+        node = start
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(pred for pred in self._preds[node] if indegree[pred] > 0)
+        cycle = path[seen[node]:] + [node]
+        return [self._ids[n] for n in reversed(cycle)]
+
+    def validate(self):
+        """Raise KeyError for unknown dependencies or CycleError for cycles"""
+        self._topological()
+
+    # -- scheduling -------------------------------------------------------
+
+    def duration(self, task_id: str) -> float:
+        node = self._index[task_id]
+        return self._duration(node)
+
+    def _duration(self, node: int) -> float:
+        actual = self._actual[node]
+        return actual if actual is not None and self._status[node] == COMPLETED else self._estimate[node]
+
+    def schedule(self) -> Schedule:
+        """
+        Critical path calculation over the whole graph
+
+        Completed tasks use their actual hours when known, so the projected
+        duration shifts as real progress deviates from the estimates.
+        """
+        if self._schedule is not None:
+            return self._schedule
+        order = self._topological()
+        count = len(order)
+        preds, succs = self._preds, self._succs
+        durations = [self._duration(node) for node in range(count)]
+
+        earliest_start = [0.0] * count
+        earliest_finish = [0.0] * count
+        for node in order:
+            start = 0.0
+            for pred in preds[node]:
+                if earliest_finish[pred] > start:
+                    start = earliest_finish[pred]
+            earliest_start[node] = start
+            earliest_finish[node] = start + durations[node]
+        project = max(earliest_finish, default=0.0)
+
+        latest_finish = [project] * count
+        latest_start = [0.0] * count
+        for node in reversed(order):
+            finish = project
+            for succ in succs[node]:
+                if latest_start[succ] < finish:
+                    finish = latest_start[succ]
+            latest_finish[node] = finish
+            latest_start[node] = finish - durations[node]
+
+        slack = [latest_start[node] - earliest_start[node] for node in range(count)]
+        critical_path = []
+        node = next((n for n in order if not preds[n] and slack[n] <= 1e-9), None)
+        while node is not None:
+            critical_path.append(node)
+            node = next((succ for succ in succs[node]
+                         if slack[succ] <= 1e-9
+                         and abs(earliest_start[succ] - earliest_finish[node]) <= 1e-9), None)
+
+        ids = self._ids
+        self._schedule = Schedule(
+            order=[ids[n] for n in order],
+            earliest_start={ids[n]: earliest_start[n] for n in range(count)},
+            earliest_finish={ids[n]: earliest_finish[n] for n in range(count)},
+            latest_start={ids[n]: latest_start[n] for n in range(count)},
+            slack={ids[n]: slack[n] for n in range(count)},
+            critical_path=[ids[n] for n in critical_path],
+            duration=project,
+        )
+        return self._schedule
+
+    def timeline(self) -> dict:
+        """Estimated vs actual hours and the projected critical-path duration"""
+        schedule = self.schedule()
+        done = [n for n, status in enumerate(self._status) if status == COMPLETED]
+        estimated_done = sum(self._estimate[n] for n in done)
+        actual_done = sum(self._duration(n) for n in done)
+        remaining = sum(self._estimate[n] for n, s in enumerate(self._status) if s != COMPLETED)
+        return {
+            "critical_path_hours": round(schedule.duration, 2),
+            "estimated_hours_completed": round(estimated_done, 2),
+            "actual_hours_completed": round(actual_done, 2),
+            "variance_hours": round(actual_done - estimated_done, 2),
+            "remaining_hours": round(remaining, 2),
+        }
+
+    # -- progress ---------------------------------------------------------
+
+    def ready_tasks(self) -> List[str]:
+        """Pending tasks whose dependencies are all complete, in insertion order"""
+        self._link()
+        return [self._ids[node] for node in sorted(self._ready)]
+
+    def is_ready(self, task_id: str) -> bool:
+        self._link()
+        return self._index[task_id] in self._ready
+
+    def status(self, task_id: str) -> str:
+        return self._status[self._index[task_id]]
+
+    def start(self, task_id: str, force: bool = False):
+        self._link()
+        node = self._index[task_id]
+        if self._open_deps[node] and not force:
+            open_deps = [self._ids[p] for p in self._preds[node] if self._status[p] != COMPLETED]
+            raise ValueError(f"Task {task_id} depends on unfinished "
+                             + ", ".join(f"Task {dep}" for dep in open_deps))
+        self._reopen(node)
+        self._status[node] = IN_PROGRESS
+        self._ready.discard(node)
+
+    def block(self, task_id: str):
+        self._link()
+        node = self._index[task_id]
+        self._reopen(node)
+        self._status[node] = BLOCKED
+        self._ready.discard(node)
+
+    def _reopen(self, node: int):
+        """Undo complete()'s effect on the dependents of a task that is leaving COMPLETED"""
+        if self._status[node] != COMPLETED:
+            return
+        self._schedule = None  # the task is timed by its estimate again
+        for succ in self._succs[node]:
+            self._open_deps[succ] += 1
+            self._ready.discard(succ)
+
+    def complete(self, task_id: str, actual_hours: float = None) -> List[str]:
+        """
+        Mark a task complete and update the ready set
+
+        Only the task's direct dependents are visited.
+
+        Returns:
+            Task ids that became ready as a result
+        """
+        self._link()
+        node = self._index[task_id]
+        if self._status[node] == COMPLETED:
+            return []
+        self._status[node] = COMPLETED
+        if actual_hours is not None:
+            self._actual[node] = actual_hours
+        self._ready.discard(node)
+        self._schedule = None  # durations changed; ordering is still valid
+
+        unlocked = []
+        for succ in self._succs[node]:
+            self._open_deps[succ] -= 1
+            if self._open_deps[succ] == 0 and self._status[succ] == PENDING:
+                self._ready.add(succ)
+                unlocked.append(self._ids[succ])
+        return unlocked
+
+    def summary(self) -> dict:
+        """Fields merged into the progress tracker dict"""
+        schedule = self.schedule()
+        summary = {
+            "ready_tasks": self.ready_tasks(),
+            "critical_path": schedule.critical_path,
+        }
+        summary.update(self.timeline())
+        return summary
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._index
@@ -0,0 +1,504 @@
+"""
+Task Model and task.md Renderer
+===============================
+
+In-memory model of the portfolio task plan (phases -> tasks) and a renderer for
+/tools/tasks/task.md built from templates compiled once at import time.
+
+Rendered fragments are cached on the records themselves: changing a task only
+clears that task's fragment and its phase's fragment, so re-rendering a plan
+with thousands of tasks after a single update only re-formats one phase.
+
+Checkbox markers are fixed width ("[ ]", "[~]", "[x]", "[!]") so status changes
+can also be patched into an existing file in place (see task_updater.py).
+
+Usage:
+    plan = default_plan("Jane Doe", "2025-08-28", "2025-09-04")
+    plan.get("1.1").complete()
+    task_md = render_task_file(plan)
+"""
+
+from math import ceil, floor
+from string import Template
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+BLOCKED = "blocked"
+
+CHECKBOX = {PENDING: " ", IN_PROGRESS: "~", COMPLETED: "x", BLOCKED: "!"}
+STATUS_BY_CHECKBOX = {mark: status for status, mark in CHECKBOX.items()}
+PRIORITIES = ("Critical", "High", "Medium", "Low")
+
+
+def format_hours(hours: float) -> str:
+    """0.25 -> "15 min", 1.5 -> "1.5 hours" """
+    if hours < 1:
+        return f"{round(hours * 60)} min"
+    text = f"{hours:.2f}".rstrip("0").rstrip(".")
+    return f"{text} hour" if text == "1" else f"{text} hours"
+
+
+def hours_range(hours: float) -> str:
+    """Whole-hour range within 20% of an estimate: 10.75 -> "8-13" """
+    low, high = max(1, floor(hours * 0.8)), ceil(hours * 1.2)
+    return f"{low}-{high}" if high > low else str(high)
+
+
+def percent(done: int, total: int) -> int:
+    return round(done * 100 / total) if total else 0
+
+
+class Task:
+    """A single trackable task, e.g. Task 3.1: Data Layer Implementation"""
+
+    __slots__ = ("task_id", "name", "estimate_hours", "priority", "dependencies",
+                 "success_criteria", "deliverables", "step", "status", "phase", "_fragment")
+
+    def __init__(self, task_id: str, name: str, estimate_hours: float, priority: str = "High",
+                 dependencies: Tuple[str, ...] = (), success_criteria: Tuple[str, ...] = (),
+                 deliverables: Tuple[str, ...] = (), step: Optional[int] = None,
+                 status: str = PENDING):
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {PRIORITIES}, got {priority!r}")
+        if status not in CHECKBOX:
+            raise ValueError(f"unknown status {status!r}")
+        self.task_id = task_id
+        self.name = name
+        self.estimate_hours = estimate_hours
+        self.priority = priority
+        self.dependencies = tuple(dependencies)
+        self.success_criteria = tuple(success_criteria)
+        self.deliverables = tuple(deliverables)
+        self.step = step
+        self.status = status
+        self.phase = None
+        self._fragment = None
+
+    @property
+    def done(self) -> bool:
+        return self.status == COMPLETED
+
+    @property
+    def checkbox(self) -> str:
+        return f"[{CHECKBOX[self.status]}]"
+
+    def set_status(self, status: str):
+        if status not in CHECKBOX:
+            raise ValueError(f"unknown status {status!r}")
+        if status != self.status:
+            self.status = status
+            self.invalidate()
+
+    def start(self):
+        self.set_status(IN_PROGRESS)
+
+    def complete(self):
+        self.set_status(COMPLETED)
+
+    def block(self):
+        self.set_status(BLOCKED)
+
+    def update(self, **fields):
+        """
+        Change descriptive fields (name, estimate_hours, priority, ...)
+
+        task_id is the plan's lookup key and status has its own transitions
+        (set_status, start, complete, block), so neither is editable here.
+        """
+        for field in fields:
+            if (field not in self.__slots__ or field.startswith("_")
+                    or field in ("phase", "task_id", "status")):
+                raise AttributeError(f"Task has no editable field {field!r}")
+        if "priority" in fields and fields["priority"] not in PRIORITIES:
+            raise ValueError(f"priority must be one of {PRIORITIES}, got {fields['priority']!r}")
+        for field, value in fields.items():
+            setattr(self, field, tuple(value) if isinstance(value, list) else value)
+        self.invalidate()
+
+    def invalidate(self):
+        self._fragment = None
+        if self.phase is not None:
+            self.phase._fragment = None
+
+    def __repr__(self):
+        return f"Task({self.task_id!r}, {self.name!r}, status={self.status!r})"
+
+
+class Phase:
+    """A group of tasks, e.g. Phase 3: Core Development"""
+
+    __slots__ = ("number", "name", "tasks", "_fragment")
+
+    def __init__(self, number: int, name: str, tasks: Iterable[Task] = ()):
+        self.number = number
+        self.name = name
+        self.tasks: List[Task] = []
+        self._fragment = None
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> Task:
+        task.phase = self
+        self.tasks.append(task)
+        self._fragment = None
+        return task
+
+    @property
+    def title(self) -> str:
+        return f"Phase {self.number}: {self.name}"
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for task in self.tasks if task.status == COMPLETED)
+
+    @property
+    def estimate_hours(self) -> float:
+        return sum(task.estimate_hours for task in self.tasks)
+
+    @property
+    def done(self) -> bool:
+        return bool(self.tasks) and self.completed == len(self.tasks)
+
+    def __repr__(self):
+        return f"Phase({self.number}, {self.name!r}, tasks={len(self.tasks)})"
+
+
+class TaskPlan:
+    """
+    Complete plan for one user's portfolio
+
+    Args:
+        user_name: Developer the plan is for
+        start_date: ISO start date
+        target_date: ISO target completion date
+        estimated_range: Human estimate shown in the metadata block (e.g. "8-12");
+            derived from the task estimates when omitted
+    """
+
+    __slots__ = ("user_name", "start_date", "target_date", "_estimated_range", "tech_stack",
+                 "phases", "_by_id")
+
+    def __init__(self, user_name: str, start_date: str, target_date: str,
+                 estimated_range: Optional[str] = None,
+                 tech_stack: str = "React 19.1 + TypeScript + Vite + Tailwind CSS"):
+        self.user_name = user_name
+        self.start_date = start_date
+        self.target_date = target_date
+        self._estimated_range = estimated_range
+        self.tech_stack = tech_stack
+        self.phases: List[Phase] = []
+        self._by_id: Dict[str, Task] = {}
+
+    def add_phase(self, phase: Phase) -> Phase:
+        for task in phase.tasks:
+            if task.task_id in self._by_id:
+                raise ValueError(f"duplicate task id {task.task_id!r}")
+            self._by_id[task.task_id] = task
+        self.phases.append(phase)
+        return phase
+
+    def add_task(self, phase: Phase, task: Task) -> Task:
+        if task.task_id in self._by_id:
+            raise ValueError(f"duplicate task id {task.task_id!r}")
+        self._by_id[task.task_id] = task
+        return phase.add(task)
+
+    def get(self, task_id: str) -> Task:
+        return self._by_id[_normalize_id(task_id)]
+
+    def __contains__(self, task_id: str) -> bool:
+        return _normalize_id(task_id) in self._by_id
+
+    def tasks(self) -> Iterator[Task]:
+        for phase in self.phases:
+            yield from phase.tasks
+
+    def find_step(self, step: int) -> Optional[Task]:
+        """Task implementing a numbered STEP of the system prompt"""
+        return next((task for task in self.tasks() if task.step == step), None)
+
+    @property
+    def estimated_range(self) -> str:
+        if self._estimated_range is not None:
+            return self._estimated_range
+        return hours_range(sum(task.estimate_hours for task in self.tasks()))
+
+    @property
+    def total_tasks(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def completed_tasks(self) -> int:
+        return sum(phase.completed for phase in self.phases)
+
+    @property
+    def percent_complete(self) -> int:
+        return percent(self.completed_tasks, self.total_tasks)
+
+    @property
+    def remaining_hours(self) -> float:
+        return sum(task.estimate_hours for task in self.tasks() if not task.done)
+
+    @property
+    def current_phase(self) -> Optional[Phase]:
+        return next((phase for phase in self.phases if not phase.done), None)
+
+    def is_ready(self, task: Task) -> bool:
+        """Pending and every dependency completed"""
+        return task.status == PENDING and all(
+            self._by_id[dep].done for dep in task.dependencies if dep in self._by_id)
+
+    def next_up(self, limit: int = 3) -> List[Tuple[Task, str]]:
+        """The next unfinished tasks in plan order with a readiness label"""
+        upcoming = []
+        for task in self.tasks():
+            if task.done:
+                continue
+            if task.status == IN_PROGRESS:
+                label = "In progress"
+            elif task.status == BLOCKED:
+                label = "Blocked"
+            elif self.is_ready(task):
+                label = "Ready to start"
+            else:
+                label = "Waiting"
+            upcoming.append((task, label))
+            if len(upcoming) >= limit:
+                break
+        return upcoming
+
+    def progress_tracker(self) -> dict:
+        """Summary dict in the shape returned by generate_portfolio_with_tasks()"""
+        current = self.current_phase
+        return {
+            "total_tasks": self.total_tasks,
+            "completed_tasks": self.completed_tasks,
+            "current_phase": f"Phase {current.number}" if current else "Complete",
+            "estimated_hours": self.estimated_range,
+            "start_date": self.start_date,
+        }
+
+
+def _normalize_id(task_id: str) -> str:
+    task_id = str(task_id).strip()
+    return task_id[5:].strip() if task_id.lower().startswith("task ") else task_id
+
+
+# -- default plan -----------------------------------------------------------
+
+# (phase name, [(id, name, hours, priority, dependencies, success criteria, STEP)])
+DEFAULT_PHASES = (
+    ("Requirements Analysis", (
+        ("1.1", "Resume Content Mapping", 0.25, "Critical", (),
+         ("All resume sections extracted and categorized",
+          "Primary technical focus and experience level identified"), 1),
+        ("1.2", "Technical Stack Validation", 0.25, "High", ("1.1",),
+         ("React 19.1 + TypeScript stack confirmed for the user's background",), 2),
+        ("1.3", "Content Architecture Design", 0.5, "High", ("1.1", "1.2"),
+         ("Hero, experience, skills and project sections mapped to resume content",), 3),
+    )),
+    ("Development Setup", (
+        ("2.1", "Project Initialization", 0.25, "Critical", ("1.2",),
+         ("Vite project builds and `npm run dev` serves the app",), 4),
+        ("2.2", "GitHub Repository Setup", 0.25, "High", ("2.1",),
+         ("Repository created with main and development branches",), 4),
+        ("2.3", "Component Architecture", 0.5, "High", ("2.1",),
+         ("Folder structure, Tailwind CSS and shadcn/ui configured",), 5),
+        ("2.4", "Asset Preparation", 0.5, "Medium", ("1.3",),
+         ("Optimized photos, logos and resume PDF in public/",), 6),
+    )),
+    ("Core Development", (
+        ("3.1", "Data Layer Implementation", 0.5, "Critical", ("1.1", "2.3"),
+         ("src/data/*.ts typed against src/types/index.ts with zero TypeScript errors",), 7),
+        ("3.2", "Layout Components", 0.5, "High", ("2.3",),
+         ("Header and Footer render the user's navigation and social links",), 8),
+        ("3.3", "Theme Context", 0.25, "Medium", ("3.2",),
+         ("Dark/light mode toggles and persists",), 8),
+        ("3.4", "Animation System", 0.75, "Medium", ("2.3",),
+         ("DecryptedText, TargetCursor, PrismBackground and SpotlightCard working",), 9),
+        ("3.5", "Hero Section", 0.5, "High", ("3.1", "3.4"),
+         ("Animated tagline and call-to-action buttons responsive on mobile",), 10),
+        ("3.6", "Responsive Navigation", 0.5, "High", ("3.2",),
+         ("Mobile hamburger menu and smooth section scrolling",), 8),
+    )),
+    ("Content Implementation", (
+        ("4.1", "Work Experience Timeline", 0.75, "High", ("3.1",),
+         ("Desktop timeline and mobile carousel show the current role first",), 11),
+        ("4.2", "Skills Visualization", 0.5, "High", ("3.1",),
+         ("Skill categories with proficiency bars and tooltips",), 12),
+        ("4.3", "Featured Projects Showcase", 0.75, "High", ("3.1", "3.4"),
+         ("Project cards with technology tags, GitHub and demo links",), 13),
+        ("4.4", "Contact Integration", 0.25, "Medium", ("3.2",),
+         ("Email, social links and resume download all work",), 14),
+    )),
+    ("Mobile Optimization", (
+        ("5.1", "Responsive Design Implementation", 0.75, "High", ("4.1", "4.2", "4.3", "4.4"),
+         ("Carousels and typography verified from 375px to 1024px+",), 15),
+        ("5.2", "Performance Optimization", 0.5, "High", ("5.1",),
+         ("Lazy loading in place and bundle within size budgets",
+          "Core Web Vitals targets met"), 16),
+        ("5.3", "Cross-Device Testing", 0.5, "Medium", ("5.1",),
+         ("Chrome, Firefox, Safari and Edge checked on mobile, tablet and desktop",), 17),
+    )),
+    ("Deployment", (
+        ("6.1", "GitHub Pages Configuration", 0.5, "Critical", ("2.2", "5.2"),
+         ("GitHub Actions deploys main and all assets load in production",), 18),
+        ("6.2", "SEO & Meta Configuration", 0.25, "Medium", ("3.1",),
+         ("Meta, Open Graph tags and favicons in place",), 19),
+        ("6.3", "Final Quality Assurance", 0.5, "Critical", ("5.3", "6.1", "6.2"),
+         ("No console errors, accessibility and performance checks pass",), 20),
+    )),
+)
+
+
+def default_plan(user_name: str, start_date: str, target_date: str) -> TaskPlan:
+    """The standard 6 phase / 23 task plan from the system prompt"""
+    plan = TaskPlan(user_name, start_date, target_date)
+    for number, (phase_name, tasks) in enumerate(DEFAULT_PHASES, 1):
+        phase = Phase(number, phase_name)
+        for task_id, name, hours, priority, deps, criteria, step in tasks:
+            phase.add(Task(task_id, name, hours, priority, deps, criteria, step=step))
+        plan.add_phase(phase)
+    return plan
+
+
+# -- rendering --------------------------------------------------------------
+
+HEADER_TEMPLATE = Template("""\
+# ${user_name}'s Portfolio Development Task Tracker
+
+**Project**: ${user_name}'s Modern React Portfolio
+**Start Date**: ${start_date}
+**Target Completion**: ${target_date}
+**Developer**: ${user_name}
+**Tech Stack**: ${tech_stack}
+
+## Project Metadata
+- **Priority**: High
+- **Complexity**: Medium-High
+- **Estimated Total Time**: ${estimated_range} hours
+- **Dependencies**: Node.js 20+, GitHub account
+- **Success Criteria**: Fully deployed, responsive, professional portfolio
+
+---
+
+## Progress Overview
+""")
+
+OVERVIEW_LINE_TEMPLATE = Template("- [${mark}] ${title} (${completed}/${count} tasks)\n")
+
+OVERALL_TEMPLATE = Template("""
+**Overall Progress**: ${completed}/${total} tasks completed (${percent}%)
+
+---
+
+## Detailed Task Breakdown
+""")
+
+PHASE_TEMPLATE = Template("""
+### ${title}
+**Estimated Time**: ${estimate}
+
+${tasks}""")
+
+TASK_TEMPLATE = Template("""\
+- ${checkbox} **Task ${task_id}**: ${name}
+  - **Time Estimate**: ${estimate}
+  - **Priority**: ${priority}
+  - **Dependencies**: ${dependencies}
+  - **Success Criteria**: ${criteria}
+${deliverables}""")
+
+PROGRESS_LOG_TEMPLATE = Template("""
+## Progress Log
+**Last Updated**: ${updated}
+**Current Phase**: ${current_phase}
+**Completed Tasks**: ${completed}/${total} (${percent}%)
+**Time Spent**: ${time_spent}
+**Estimated Remaining**: ${remaining}
+
+### Next Up:
+${next_up}
+### Activity Log
+""")
+
+
+def render_task(task: Task) -> str:
+    if task._fragment is None:
+        deps = ", ".join(f"Task {dep}" for dep in task.dependencies) or "None"
+        deliverables = "".join(f"  - **Deliverable**: {item}\n" for item in task.deliverables)
+        task._fragment = TASK_TEMPLATE.substitute(
+            checkbox=task.checkbox,
+            task_id=task.task_id,
+            name=task.name,
+            estimate=format_hours(task.estimate_hours),
+            priority=task.priority,
+            dependencies=deps,
+            criteria="; ".join(task.success_criteria) or "Task deliverables reviewed",
+            deliverables=deliverables,
+        )
+    return task._fragment
+
+
+def render_phase(phase: Phase) -> str:
+    if phase._fragment is None:
+        phase._fragment = PHASE_TEMPLATE.substitute(
+            title=phase.title,
+            estimate=format_hours(phase.estimate_hours),
+            tasks="".join(render_task(task) for task in phase.tasks),
+        )
+    return phase._fragment
+
+
+def render_task_file(plan: TaskPlan, updated: str = None, time_spent_hours: float = 0.0,
+                     activity: Iterable[str] = None) -> str:
+    """
+    Render the complete /tools/tasks/task.md for a plan
+
+    Args:
+        plan: Task model to render
+        updated: "Last Updated" date (defaults to the plan's start date)
+        time_spent_hours: Hours logged so far
+        activity: Activity log lines (defaults to a single "task file generated" entry)
+
+    Returns:
+        Markdown content of task.md
+    """
+    completed, total = plan.completed_tasks, plan.total_tasks
+    current = plan.current_phase
+    next_up = "".join(f"⏳ Task {task.task_id}: {task.name} ({label})\n"
+                      for task, label in plan.next_up()) or "✅ All tasks complete\n"
+    if activity is None:
+        activity = [f"- {plan.start_date}: Task file generated ({total} tasks)"]
+
+    parts = [HEADER_TEMPLATE.substitute(
+        user_name=plan.user_name,
+        start_date=plan.start_date,
+        target_date=plan.target_date,
+        tech_stack=plan.tech_stack,
+        estimated_range=plan.estimated_range,
+    )]
+    for phase in plan.phases:
+        parts.append(OVERVIEW_LINE_TEMPLATE.substitute(
+            mark="x" if phase.done else " ",
+            title=phase.title,
+            completed=phase.completed,
+            count=len(phase.tasks),
+        ))
+    parts.append(OVERALL_TEMPLATE.substitute(
+        completed=completed, total=total, percent=percent(completed, total)))
+    parts.extend(render_phase(phase) for phase in plan.phases)
+    parts.append(PROGRESS_LOG_TEMPLATE.substitute(
+        updated=updated or plan.start_date,
+        current_phase=f"{current.title.replace(':', ' -')}" if current else "Complete",
+        completed=completed,
+        total=total,
+        percent=percent(completed, total),
+        time_spent=format_hours(time_spent_hours) if time_spent_hours else "0 hours",
+        remaining=format_hours(plan.remaining_hours),
+        next_up=next_up,
+    ))
+    parts.extend(f"{line}\n" for line in activity)
+    return "".join(parts)
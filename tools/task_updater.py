@@ -0,0 +1,559 @@
+"""
+Incremental task.md Updater
+===========================
+
+Applies progress events (start / complete / block) to an existing
+/tools/tasks/task.md without regenerating it. The file is parsed once into an
+index of byte spans: task checkboxes, phase counters, the overall progress line,
+the Progress Log fields and the Next Up block. Each event turns into a handful of
+span patches plus appended Activity Log lines.
+
+Writes are atomic: the new file is assembled next to the old one and swapped in
+with os.replace(). Unchanged byte ranges are copied kernel-side
+(os.copy_file_range where available). Indexed spans keep their parse-time
+offsets, and the length changes of patched spans go into a Fenwick tree, so
+moving every later span after a patch costs O(log n) rather than a walk over
+all of them. Python work per event depends on the number of patched lines and,
+logarithmically, on the number of indexed lines; only the kernel-side copy and
+fsync still grow with the size of the file.
+
+Usage:
+    updater = TaskFileUpdater("tools/tasks/task.md")
+    updater.start("1.1")
+    updater.complete("1.1", hours=0.5)
+    updater.block("1.2", "Waiting on resume PDF")
+
+    python tools/task_updater.py tools/tasks/task.md complete 1.1 --hours 0.5
+    python tools/task_updater.py tools/tasks/task.md complete 1.1 --store tools/tasks/progress.db
+
+With --store, each applied event is also appended to the SQLite progress store
+(progress_store.py) under --project (default: the task file's path), which keeps
+time spent, completion timestamps and blockers queryable across projects.
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from task_model import (
+    BLOCKED, CHECKBOX, COMPLETED, IN_PROGRESS, PENDING, STATUS_BY_CHECKBOX, format_hours, percent,
+)
+
+OVERVIEW_RE = re.compile(rb"^- \[(.)\] Phase (\d+): (.*) \((\d+)/(\d+) tasks\)$")
+OVERALL_RE = re.compile(rb"^\*\*Overall Progress\*\*: (\d+)/(\d+) tasks completed \((\d+)%\)$")
+PHASE_HEADING_RE = re.compile(rb"^### Phase (\d+): (.*)$")
+TASK_RE = re.compile(rb"^- \[(.)\] \*\*Task ([^*]+)\*\*: (.*)$")
+TASK_FIELD_RE = re.compile(rb"^  - \*\*(Time Estimate|Dependencies)\*\*: (.*)$")
+LOG_FIELD_RE = re.compile(
+    rb"^\*\*(Last Updated|Current Phase|Completed Tasks|Time Spent|Estimated Remaining)\*\*: (.*)$")
+HOURS_RE = re.compile(r"([\d.]+)\s*(min|hour|hours)")
+
+ACTIVITY_HEADING = b"### Activity Log"
+NEXT_UP_HEADING = b"### Next Up:"
+NEXT_UP_LIMIT = 3
+
+
+def parse_hours(text: str) -> float:
+    """Inverse of task_model.format_hours(): "15 min" -> 0.25, "1.5 hours" -> 1.5"""
+    match = HOURS_RE.search(text)
+    if not match:
+        return 0.0
+    value = float(match.group(1))
+    return value / 60 if match.group(2) == "min" else value
+
+
+class _ShiftTree:
+    """Fenwick tree of byte-length changes, one slot per indexed span in file order"""
+
+    __slots__ = ("tree",)
+
+    def __init__(self, size: int):
+        self.tree = [0] * (size + 1)
+
+    def add(self, slot: int, delta: int):
+        tree = self.tree
+        slot += 1
+        while slot < len(tree):
+            tree[slot] += delta
+            slot += slot & -slot
+
+    def before(self, slot: int) -> int:
+        """Total change of all slots before this one"""
+        tree = self.tree
+        total = 0
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+
+
+class Span:
+    """
+    Byte range of one line's content (newline excluded) in the file
+
+    The start is stored as of parsing; once the index is frozen, the current
+    start adds the length changes of every earlier span from the shift tree.
+    """
+
+    __slots__ = ("base", "length", "slot", "shifts")
+
+    def __init__(self, start: int, end: int):
+        self.base = start
+        self.length = end - start
+        self.slot = 0
+        self.shifts: Optional[_ShiftTree] = None
+
+    @property
+    def start(self) -> int:
+        return self.base if self.shifts is None else self.base + self.shifts.before(self.slot)
+
+    @property
+    def end(self) -> int:
+        return self.start + self.length
+
+    @end.setter
+    def end(self, value: int):
+        self.length = value - self.start
+
+    def resize(self, length: int):
+        """Record that this span now holds length bytes, shifting every later span"""
+        if length != self.length:
+            self.shifts.add(self.slot, length - self.length)
+            self.length = length
+
+
+class TaskEntry:
+    __slots__ = ("task_id", "name", "status", "phase", "estimate_hours", "dependencies",
+                 "checkbox", "order")
+
+    def __init__(self, task_id: str, name: str, status: str, phase: int, checkbox: Span, order: int):
+        self.task_id = task_id
+        self.name = name
+        self.status = status
+        self.phase = phase
+        self.estimate_hours = 0.0
+        self.dependencies = ()
+        self.checkbox = checkbox  # span of the single status character inside "[ ]"
+        self.order = order
+
+
+class PhaseEntry:
+    __slots__ = ("number", "name", "completed", "total", "line")
+
+    def __init__(self, number: int, name: str, completed: int, total: int, line: Span):
+        self.number = number
+        self.name = name
+        self.completed = completed
+        self.total = total
+        self.line = line
+
+
+class TaskEvent(NamedTuple):
+    """A progress event; kind is "start", "complete" or "block" """
+    kind: str
+    task_id: str
+    timestamp: Optional[str] = None
+    hours: Optional[float] = None
+    note: Optional[str] = None
+
+
+class TaskFileIndex:
+    """Byte-offset index over a rendered task.md"""
+
+    def __init__(self, data: bytes):
+        self.tasks: Dict[str, TaskEntry] = {}
+        self.order: List[TaskEntry] = []
+        self.phases: Dict[int, PhaseEntry] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self.overall: Optional[Span] = None
+        self.log: Dict[str, Span] = {}
+        self.time_spent = 0.0
+        self.remaining_hours = 0.0
+        self.next_up: Optional[Span] = None
+        self.has_activity_log = False
+        self.size = len(data)
+        self._parse(data)
+
+    def _parse(self, data: bytes):
+        offset = 0
+        phase = 0
+        current = None
+        in_next_up = False
+        for raw_line in data.splitlines(keepends=True):
+            line = raw_line.rstrip(b"\r\n")
+            start, end = offset, offset + len(line)
+            offset += len(raw_line)
+
+            if in_next_up:
+                if line and not line.startswith(b"###"):
+                    self.next_up.end = end
+                    continue
+                in_next_up = False
+
+            match = TASK_RE.match(line)
+            if match:
+                task_id = match.group(2).decode().strip()
+                current = TaskEntry(task_id, match.group(3).decode(),
+                                    STATUS_BY_CHECKBOX.get(match.group(1).decode(), PENDING),
+                                    phase, Span(start + 3, start + 4), len(self.order))
+                self.tasks[task_id] = current
+                self.order.append(current)
+                continue
+            match = TASK_FIELD_RE.match(line)
+            if match and current is not None:
+                value = match.group(2).decode()
+                if match.group(1) == b"Time Estimate":
+                    current.estimate_hours = parse_hours(value)
+                elif value != "None":
+                    current.dependencies = tuple(
+                        dep.strip()[5:].strip() if dep.strip().startswith("Task ") else dep.strip()
+                        for dep in value.split(","))
+                continue
+            match = PHASE_HEADING_RE.match(line)
+            if match:
+                phase, current = int(match.group(1)), None
+                continue
+            match = OVERVIEW_RE.match(line)
+            if match:
+                number = int(match.group(2))
+                self.phases[number] = PhaseEntry(number, match.group(3).decode(), int(match.group(4)),
+                                                 int(match.group(5)), Span(start, end))
+                continue
+            if OVERALL_RE.match(line):
+                self.overall = Span(start, end)
+                continue
+            match = LOG_FIELD_RE.match(line)
+            if match:
+                field = match.group(1).decode()
+                self.log[field] = Span(start + len(match.group(0)) - len(match.group(2)), end)
+                if field == "Time Spent":
+                    self.time_spent = parse_hours(match.group(2).decode())
+                continue
+            if line == NEXT_UP_HEADING:
+                self.next_up = Span(offset, offset)
+                in_next_up = True
+                continue
+            if line == ACTIVITY_HEADING:
+                self.has_activity_log = True
+
+        if self.next_up is not None and self.next_up.end > self.next_up.start:
+            self.next_up.end += 1  # include the block's trailing newline
+        for task in self.order:
+            if task.status != COMPLETED:
+                self.remaining_hours += task.estimate_hours
+            for dep in task.dependencies:
+                self.dependents.setdefault(dep, []).append(task.task_id)
+
+        spans = sorted(self.spans(), key=lambda span: span.base)
+        shifts = _ShiftTree(len(spans))
+        for slot, span in enumerate(spans):
+            span.slot = slot
+            span.shifts = shifts
+
+    def spans(self) -> List[Span]:
+        spans = [task.checkbox for task in self.order]
+        spans.extend(phase.line for phase in self.phases.values())
+        spans.extend(self.log.values())
+        spans.extend(span for span in (self.overall, self.next_up) if span is not None)
+        return spans
+
+
+class TaskFileUpdater:
+    """
+    Applies progress events to a task.md in place
+
+    Args:
+        path: Path to an existing task.md rendered by task_model.render_task_file()
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._load()
+
+    def _load(self):
+        with open(self.path, "rb") as handle:
+            self.index = TaskFileIndex(handle.read())
+        self._stamp = self._file_stamp()
+        # Position of the first unfinished task, advanced as tasks complete
+        self._first_open = 0
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    # -- public API -------------------------------------------------------
+
+    def start(self, task_id: str, timestamp: str = None, force: bool = False):
+        self.apply(TaskEvent("start", task_id, timestamp), force=force)
+
+    def complete(self, task_id: str, hours: float = None, timestamp: str = None):
+        self.apply(TaskEvent("complete", task_id, timestamp, hours))
+
+    def block(self, task_id: str, note: str = None, timestamp: str = None):
+        self.apply(TaskEvent("block", task_id, timestamp, note=note))
+
+    def status(self) -> dict:
+        index = self.index
+        done = sum(phase.completed for phase in index.phases.values())
+        total = len(index.order)
+        return {
+            "completed_tasks": done,
+            "total_tasks": total,
+            "percent": percent(done, total),
+            "time_spent_hours": index.time_spent,
+            "phases": {number: (phase.completed, phase.total) for number, phase in index.phases.items()},
+            "next_up": [(task.task_id, label) for task, label in self._next_up()],
+        }
+
+    def apply(self, event: TaskEvent, force: bool = False):
+        """
+        Apply one progress event and write the file atomically
+
+        Args:
+            event: TaskEvent to apply
+            force: Start a task even if its dependencies are not completed
+
+        Raises:
+            KeyError: Unknown task id
+            ValueError: Unknown event kind, or starting a task with open dependencies
+        """
+        if self._file_stamp() != self._stamp:
+            self._load()  # edited behind our back; re-index before patching
+        index = self.index
+        task = index.tasks.get(event.task_id.replace("Task ", "").strip())
+        if task is None:
+            raise KeyError(f"unknown task {event.task_id!r}")
+        timestamp = event.timestamp or datetime.now().strftime("%Y-%m-%d %H:%M")
+        patches = []
+        activity = []
+
+        if event.kind == "start":
+            open_deps = [dep for dep in task.dependencies
+                         if dep in index.tasks and index.tasks[dep].status != COMPLETED]
+            if open_deps and not force:
+                raise ValueError(f"Task {task.task_id} depends on unfinished "
+                                 + ", ".join(f"Task {dep}" for dep in open_deps))
+            new_status = IN_PROGRESS
+            activity.append(f"- {timestamp}: ▶️ Task {task.task_id} started ({task.name})")
+        elif event.kind == "complete":
+            new_status = COMPLETED
+            spent = f", {format_hours(event.hours)} vs {format_hours(task.estimate_hours)} estimated" \
+                if event.hours is not None else ""
+            activity.append(f"- {timestamp}: ✅ Task {task.task_id} completed ({task.name}{spent})")
+        elif event.kind == "block":
+            new_status = BLOCKED
+            reason = f": {event.note}" if event.note else ""
+            activity.append(f"- {timestamp}: ⛔ Task {task.task_id} blocked{reason}")
+        else:
+            raise ValueError(f"unknown event kind {event.kind!r}")
+
+        was_completed = task.status == COMPLETED
+        if new_status == task.status:
+            return
+        task.status = new_status
+        if was_completed:
+            self._first_open = min(self._first_open, task.order)  # reopened behind the cursor
+        patches.append((task.checkbox, CHECKBOX[new_status].encode()))
+
+        if new_status == COMPLETED or was_completed:
+            delta = 1 if new_status == COMPLETED else -1
+            patches.extend(self._counter_patches(task, delta))
+            if event.hours is not None:
+                index.time_spent += event.hours
+                patches.append(self._log_patch("Time Spent", format_hours(index.time_spent)))
+            if new_status == COMPLETED:
+                for dependent_id in index.dependents.get(task.task_id, ()):
+                    dependent = index.tasks[dependent_id]
+                    if dependent.status == PENDING and self._deps_done(dependent):
+                        activity.append(f"- {timestamp}: 🔓 Task {dependent_id} unlocked "
+                                        f"({dependent.name})")
+
+        patches.append(self._log_patch("Last Updated", timestamp.split(" ")[0]))
+        if index.next_up is not None:
+            block = "".join(f"⏳ Task {t.task_id}: {t.name} ({label})\n"
+                            for t, label in self._next_up()) or "✅ All tasks complete\n"
+            patches.append((index.next_up, block.encode()))
+
+        self._write([patch for patch in patches if patch is not None], activity)
+
+    # -- patch builders ---------------------------------------------------
+
+    def _deps_done(self, task: TaskEntry) -> bool:
+        tasks = self.index.tasks
+        return all(tasks[dep].status == COMPLETED for dep in task.dependencies if dep in tasks)
+
+    def _next_up(self):
+        order = self.index.order
+        while self._first_open < len(order) and order[self._first_open].status == COMPLETED:
+            self._first_open += 1
+        upcoming = []
+        for position in range(self._first_open, len(order)):
+            task = order[position]
+            if task.status == COMPLETED:
+                continue
+            if task.status == IN_PROGRESS:
+                label = "In progress"
+            elif task.status == BLOCKED:
+                label = "Blocked"
+            elif self._deps_done(task):
+                label = "Ready to start"
+            else:
+                label = "Waiting"
+            upcoming.append((task, label))
+            if len(upcoming) >= NEXT_UP_LIMIT:
+                break
+        return upcoming
+
+    def _log_patch(self, field: str, value: str):
+        span = self.index.log.get(field)
+        return (span, value.encode()) if span is not None else None
+
+    def _counter_patches(self, task: TaskEntry, delta: int):
+        index = self.index
+        phase = index.phases.get(task.phase)
+        if phase is not None:
+            phase.completed += delta
+            mark = "x" if phase.completed == phase.total else " "
+            yield (phase.line, f"- [{mark}] Phase {phase.number}: {phase.name} "
+                               f"({phase.completed}/{phase.total} tasks)".encode())
+        done = sum(p.completed for p in index.phases.values())
+        total = len(index.order)
+        if index.overall is not None:
+            yield (index.overall, f"**Overall Progress**: {done}/{total} tasks completed "
+                                  f"({percent(done, total)}%)".encode())
+        yield self._log_patch("Completed Tasks", f"{done}/{total} ({percent(done, total)}%)")
+        index.remaining_hours -= delta * task.estimate_hours
+        yield self._log_patch("Estimated Remaining", format_hours(max(index.remaining_hours, 0.0)))
+        current = next((p for p in sorted(index.phases.values(), key=lambda p: p.number)
+                        if p.completed < p.total), None)
+        yield self._log_patch("Current Phase",
+                              f"Phase {current.number} - {current.name}" if current else "Complete")
+
+    # -- writing ----------------------------------------------------------
+
+    def _write(self, patches, activity: List[str]):
+        import tempfile  # imported on first write so read-only commands start faster
+
+        index = self.index
+        patches.sort(key=lambda patch: patch[0].start)
+        tail = b""
+        if not index.has_activity_log:
+            tail += b"\n" + ACTIVITY_HEADING + b"\n"
+            index.has_activity_log = True
+        tail += "".join(f"{line}\n" for line in activity).encode()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".task.md.", suffix=".tmp")
+        try:
+            with open(self.path, "rb") as src:
+                position = 0
+                for span, replacement in patches:
+                    _copy_range(src.fileno(), fd, position, span.start - position)
+                    os.write(fd, replacement)
+                    position = span.end
+                _copy_range(src.fileno(), fd, position, index.size - position)
+            os.write(fd, tail)
+            os.fsync(fd)
+            os.close(fd)
+            fd = None
+            os.chmod(tmp_path, os.stat(self.path).st_mode & 0o777)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if fd is not None:
+                os.close(fd)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        index.size += sum(len(new) - span.length for span, new in patches) + len(tail)
+        for span, replacement in patches:
+            span.resize(len(replacement))
+        self._stamp = self._file_stamp()
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """Copy count bytes from src_fd at offset to the current position of dst_fd"""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    while count > 0:
+        if copy_file_range is not None:
+            try:
+                copied = copy_file_range(src_fd, dst_fd, count, offset)
+            except OSError:
+                copy_file_range = None
+                continue
+        else:
+            chunk = os.pread(src_fd, min(count, 1 << 20), offset)
+            copied = os.write(dst_fd, chunk) if chunk else 0
+        if copied == 0:
+            break
+        offset += copied
+        count -= copied
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a progress event to task.md")
+    parser.add_argument("task_file", help="Path to task.md")
+    parser.add_argument("event", choices=("start", "complete", "block", "status"))
+    parser.add_argument("task_id", nargs="?", help="Task id, e.g. 2.3")
+    parser.add_argument("--hours", type=float, default=None, help="Actual hours spent (complete)")
+    parser.add_argument("--note", default=None, help="Blocker description (block)")
+    parser.add_argument("--force", action="store_true", help="Start even with unfinished dependencies")
+    parser.add_argument("--store", default=None, help="Also record the event in this progress store")
+    parser.add_argument("--project", default=None, help="Project name in the store (default: task file path)")
+    args = parser.parse_args(argv)
+
+    updater = TaskFileUpdater(args.task_file)
+    if args.event == "status":
+        status = updater.status()
+        print(f"{status['completed_tasks']}/{status['total_tasks']} tasks completed "
+              f"({status['percent']}%)")
+        return 0
+    if not args.task_id:
+        parser.error("task_id is required for start/complete/block")
+    event = TaskEvent(args.event, args.task_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                      args.hours, args.note)
+    store = project = None
+    errors = (KeyError, ValueError, OSError)
+    if args.store:
+        import sqlite3  # only with --store: keeps it off the start-up path of plain updates
+
+        errors += (sqlite3.Error,)
+    try:
+        if args.store:
+            from progress_store import ProgressStore
+
+            store = ProgressStore(args.store)
+            project = args.project or os.path.abspath(args.task_file)
+            if not store.has_project(project):
+                store.register_task_file(project, args.task_file)  # state before this event
+        updater.apply(event._replace(timestamp=event.timestamp[:16]), force=args.force)
+        if store is not None:
+            try:
+                store.record(project, event, force=True)  # dependencies already checked against task.md
+            except sqlite3.Error as exc:
+                import shlex
+
+                # task.md already holds the event; say how to replay it rather than leave the two silently apart
+                replay = ["python", "tools/progress_store.py", "--db", args.store, event.kind, project,
+                          args.task_id, "--at", event.timestamp]
+                if event.hours is not None:
+                    replay += ["--hours", str(event.hours)]
+                if event.note is not None:
+                    replay += ["--note", event.note]
+                print(f"error: {args.task_file} updated but {args.store} was not: {exc}\n"
+                      f"  replay with: {shlex.join(replay)}", file=sys.stderr)
+                return 1
+    except errors as exc:
+        print(f"error: {exc.args[0] if isinstance(exc, KeyError) and exc.args else exc}", file=sys.stderr)
+        return 1
+    finally:
+        if store is not None:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
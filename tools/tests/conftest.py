@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The tools are flat scripts that import each other by module name
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOLS_DIR))
@@ -0,0 +1,24 @@
+import io
+import json
+
+import pytest
+
+from batch import BatchResult, _write_result
+
+
+@pytest.mark.parametrize("key, directory", [
+    ("../../escaped", "escaped"),
+    ("/etc/cron.d", "etc-cron.d"),
+    ("..", "item-3"),
+    ("jane doe", "jane-doe"),
+])
+def test_task_files_stay_inside_tasks_dir(tmp_path, key, directory):
+    tasks_dir = tmp_path / "out" / "tasks"
+    result = BatchResult(3, key, {"progress_tracker": {}, "task_file_content": "# Tasks\n"}, None, 1.0)
+    out = io.StringIO()
+    _write_result(out, result, tasks_dir)
+    record = json.loads(out.getvalue())
+    assert record["id"] == key
+    assert record["task_file"] == str(tasks_dir / directory / "task.md")
+    assert [path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("task.md")] == [
+        f"out/tasks/{directory}/task.md"]
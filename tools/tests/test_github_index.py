@@ -0,0 +1,27 @@
+from github_index import ProjectIndex, _score
+
+
+def api_entry(name, stars, language):
+    return {"api": {"name": name, "full_name": f"jane/{name}", "stars": stars,
+                    "languages": {language: 10_000}, "pushed_at": "2025-08-01T00:00:00Z"}}
+
+
+def test_relevance_is_capped_at_one():
+    topics = ["react", "vite", "tailwind", "node", "graphql", "docker", "redis"]
+    entry = {"name": "app", "languages": {"TypeScript": 1000}, "topics": topics}
+    _, _, parts = _score(entry, {"typescript", *topics}, now=0.0)
+    assert parts["relevance"] == 1.0
+
+
+def test_featured_projects_come_from_the_limited_list(tmp_path):
+    index = ProjectIndex(tmp_path / "index.json")
+    index.repos = {
+        "jane/web-a": api_entry("web-a", 100, "TypeScript"),
+        "jane/web-b": api_entry("web-b", 90, "TypeScript"),
+        "jane/web-c": api_entry("web-c", 80, "TypeScript"),
+        "jane/ops-a": api_entry("ops-a", 5, "Shell"),
+        "jane/ops-b": api_entry("ops-b", 4, "Shell"),
+    }
+    projects = index.projects(featured=3, limit=3, now=1.76e9)
+    assert [project["id"] for project in projects] == ["web-a", "web-b", "web-c"]
+    assert all(project["featured"] for project in projects)
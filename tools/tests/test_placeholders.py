@@ -0,0 +1,36 @@
+import pytest
+
+from placeholders import Substituter, substitute, substitute_file
+
+VALUES = {"User Name": "Jane Doe", "Current Date": "2025-08-28", "Estimated Date": None}
+TEXT = (
+    "# Portfolio for [User Name]\n"
+    "Started [Current Date], done by [Estimated Date].\n"
+    "Literal `[User Name]` stays quoted; [Mystery Field] is unknown, [not a token] is prose.\n"
+    "Trailing [User Name]"
+)
+
+
+def test_one_shot():
+    out, report = substitute(TEXT, VALUES)
+    assert out.startswith("# Portfolio for Jane Doe\nStarted 2025-08-28, done by [Estimated Date].")
+    assert "`[User Name]`" in out and out.endswith("Trailing Jane Doe")
+    assert report.replaced == {"[User Name]": 2, "[Current Date]": 1}
+    assert report.unresolved == {"[Estimated Date]": 1}
+    assert report.unknown == {"[Mystery Field]": 1}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64])
+def test_streaming_matches_one_shot(tmp_path, chunk_size):
+    expected, expected_report = substitute(TEXT, VALUES)
+
+    chunks = [TEXT[start:start + chunk_size] for start in range(0, len(TEXT), chunk_size)]
+    substituter = Substituter(VALUES)
+    assert "".join(substituter.stream(chunks)) == expected
+    assert substituter.report.as_dict() == expected_report.as_dict()
+
+    source, destination = tmp_path / "in.md", tmp_path / "out.md"
+    source.write_text(TEXT, encoding="utf-8")
+    report = substitute_file(source, destination, VALUES, chunk_size=chunk_size)
+    assert destination.read_text(encoding="utf-8") == expected
+    assert report.as_dict() == expected_report.as_dict()
@@ -0,0 +1,54 @@
+import pytest
+
+from prd_index import PRDIndex, detect_focus, estimate_tokens
+
+PRD = """# Portfolio PRD
+Intro text for every plan.
+
+## Executive Summary
+Why the site exists.
+
+## Feature Specifications
+### Hero Section
+Animated hero.
+### Navigation
+Sticky nav.
+
+## Deployment Strategy
+GitHub Actions.
+
+## Skills Showcase
+Skill bars.
+"""
+
+
+@pytest.mark.parametrize("resume, focus", [
+    ("Frontend developer. JavaScript, TypeScript, React, CSS", "frontend"),
+    ("JavaScript and React single-page apps", "frontend"),
+    ("Java services with Spring, REST APIs and PostgreSQL", "backend"),
+    ("Linux administrator; ran the mail server", None),
+    ("Email campaigns and detail-oriented reporting", None),
+    ("Machine learning with PyTorch, NLP and AI agents", "ai-ml"),
+    ("React frontend and Django APIs on Postgres, Node.js services", "full-stack"),
+    ("", None),
+])
+def test_detect_focus_matches_whole_words(resume, focus):
+    assert detect_focus(resume) == focus
+
+
+def test_score_uses_whole_words():
+    index = PRDIndex(PRD)
+    assert index.score(index.get("Feature Specifications"), "frontend") > 0
+    assert index.score(index.get("Deployment Strategy"), "frontend") == 0
+    assert index.score(index.get("Executive Summary"), None) == 100.0
+
+
+def test_select_counts_the_preamble():
+    index = PRDIndex(PRD)
+    full = index.select()
+    assert full.text.startswith("# Portfolio PRD")
+    assert full.tokens == estimate_tokens(full.text)
+    budget = estimate_tokens(index.preamble) + 5
+    small = index.select("frontend", budget)
+    assert small.tokens <= budget
+    assert index.select("frontend", 1).tokens <= 1
@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+import precompress
+
+
+@pytest.fixture
+def dist(tmp_path):
+    root = tmp_path / "dist"
+    (root / "assets").mkdir(parents=True)
+    (root / "index.html").write_text('<script type="module" src="/assets/index-abc.js"></script>',
+                                     encoding="utf-8")
+    (root / "assets" / "index-abc.js").write_text("console.log('hi');\n" * 200, encoding="utf-8")
+    return root
+
+
+def budgets(tmp_path, max_kb):
+    path = tmp_path / "budgets.json"
+    path.write_text(json.dumps({"budgets": [
+        {"name": "entry chunk", "pattern": "assets/index-*.js", "max_kb": max_kb},
+        {"name": "initial load", "initial": True, "max_kb": max_kb},
+    ]}), encoding="utf-8")
+    return path
+
+
+def run(dist, budget_file, *extra):
+    return precompress.main([str(dist), "--budgets", str(budget_file), "--no-cache", "--no-write",
+                             "--quiet", *extra])
+
+
+def test_within_budget_exits_zero(tmp_path, dist):
+    assert run(dist, budgets(tmp_path, 10)) == 0
+
+
+def test_over_budget_exits_one(tmp_path, dist, capsys):
+    (dist / "assets" / "index-abc.js").write_bytes(os.urandom(20 * 1024))  # incompressible
+    assert run(dist, budgets(tmp_path, 10)) == 1
+    assert "BUDGET EXCEEDED: 2 of 2 budgets" in capsys.readouterr().err
+
+
+def test_report_records_each_budget(tmp_path, dist):
+    report_path = tmp_path / "report.json"
+    assert run(dist, budgets(tmp_path, 10), "--report", str(report_path)) == 0
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert [(budget["name"], budget["ok"]) for budget in report["budgets"]] == [
+        ("entry chunk", True), ("initial load", True)]
+
+
+def test_missing_dist_or_bad_config_exits_one(tmp_path, dist):
+    assert run(tmp_path / "missing", budgets(tmp_path, 10)) == 1
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"budgets": [{"name": "no limit", "pattern": "*.js"}]}), encoding="utf-8")
+    assert run(dist, bad) == 1
+    assert not any(path.suffix in (".gz", ".br") for path in dist.rglob("*"))
@@ -0,0 +1,80 @@
+import random
+import sqlite3
+
+import pytest
+
+from progress_store import ProgressStore, _Transaction
+from task_model import COMPLETED, IN_PROGRESS, default_plan
+
+PLAN = default_plan("Jane Doe", "2025-08-28", "2025-09-04")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(tmp_path / "progress.db", snapshot_interval=16)
+    store.register_plan("jane", PLAN, timestamp="2025-08-28 09:00")
+    yield store
+    store.close()
+
+
+def test_events_update_materialized_state(store):
+    assert store.start("jane", "1.1", timestamp="2025-08-28 09:00") is not None
+    assert store.start("jane", "1.1") is None  # no change, no event
+    store.complete("jane", "1.1", hours=1.5, timestamp="2025-08-28 10:30")
+    status = store.status("jane")
+    assert status["completed_tasks"] == 1
+    assert status["time_spent_hours"] == 1.5
+    assert status["next_up"][0][0] == "1.2"
+    with pytest.raises(ValueError, match="depends on unfinished"):
+        store.start("jane", "2.1")
+    with pytest.raises(KeyError):
+        store.start("jane", "9.9")
+
+
+def test_replay_matches_materialized_state(store):
+    task_ids = [task.task_id for phase in PLAN.phases for task in phase.tasks]
+    rng = random.Random(3)
+    for step in range(100):
+        kind = rng.choice(("start", "complete", "block"))
+        task_id = rng.choice(task_ids)
+        timestamp = f"2025-08-28 {step // 60:02d}:{step % 60:02d}"
+        if kind == "start":
+            store.start("jane", task_id, timestamp, force=True)
+        elif kind == "complete":
+            store.complete("jane", task_id, rng.choice((None, 0.5, 2.0)), timestamp)
+        else:
+            store.block("jane", task_id, "waiting", timestamp)
+    before = store.status("jane")
+    materialized = {row["task_id"]: tuple(row[key] for key in
+                                          ("status", "started_at", "completed_at", "actual_hours", "blocker"))
+                    for row in store._connection().execute("SELECT * FROM tasks")}
+    assert {task_id: tuple(state) for task_id, state in store.state_at("jane").items()} == materialized
+    assert store.rebuild("jane") == before
+
+
+def test_state_at_earlier_event(store):
+    first = store.start("jane", "1.1", "2025-08-28 09:00")
+    store.complete("jane", "1.1", 1.0, "2025-08-28 10:00")
+    assert store.state_at("jane", first)["1.1"].status == IN_PROGRESS
+    assert store.state_at("jane")["1.1"].status == COMPLETED
+
+
+def test_next_up_reads_the_open_task_index(store):
+    conn = store._connection()
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT task_id, status, dependencies FROM tasks "
+        "WHERE project_id = 1 AND status != 'completed' ORDER BY position LIMIT 3"))
+    assert "tasks_open" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_failed_commit_rolls_back():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+    conn.execute("CREATE TABLE child (parent REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)")
+    conn.execute("PRAGMA foreign_keys=ON")
+    with pytest.raises(sqlite3.IntegrityError):
+        with _Transaction(conn) as tx:
+            tx.execute("INSERT INTO child VALUES (1)")  # fails only at COMMIT
+    assert not conn.in_transaction
+    assert conn.execute("SELECT count(*) FROM child").fetchone()[0] == 0
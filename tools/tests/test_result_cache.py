@@ -0,0 +1,67 @@
+import pytest
+
+import result_cache
+import tokenizer
+from result_cache import ResultCache, prompt_version
+
+RESUME = "Jane Doe\nEngineer\n"
+PRD = "# PRD\n\n## Executive Summary\nText.\n"
+
+
+@pytest.fixture
+def default_tokenizer():
+    name = tokenizer.default_tokenizer_name()
+    yield
+    tokenizer.set_default_tokenizer(name)
+
+
+def test_whitespace_only_edits_share_a_key():
+    cache = ResultCache("prompt")
+    assert cache.make_key(RESUME, PRD).digest == cache.make_key("Jane Doe  \r\nEngineer\n\n\n", PRD).digest
+    assert cache.make_key(RESUME, PRD).digest != cache.make_key(RESUME, PRD, focus="frontend").digest
+
+
+def test_key_covers_the_default_tokenizer(default_tokenizer):
+    cache = ResultCache("prompt")
+    tokenizer.set_default_tokenizer("chars")
+    chars = cache.make_key(RESUME, PRD).digest
+    tokenizer.set_default_tokenizer("regex")
+    assert cache.make_key(RESUME, PRD).digest != chars
+
+
+def test_version_covers_prompt_and_generator_code():
+    assert prompt_version("a", "code") != prompt_version("b", "code")
+    assert prompt_version("a", "code") != prompt_version("a", "edited code")
+    assert prompt_version("a") == prompt_version("a", result_cache.generator_hash())
+
+
+def test_generator_change_purges_the_disk_tier(tmp_path, monkeypatch):
+    cache = ResultCache("prompt", cache_dir=tmp_path)
+    key = cache.make_key(RESUME, PRD)
+    cache.put(key, {"task_file_content": "old"})
+    assert ResultCache("prompt", cache_dir=tmp_path).get(key) == {"task_file_content": "old"}
+
+    monkeypatch.setattr(result_cache, "_generator_hash", "edited task template")
+    fresh = ResultCache("prompt", cache_dir=tmp_path)
+    assert fresh.invalidations == 1
+    assert fresh.get(fresh.make_key(RESUME, PRD)) is None
+
+
+def test_each_tier_reports_its_own_hit_rate(tmp_path):
+    import instrumentation
+
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        cache = ResultCache("prompt", cache_dir=tmp_path)
+        key = cache.make_key(RESUME, PRD)
+        assert cache.get(key) is None                 # memory miss, disk miss
+        cache.put(key, {"task_file_content": "x"})
+        assert cache.get(key) is not None             # memory hit
+        reopened = ResultCache("prompt", cache_dir=tmp_path)
+        assert reopened.get(key) is not None          # memory miss, disk hit
+        rates = instrumentation.snapshot()["cache_hit_rates"]
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert rates == {"result": round(1 / 3, 4), "result_disk": 0.5}
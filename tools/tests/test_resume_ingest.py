@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from resume_ingest import collect_fields, extract_name, iter_fields, parse_fields
+
+CV_PATH = Path(__file__).resolve().parents[2] / "public" / "Mantej-Singh CV.pdf"
+
+TEXT_RESUME = """Jane Doe
+Senior Software Engineer
+jane@example.com | github.com/janedoe
+
+Experience
+Initech
+Backend Engineer
+Jan 2020 - Present
+- Built the billing service
+- Cut p99 latency by 40%
+
+Globex
+Data Analyst
+2017 - 2019
+Reported on sales
+  across regions
+
+Skills
+Python, React, AWS
+Jersey City, NJ
+"""
+
+
+def summarize(text: str) -> dict:
+    return collect_fields(parse_fields([text]))
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Jane Doe\nEngineer", "Jane Doe"),
+    ("Jane Doe, PhD\nEngineer", "Jane Doe"),
+    ("Jane Doe | Software Engineer", "Jane Doe"),
+    ("Mary-Jane O'Neil - Designer", "Mary-Jane O'Neil"),
+    ("Software Engineer\nJane Doe", "Jane Doe"),
+    ("resume\n", None),
+])
+def test_extract_name(text, name):
+    assert extract_name(text) == name
+
+
+def test_text_resume_entries():
+    summary = summarize(TEXT_RESUME)
+    assert summary["name"] == "Jane Doe"
+    assert summary["title"] == "Senior Software Engineer"
+    assert summary["emails"] == ["jane@example.com"]
+    first, second = summary["experience"]
+    assert (first["company"], first["role"], first["period"]) == ("Initech", "Backend Engineer", "Jan 2020 - Present")
+    assert first["bullets"] == ["Built the billing service", "Cut p99 latency by 40%"]
+    assert (second["company"], second["role"]) == ("Globex", "Data Analyst")
+    assert second["bullets"] == ["Reported on sales across regions"]
+    assert summary["skills"] == ["Python", "React", "AWS"]
+
+
+def test_bundled_cv():
+    pytest.importorskip("pypdf")
+    summary = collect_fields(iter_fields(CV_PATH))
+    assert summary["name"] == "Mantej Singh Dhanjal"
+    assert summary["title"] == "Business Intelligence Analyst"
+    companies = [entry.get("company") for entry in summary["experience"]]
+    assert companies == ["Insight Global", "Citi", "Alpha IT Partners", "Bluefly", "Accenture"]
+    for entry in summary["experience"]:
+        assert entry["role"] and entry["bullets"]
+        assert entry.get("company") not in entry["bullets"]
+    assert summary["experience"][-1]["location"] == "Mumbai, India"
+    assert {"Python", "SQL", "ETL"} <= set(summary["skills"])
+    assert not {"NJ", "Warren"} & set(summary["skills"])
+    assert len(summary["projects"]) == 4
@@ -0,0 +1,67 @@
+import pytest
+
+from task_graph import CycleError, TaskGraph
+from task_model import BLOCKED, COMPLETED, IN_PROGRESS, default_plan
+
+
+def chain():
+    graph = TaskGraph()
+    graph.add_task("a", 1.0)
+    graph.add_task("b", 2.0, ["a"])
+    graph.add_task("c", 3.0, ["b"])
+    return graph
+
+
+def test_complete_unlocks_dependents():
+    graph = chain()
+    assert graph.ready_tasks() == ["a"]
+    assert graph.complete("a") == ["b"]
+    assert graph.ready_tasks() == ["b"]
+    assert graph.complete("a") == []
+
+
+def test_start_checks_dependencies():
+    graph = chain()
+    with pytest.raises(ValueError, match="Task a"):
+        graph.start("b")
+    graph.start("b", force=True)
+    assert graph.status("b") == IN_PROGRESS
+
+
+def test_reopening_a_task_relocks_dependents():
+    graph = chain()
+    graph.complete("a", actual_hours=5.0)
+    assert graph.schedule().duration == 10.0
+    graph.start("a")
+    assert graph.status("a") == IN_PROGRESS
+    assert graph.ready_tasks() == []
+    with pytest.raises(ValueError):
+        graph.start("b")
+    assert graph.schedule().duration == 6.0  # back on the estimate
+    assert graph.complete("a") == ["b"]
+
+
+def test_blocking_a_completed_task_relocks_dependents():
+    graph = chain()
+    graph.complete("a")
+    graph.block("a")
+    assert graph.status("a") == BLOCKED
+    assert not graph.is_ready("b")
+
+
+def test_cycle_reports_path():
+    graph = TaskGraph()
+    graph.add_task("a", 1.0, ["b"])
+    graph.add_task("b", 1.0, ["a"])
+    with pytest.raises(CycleError):
+        graph.schedule()
+
+
+def test_default_plan_summary():
+    plan = default_plan("Jane Doe", "2025-08-28", "2025-09-04")
+    graph = TaskGraph.from_plan(plan)
+    summary = graph.summary()
+    assert summary["ready_tasks"] == ["1.1"]
+    first = summary["critical_path"][0]
+    graph.complete(first)
+    assert graph.status(first) == COMPLETED
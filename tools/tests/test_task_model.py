@@ -0,0 +1,26 @@
+import pytest
+
+from task_model import Phase, Task, TaskPlan, default_plan, hours_range, render_task_file
+
+
+@pytest.mark.parametrize("hours, expected", [(10.75, "8-13"), (10, "8-12"), (2, "1-3"), (0.5, "1")])
+def test_hours_range(hours, expected):
+    assert hours_range(hours) == expected
+
+
+def test_estimated_range_follows_the_task_estimates():
+    plan = default_plan("Jane Doe", "2025-08-28", "2025-09-04")
+    expected = hours_range(sum(task.estimate_hours for task in plan.tasks()))
+    assert plan.estimated_range == expected
+    assert plan.progress_tracker()["estimated_hours"] == expected
+    assert f"- **Estimated Total Time**: {expected} hours" in render_task_file(plan)
+
+    phase = plan.phases[-1]
+    plan.add_task(phase, Task("9.9", "Extra polish", 5, "Low"))
+    assert plan.estimated_range == hours_range(sum(task.estimate_hours for task in plan.tasks()))
+
+
+def test_explicit_estimated_range_wins():
+    plan = TaskPlan("Jane Doe", "2025-08-28", "2025-09-04", estimated_range="3-4")
+    plan.add_phase(Phase(1, "Only", [Task("1.1", "One", 20, "High")]))
+    assert plan.progress_tracker()["estimated_hours"] == "3-4"
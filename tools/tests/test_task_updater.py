@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from task_model import default_plan, render_task_file
+from task_updater import TaskFileUpdater
+
+
+@pytest.fixture
+def task_file(tmp_path):
+    path = tmp_path / "task.md"
+    path.write_text(render_task_file(default_plan("Jane Doe", "2025-08-28", "2025-09-04")), encoding="utf-8")
+    return path
+
+
+def next_up_block(path) -> str:
+    text = path.read_text(encoding="utf-8")
+    return "\n".join(line for line in text.splitlines() if line.startswith("⏳ Task"))
+
+
+def test_complete_updates_counters_and_log(task_file):
+    updater = TaskFileUpdater(task_file)
+    updater.start("1.1", timestamp="2025-08-28 09:00")
+    updater.complete("1.1", hours=1.5, timestamp="2025-08-28 10:30")
+    status = updater.status()
+    assert status["completed_tasks"] == 1
+    assert status["time_spent_hours"] == 1.5
+    assert status["next_up"][0] == ("1.2", "Ready to start")
+    text = task_file.read_text(encoding="utf-8")
+    assert "✅ Task 1.1 completed" in text
+    assert TaskFileUpdater(task_file).status() == status
+
+
+def test_dependencies_are_enforced(task_file):
+    updater = TaskFileUpdater(task_file)
+    with pytest.raises(ValueError, match="depends on unfinished"):
+        updater.start("1.2")
+    with pytest.raises(KeyError):
+        updater.start("9.9")
+
+
+def test_reopened_task_shows_in_next_up(task_file):
+    updater = TaskFileUpdater(task_file)
+    updater.complete("1.1", timestamp="2025-08-28 10:00")
+    updater.start("1.1", timestamp="2025-08-28 11:00")
+    assert updater.status()["next_up"][0] == ("1.1", "In progress")
+    fresh = TaskFileUpdater(task_file)
+    assert updater.status() == fresh.status()
+    assert next_up_block(task_file).splitlines()[0].startswith("⏳ Task 1.1")
+
+
+def test_incremental_index_matches_reparse(task_file):
+    updater = TaskFileUpdater(task_file)
+    task_ids = [task.task_id for task in updater.index.order]
+    rng = random.Random(7)
+    for step in range(60):
+        kind = rng.choice(("start", "complete", "block"))
+        getattr(updater, kind)(rng.choice(task_ids), timestamp=f"2025-08-28 {step // 60:02d}:{step % 60:02d}",
+                               **({"force": True} if kind == "start" else {}))
+    assert updater.status() == TaskFileUpdater(task_file).status()
@@ -0,0 +1,104 @@
+"""
+Offline Token Counting
+======================
+
+Pluggable token counters for PRD budgets and prompt accounting. Nothing here
+talks to a provider; counts are local estimates.
+
+Built-in tokenizers:
+- "chars":    ~4 characters per token (default; cheapest)
+- "regex":    words, numbers, punctuation and whitespace runs, with long words
+              costing one token per 4 characters; closer to BPE counts on
+              markdown and code
+- "tiktoken": exact cl100k_base counts, if tiktoken is installed (a proxy for
+              other providers' tokenizers)
+
+The default can be chosen with the PORTFOLIO_TOKENIZER environment variable or
+set_default_tokenizer(). Custom counters are plain callables taking a string.
+
+Usage:
+    count_tokens(text)                 # default tokenizer
+    count_tokens(text, "regex")
+    register_tokenizer("mine", lambda text: len(text.split()))
+    set_default_tokenizer("mine")
+"""
+
+import os
+import re
+from typing import Callable, Dict, Union
+
+TokenCounter = Callable[[str], int]
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\w\s]|\s+|\w+", re.UNICODE)
+
+
+def count_chars(text: str) -> int:
+    """~4 characters per token for English/markdown"""
+    return (len(text) + 3) // 4
+
+
+def count_regex(text: str) -> int:
+    """Count word/number/punctuation/whitespace pieces; long words split every 4 characters"""
+    tokens = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        if piece[0].isspace():
+            tokens += 1 if "\n" in piece or len(piece) > 1 else 0  # single spaces merge into the next word
+        else:
+            tokens += (len(piece) + 3) // 4 if len(piece) > 6 else 1
+    return tokens
+
+
+def _load_tiktoken() -> TokenCounter:
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError("the 'tiktoken' tokenizer requires tiktoken (pip install tiktoken)") from None
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+_registry: Dict[str, TokenCounter] = {"chars": count_chars, "regex": count_regex}
+_lazy: Dict[str, Callable[[], TokenCounter]] = {"tiktoken": _load_tiktoken}
+_default_name = "chars"
+
+
+def register_tokenizer(name: str, counter: TokenCounter):
+    _registry[name] = counter
+
+
+def get_tokenizer(name: str = None) -> TokenCounter:
+    """Counter registered under name (default tokenizer if None)"""
+    name = name or _default_name
+    if name not in _registry:
+        if name not in _lazy:
+            raise KeyError(f"unknown tokenizer {name!r}; available: {', '.join(available_tokenizers())}")
+        _registry[name] = _lazy.pop(name)()
+    return _registry[name]
+
+
+def available_tokenizers():
+    return sorted(set(_registry) | set(_lazy))
+
+
+def set_default_tokenizer(tokenizer: Union[str, TokenCounter]):
+    """Select the default by name, or register and select a callable"""
+    global _default_name
+    if callable(tokenizer):
+        name = getattr(tokenizer, "__name__", "custom")
+        register_tokenizer(name, tokenizer)
+        tokenizer = name
+    get_tokenizer(tokenizer)  # fail early on unknown names / missing packages
+    _default_name = tokenizer
+
+
+def default_tokenizer_name() -> str:
+    return _default_name
+
+
+def count_tokens(text: str, tokenizer: str = None) -> int:
+    return get_tokenizer(tokenizer)(text)
+
+
+if os.environ.get("PORTFOLIO_TOKENIZER"):
+    set_default_tokenizer(os.environ["PORTFOLIO_TOKENIZER"])
@@ -0,0 +1,568 @@
+"""
+Watch Mode
+==========
+
+Regenerates only the artifacts whose inputs changed while the resume, the PRD,
+the data JSON or the prompt are being edited.
+
+Inputs are split into sections, each with a content hash:
+
+    resume:name        name, title, email, links      (resume_ingest fields)
+    resume:skills      skills section
+    resume:experience  experience entries
+    resume:projects    project entries
+    resume:focus       technical focus detected from the whole text
+    prd:<section>      each top-level section of PRODUCT_REQUIREMENTS_DOCUMENT.md
+    data:<key>         top-level keys of the data_emitter JSON (--data)
+    system_prompt      the SYSTEM_PROMPT text (prompt_template.py)
+
+and every artifact lists the sections it is built from (DEPENDENCIES):
+
+    prd_context        -> plan JSON "prd_context"       <- prd:*, resume:focus
+    task_file          -> task.md header                <- resume:name
+    progress_tracker   -> plan JSON "progress_tracker"  <- resume:name
+    skills             -> skills JSON (skill_scoring)   <- resume:skills/experience/projects, data:projects
+    personal.ts,
+    experience.ts,
+    projects.ts        -> src/data/*.ts (data_emitter)  <- data:personal/socialLinks/contact, ...
+
+A save that leaves a section's hash unchanged rebuilds nothing; a change to
+SYSTEM_PROMPT itself rebuilds everything. An existing task.md only gets its
+header rewritten, so recorded progress survives a name change.
+
+File events come from inotify (via ctypes, watching the parent directories so
+editors that save by rename are seen) with a stat-polling fallback; bursts of
+events are debounced into one rebuild.
+
+Usage:
+    python tools/watch.py resume.pdf --output plan.json --task-file tools/tasks/task.md
+    python tools/watch.py resume.txt --data resume.json --data-dir src/data --skills skills.json
+    python tools/watch.py resume.txt --output plan.json --once      # one incremental pass
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import importlib
+import json
+import os
+import select
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+TOOLS_DIR = Path(__file__).resolve().parent
+DEFAULT_PRD = TOOLS_DIR / "PRODUCT_REQUIREMENTS_DOCUMENT.md"
+PROMPT_SOURCE = TOOLS_DIR / "prompt_template.py"
+
+DEBOUNCE_SECONDS = 0.2
+MAX_DELAY_SECONDS = 2.0
+POLL_INTERVAL = 0.5
+
+# artifact -> input sections it is built from ("prefix:*" matches every section under prefix)
+DEPENDENCIES = {
+    "prd_context": ("prd:*", "resume:focus"),
+    "task_file": ("resume:name",),
+    "progress_tracker": ("resume:name",),
+    "skills": ("resume:skills", "resume:experience", "resume:projects", "data:projects"),
+    "personal.ts": ("data:personal", "data:socialLinks", "data:contact"),
+    "experience.ts": ("data:experiences",),
+    "projects.ts": ("data:projects",),
+}
+FULL_REBUILD = "system_prompt"
+
+
+def _digest(value) -> str:
+    if not isinstance(value, (str, bytes)):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def affected(changed: Iterable[str], dependencies: Dict[str, tuple] = DEPENDENCIES) -> Set[str]:
+    """Artifacts depending on any of the changed sections"""
+    changed = set(changed)
+    if FULL_REBUILD in changed:
+        return set(dependencies)
+    prefixes = {key.split(":", 1)[0] for key in changed}
+    result = set()
+    for artifact, inputs in dependencies.items():
+        for key in inputs:
+            if key in changed or (key.endswith(":*") and key[:-2] in prefixes):
+                result.add(artifact)
+                break
+    return result
+
+
+# -- file watchers ----------------------------------------------------------
+
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify on the parent directories of the watched files"""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, paths: Iterable):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("libc has no inotify support")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = [Path(path).resolve() for path in paths]
+        self._dirs: Dict[int, Path] = {}
+        self._names: Dict[Path, Set[str]] = {}
+        for path in self.paths:
+            self._names.setdefault(path.parent, set()).add(path.name)
+        for directory in self._names:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                self.close()
+                raise OSError(error, f"cannot watch {directory}")
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Watched paths touched within timeout seconds (empty set on timeout)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return set(self.paths)
+                directory = self._dirs.get(wd)
+                if directory is not None and os.fsdecode(name) in self._names[directory]:
+                    changed.add(directory / os.fsdecode(name))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback: compares (mtime, size, inode) every interval"""
+
+    def __init__(self, paths: Iterable, interval: float = POLL_INTERVAL):
+        self.paths = [Path(path).resolve() for path in paths]
+        self.interval = interval
+        self._stamps = {path: self._stamp(path) for path in self.paths}
+
+    @staticmethod
+    def _stamp(path: Path):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                stamp = self._stamp(path)
+                if stamp != self._stamps[path]:
+                    self._stamps[path] = stamp
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths: Iterable, poll: bool = False, interval: float = POLL_INTERVAL):
+    """inotify where available, polling otherwise (or when poll=True)"""
+    paths = list(paths)
+    if not poll:
+        try:
+            return InotifyWatcher(paths)
+        except OSError:
+            pass
+    return PollingWatcher(paths, interval)
+
+
+def wait_for_changes(watcher, debounce: float = DEBOUNCE_SECONDS, max_delay: float = MAX_DELAY_SECONDS,
+                     timeout: Optional[float] = None) -> Set[Path]:
+    """
+    Block until something changes, then keep collecting until `debounce`
+    seconds pass without events (or `max_delay` after the first one)
+    """
+    changed = watcher.wait(timeout)
+    if not changed:
+        return changed
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = min(debounce, deadline - time.monotonic())
+        if remaining <= 0:
+            break
+        more = watcher.wait(remaining)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+# -- input sections ---------------------------------------------------------
+
+def resume_sections(path) -> Dict[str, str]:
+    from prd_index import detect_focus
+    from resume_ingest import collect_fields, iter_fields, read_resume
+
+    summary = collect_fields(iter_fields(path))
+    return {
+        "resume:name": _digest([summary["name"], summary["title"], summary["emails"], summary["links"]]),
+        "resume:skills": _digest(summary["skills"]),
+        "resume:experience": _digest(summary["experience"]),
+        "resume:projects": _digest(summary["projects"]),
+        "resume:focus": _digest(detect_focus(read_resume(path)) or ""),
+    }
+
+
+def prd_sections(path) -> Dict[str, str]:
+    from prd_index import PRDIndex
+
+    index = PRDIndex(Path(path).read_text(encoding="utf-8"))
+    sections = {"prd:_preamble": _digest(index.preamble)}
+    for number, section in enumerate(index.sections):
+        sections[f"prd:{number}:{section.slug}"] = _digest(section.text)
+    return sections
+
+
+def data_sections(path) -> Dict[str, str]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {f"data:{key}": _digest(value) for key, value in data.items()}
+
+
+def prompt_sections(path) -> Dict[str, str]:
+    """Reload prompt_template so the edited SYSTEM_PROMPT is the one used from now on"""
+    module = sys.modules.get("prompt_template")
+    module = importlib.reload(module) if module is not None else importlib.import_module("prompt_template")
+    system_prompt = sys.modules.get("system_prompt")
+    if system_prompt is not None:
+        system_prompt.__dict__.pop("SYSTEM_PROMPT", None)  # drop the lazily cached copy
+    return {FULL_REBUILD: _digest(module.SYSTEM_PROMPT)}
+
+
+# -- session ----------------------------------------------------------------
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Atomically replace path with content unless it already holds exactly that"""
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(content)
+        os.chmod(tmp_path, mode)  # keep task.md's mode; new files get what open() would have made
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+class WatchSession:
+    """
+    Section fingerprints, built artifacts and the incremental rebuild step
+
+    Args:
+        resume: Resume file (PDF, text/markdown or JSON)
+        prd: PRD markdown (None to skip prd_context)
+        output: Plan JSON to keep up to date (generate's result without the prompt)
+        task_file: task.md to create, or whose header to keep in sync
+        data: data_emitter JSON; enables the src/data/*.ts artifacts
+        data_dir: Where the TypeScript data modules live
+        skills: Skill scores JSON to keep up to date (needs numpy)
+        name, focus, budget: As for `system_prompt.py generate`
+    """
+
+    def __init__(self, resume, prd=DEFAULT_PRD, output=None, task_file=None, data=None, data_dir=None,
+                 skills=None, name: str = None, focus: str = None, budget: int = None,
+                 log: Callable[[str], None] = None):
+        self.inputs: Dict[Path, Callable[[Path], Dict[str, str]]] = {Path(resume).resolve(): resume_sections}
+        if prd:
+            self.inputs[Path(prd).resolve()] = prd_sections
+        if data:
+            self.inputs[Path(data).resolve()] = data_sections
+        self.inputs[PROMPT_SOURCE] = prompt_sections
+        self.resume = Path(resume).resolve()
+        self.prd = Path(prd).resolve() if prd else None
+        self.data = Path(data).resolve() if data else None
+        self.output = Path(output) if output else None
+        self.task_file = Path(task_file) if task_file else None
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.skills = Path(skills) if skills else None
+        self.name, self.focus, self.budget = name, focus, budget
+        self.log = log or (lambda message: print(message, file=sys.stderr))
+        self.sections: Dict[str, str] = {}
+        self.parts: dict = {}
+        self.pending: Set[str] = set()   # artifacts whose last build failed
+        self.builds = 0
+
+    @property
+    def paths(self) -> List[Path]:
+        return list(self.inputs)
+
+    def enabled(self) -> Set[str]:
+        artifacts = set()
+        if self.output or self.task_file:
+            artifacts |= {"task_file", "progress_tracker"} if self.task_file else {"progress_tracker"}
+        if self.output and self.prd:
+            artifacts.add("prd_context")
+        if self.skills:
+            artifacts.add("skills")
+        if self.data:
+            artifacts |= {"personal.ts", "experience.ts", "projects.ts"}
+        return artifacts
+
+    def refresh(self, changed_paths: Iterable = None) -> Dict[str, str]:
+        """
+        Re-fingerprint changed inputs (all on the first call) and rebuild what they feed
+
+        Returns:
+            artifact -> "rebuilt" / "unchanged" for every artifact that was considered
+        """
+        paths = self.paths if changed_paths is None or not self.sections else \
+            [Path(path).resolve() for path in changed_paths if Path(path).resolve() in self.inputs]
+        first = not self.sections
+        # Fingerprint every input before touching self.sections: if one raises, none of the
+        # others' new hashes are stored without the rebuild they call for
+        fingerprints = []
+        for path in paths:
+            try:
+                fingerprints.append(self.inputs[path](path))
+            except FileNotFoundError:
+                continue  # mid-save rename; the next event brings the new file
+        sections = dict(self.sections)
+        changed = set()
+        for current in fingerprints:
+            prefix = next(iter(current)).split(":", 1)[0] if current else None
+            previous = {key: value for key, value in sections.items()
+                        if prefix and key.split(":", 1)[0] == prefix}
+            for key in set(previous) | set(current):
+                if previous.get(key) != current.get(key):
+                    changed.add(key)
+            for key in set(previous) - set(current):
+                del sections[key]
+            sections.update(current)
+
+        targets = self.enabled() if first else (affected(changed) | self.pending) & self.enabled()
+        if not targets:
+            self.sections = sections
+            return {}
+        self.builds += 1
+        if changed and not first:
+            self.log(f"changed: {', '.join(sorted(changed))}")
+        report = self._build(targets)
+        self.sections = sections  # failed artifacts are in self.pending and retried next time
+        for artifact, state in sorted(report.items()):
+            self.log(f"{state:>9}  {artifact}")
+        return report
+
+    # -- builders ---------------------------------------------------------
+
+    def _build(self, targets: Set[str]) -> Dict[str, str]:
+        """Build targets; a failing artifact is reported and retried on the next refresh"""
+        report = {}
+        self.pending -= targets
+
+        def attempt(names, build):
+            try:
+                report.update(build())
+            except (OSError, ValueError, KeyError, ImportError) as exc:
+                self.pending.update(names)
+                report.update({name: f"failed ({exc})" for name in names})
+
+        plan_artifacts = {"prd_context", "task_file", "progress_tracker"}
+        resume_text = None
+        if targets & plan_artifacts:
+            from resume_ingest import read_resume
+
+            def read():
+                nonlocal resume_text
+                resume_text = read_resume(self.resume)
+                return {}
+
+            attempt(targets & plan_artifacts, read)
+        plan_targets = targets & {"task_file", "progress_tracker"}
+        if plan_targets and resume_text is not None:
+            attempt(plan_targets, lambda: self._build_plan(resume_text, targets))
+        if "prd_context" in targets and resume_text is not None:
+            attempt({"prd_context"}, lambda: self._build_prd_context(resume_text))
+        if "skills" in targets:
+            attempt({"skills"}, self._build_skills)
+        data_targets = sorted(targets & {"personal.ts", "experience.ts", "projects.ts"})
+        if data_targets:
+            attempt(set(data_targets), lambda: self._build_data(data_targets))
+
+        # The plan JSON only waits on its own parts; a failing skills or data build doesn't hold it back
+        if self.output and targets & plan_artifacts and not self.pending & plan_artifacts:
+            result = {key: self.parts.get(key) for key in ("task_file_content", "progress_tracker", "prd_context")}
+            state = _write_if_changed(self.output, json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+            report["output"] = "rebuilt" if state else "unchanged"
+        return report
+
+    def _build_prd_context(self, resume_text: str) -> Dict[str, str]:
+        from prd_index import detect_focus, index_for_content
+
+        focus = self.focus or detect_focus(resume_text)
+        prd_content = self.prd.read_text(encoding="utf-8")
+        self.parts["prd_context"] = index_for_content(prd_content).select(focus, self.budget).as_dict()
+        return {"prd_context": "rebuilt"}
+
+    def _build_plan(self, resume_text: str, targets: Set[str]) -> Dict[str, str]:
+        from resume_ingest import extract_name
+        from task_graph import TaskGraph
+        from task_model import default_plan, render_task_file
+
+        user_name = self.name or extract_name(resume_text) or "Portfolio Developer"
+        plan = default_plan(user_name, "2025-08-28", "2025-09-04")
+        content = render_task_file(plan)
+        tracker = plan.progress_tracker()
+        tracker.update(TaskGraph.from_plan(plan).summary())
+        self.parts["task_file_content"] = content
+        self.parts["progress_tracker"] = tracker
+        report = {"progress_tracker": "rebuilt"}
+        if "task_file" in targets and self.task_file:
+            report["task_file"] = "rebuilt" if self._sync_task_file(content) else "unchanged"
+        return report
+
+    def _sync_task_file(self, content: str) -> bool:
+        """Write task.md, or only its header if it already exists (keeping recorded progress)"""
+        marker = "## Progress Overview\n"
+        try:
+            existing = self.task_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return _write_if_changed(self.task_file, content)
+        if marker not in existing:
+            self.log(f"warning: {self.task_file} has no '{marker.strip()}' heading; left as is")
+            return False
+        header = content[:content.index(marker)]
+        return _write_if_changed(self.task_file, header + existing[existing.index(marker):])
+
+    def _build_skills(self) -> Dict[str, str]:
+        from skill_scoring import score_resume
+
+        projects = []
+        if self.data:
+            projects = json.loads(self.data.read_text(encoding="utf-8")).get("projects", [])
+        result = score_resume(self.resume, projects)
+        written = _write_if_changed(self.skills, json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+        return {"skills": "rebuilt" if written else "unchanged"}
+
+    def _build_data(self, modules: List[str]) -> Dict[str, str]:
+        from data_emitter import DEFAULT_DATA_DIR, emit_data_modules
+
+        data = json.loads(self.data.read_text(encoding="utf-8"))
+        keys = {"personal.ts": ("personal", "socialLinks", "contact"),
+                "experience.ts": ("experiences",), "projects.ts": ("projects",)}
+        subset = {key: data[key] for module in modules for key in keys[module] if key in data}
+        report = emit_data_modules(subset, self.data_dir or DEFAULT_DATA_DIR)
+        return {name: "unchanged" if state == "unchanged" else "rebuilt" for name, state in report.items()}
+
+
+def watch(session: WatchSession, poll: bool = False, interval: float = POLL_INTERVAL,
+          debounce: float = DEBOUNCE_SECONDS, stop: Callable[[], bool] = None):
+    """Initial build, then rebuild affected artifacts on every debounced batch of changes"""
+    watcher = make_watcher(session.paths, poll, interval)
+    session.log(f"watching {len(session.paths)} files ({type(watcher).__name__})")
+    changed = None
+    try:
+        while True:
+            if changed is None or changed:
+                try:
+                    session.refresh(changed)
+                except (OSError, ValueError, KeyError, ImportError) as exc:
+                    session.log(f"error: {exc}")  # keep watching; the next save retries
+            if stop is not None and stop():
+                break
+            changed = wait_for_changes(watcher, debounce, timeout=1.0 if stop else None)
+    finally:
+        watcher.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate affected artifacts when inputs change")
+    parser.add_argument("resume", help="Resume file (PDF, text/markdown or JSON)")
+    parser.add_argument("--prd", default=str(DEFAULT_PRD), help="PRD markdown (default: %(default)s)")
+    parser.add_argument("--output", default=None, help="Plan JSON to keep up to date")
+    parser.add_argument("--task-file", default=None, help="task.md to create or keep in sync")
+    parser.add_argument("--data", default=None, help="data_emitter JSON for src/data/*.ts")
+    parser.add_argument("--data-dir", default=None, help="TypeScript data module directory")
+    parser.add_argument("--skills", default=None, help="Skill scores JSON to keep up to date")
+    parser.add_argument("--name", default=None)
+    parser.add_argument("--focus", default=None)
+    parser.add_argument("--budget", type=int, default=None)
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Polling interval (seconds)")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="Quiet period before rebuilding (seconds)")
+    parser.add_argument("--once", action="store_true", help="Build once and exit")
+    args = parser.parse_args(argv)
+
+    session = WatchSession(args.resume, args.prd, args.output, args.task_file, args.data, args.data_dir,
+                           args.skills, args.name, args.focus, args.budget)
+    if not session.enabled():
+        parser.error("nothing to build: pass --output, --task-file, --data or --skills")
+    try:
+        if args.once:
+            session.refresh()
+        else:
+            watch(session, args.poll, args.interval, args.debounce)
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
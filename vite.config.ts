@@ -16,6 +16,17 @@ export default defineConfig(() => {
     build: {
       outDir: 'dist',
       assetsDir: 'assets',
+      rollupOptions: {
+        output: {
+          // Stable vendor chunks stay cached across deploys and get their own
+          // budgets in tools/bundle_budgets.json
+          manualChunks(id: string) {
+            if (/node_modules\/(framer-motion|motion-dom|motion-utils)\//.test(id)) return 'framer-motion'
+            if (/node_modules\/(react|react-dom|scheduler)\//.test(id)) return 'react-vendor'
+            if (id.includes('/src/components/animations/')) return 'animations'
+          },
+        },
+      },
     }
   }
 })
\ No newline at end of file